@@ -0,0 +1,68 @@
+"""
+Benchmark DataDLC.get_bending_coefficients against the previous per-frame loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_bending_coefficients
+"""
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from src.post_processing.datadlc import DataDLC
+
+SQUARE_PARTS = ("Top_left", "Top_right", "Bottom_right", "Bottom_left")
+FILAMENT_PARTS = ("FR1", "FR2", "FG1", "FG2", "FB1", "FB2")
+
+
+def make_data_dlc(n_frames: int, seed: int = 0) -> DataDLC:
+    """Create a DataDLC with a fixed square and a synthetic bent filament with six points per frame."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 1274, (n_frames, 6))
+    y = 0.002 * (x - 600) ** 2 + rng.normal(0, 3, (n_frames, 6))
+    points = np.concatenate([np.zeros((n_frames, 4, 2)), np.stack([x, y], axis=-1)], axis=1)
+    values = np.concatenate([points, np.ones((n_frames, 10, 1))], axis=2)
+    columns = pd.MultiIndex.from_product(
+        [["scorer"], SQUARE_PARTS + FILAMENT_PARTS, ["x", "y", "likelihood"]])
+    with tempfile.TemporaryDirectory() as tmpdir:
+        h5_file = os.path.join(tmpdir, "bench.h5")
+        pd.DataFrame(values.reshape(n_frames, -1), columns=columns).to_hdf(h5_file, key="df")
+        return DataDLC(h5_file)
+
+
+def loop_bending_coefficients(df_monofil: pd.DataFrame) -> pd.Series:
+    """The previous implementation: one np.polyfit per frame."""
+    bending_coefficients = []
+    for _, row in df_monofil.iterrows():
+        x_coords = row.filter(like="_x").values.astype(np.float64)
+        y_coords = row.filter(like="_y").values.astype(np.float64)
+        x_centered = x_coords - np.mean(x_coords)
+        y_centered = y_coords - np.mean(y_coords)
+        bending_coefficients.append(abs(np.polyfit(x_centered, y_centered, 2)[0]))
+    return pd.Series(bending_coefficients, name='Bending_Coefficient')
+
+
+def main():
+    for n_frames in (1_000, 10_000, 108_000):  # 108k frames = 60 min at 30 fps
+        dlc = make_data_dlc(n_frames)
+
+        start = time.perf_counter()
+        batched = dlc.get_bending_coefficients()
+        t_batched = time.perf_counter() - start
+
+        # The loop is slow, time it on a slice and extrapolate for large sessions
+        n_loop = min(n_frames, 10_000)
+        start = time.perf_counter()
+        looped = loop_bending_coefficients(dlc.df_monofil.iloc[:n_loop])
+        t_loop = (time.perf_counter() - start) * n_frames / n_loop
+
+        max_rel_err = np.max(np.abs(batched.values[:n_loop] - looped.values) /
+                             np.abs(looped.values))
+        print(f"{n_frames:>8} frames | loop {t_loop:8.3f} s"
+              f"{' (extrapolated)' if n_loop < n_frames else '               '}"
+              f" | batched {t_batched:8.4f} s | speedup {t_loop / t_batched:8.0f}x"
+              f" | max rel err {max_rel_err:.1e}")
+
+
+if __name__ == "__main__":
+    main()
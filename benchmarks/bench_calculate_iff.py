@@ -0,0 +1,58 @@
+"""
+Benchmark DataNeuron.calculate_iff against the previous per-spike loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_calculate_iff
+"""
+import time
+import numpy as np
+import pandas as pd
+from src.post_processing.dataneuron import DataNeuron
+
+SAMPLE_FREQ = 20_000  # Hz
+FIRING_RATE = 20  # spikes per second
+
+
+def make_recording(n_samples: int, seed: int = 0) -> pd.DataFrame:
+    """Create a synthetic recording with Poisson spikes."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Time": np.arange(n_samples) / SAMPLE_FREQ,
+        "Spikes": (rng.random(n_samples) < FIRING_RATE / SAMPLE_FREQ).astype(int)})
+
+
+def loop_calculate_iff(df: pd.DataFrame) -> np.ndarray:
+    """The previous implementation: one .loc read/write per spike."""
+    spikes_loc = df[df['Spikes'] == 1].index
+    df["IFF"] = np.nan
+    for i in range(1, len(spikes_loc)):
+        diff = df.loc[spikes_loc[i], 'Time'] - df.loc[spikes_loc[i-1], 'Time']
+        df.loc[spikes_loc[i], "IFF"] = 1 / diff
+    return df["IFF"].ffill().fillna(0).to_numpy()
+
+
+def main():
+    data_neuron = DataNeuron("tests/mock_neuron_data.csv", original_freq=10)
+    for n_samples in (10 ** 5, 10 ** 6, 10 ** 7):
+        df = make_recording(n_samples)
+        data_neuron.df = df.copy()
+
+        start = time.perf_counter()
+        data_neuron.calculate_iff()
+        t_vectorized = time.perf_counter() - start
+
+        # The loop is slow, time it on a slice and extrapolate for long recordings
+        n_loop = min(n_samples, 10 ** 6)
+        start = time.perf_counter()
+        looped = loop_calculate_iff(df.iloc[:n_loop].copy())
+        t_loop = (time.perf_counter() - start) * n_samples / n_loop
+
+        identical = np.allclose(data_neuron.df["IFF"].values[:n_loop], looped)
+        print(f"{n_samples:>9} samples ({df['Spikes'].sum():>6} spikes) | loop {t_loop:8.3f} s"
+              f"{' (extrapolated)' if n_loop < n_samples else '               '}"
+              f" | vectorized {t_vectorized:7.4f} s | speedup {t_loop / t_vectorized:7.0f}x"
+              f" | identical {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark dlc_utils.preprocess_video against the previous single-threaded loop.
+
+Run from the repository root:
+    python -m benchmarks.bench_preprocess_video
+"""
+import os
+import tempfile
+import time
+import cv2
+import numpy as np
+from src.train_predict import dlc_utils
+
+N_FRAMES = 300
+SOURCE_SIZES = ((1920, 1080), (3840, 2160))
+
+
+def make_video(path: str, width: int, height: int, n_frames: int, seed: int = 0) -> None:
+    """Write a synthetic clip of a scrolling noise texture."""
+    rng = np.random.default_rng(seed)
+    texture = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30.0, (width, height))
+    for i in range(n_frames):
+        out.write(np.roll(texture, 8 * i, axis=1))
+    out.release()
+
+
+def serial_preprocess_video(input_video_path: str, output_video_path: str) -> str:
+    """The previous implementation: decode, resize, allocate a canvas and encode on one thread."""
+    target_width, target_height = 1274, 720
+    cap = cv2.VideoCapture(input_video_path)
+    out = cv2.VideoWriter(output_video_path, cv2.VideoWriter_fourcc(*'mp4v'),
+                          30.0, (target_width, target_height))
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        h, w = frame.shape[:2]
+        scale = min(target_width / w, target_height / h)
+        new_w, new_h = int(w * scale), int(h * scale)
+        resized_frame = cv2.resize(frame, (new_w, new_h))
+        canvas = np.zeros((target_height, target_width, 3), dtype=np.uint8)
+        y_offset = (target_height - new_h) // 2
+        x_offset = (target_width - new_w) // 2
+        canvas[y_offset:y_offset+new_h, x_offset:x_offset+new_w] = resized_frame
+        out.write(canvas)
+    cap.release()
+    out.release()
+    return output_video_path
+
+
+def videos_equal(path_a: str, path_b: str) -> bool:
+    """Compare two videos frame by frame."""
+    cap_a, cap_b = cv2.VideoCapture(path_a), cv2.VideoCapture(path_b)
+    try:
+        while True:
+            ret_a, frame_a = cap_a.read()
+            ret_b, frame_b = cap_b.read()
+            if not ret_a or not ret_b:
+                return ret_a == ret_b
+            if not np.array_equal(frame_a, frame_b):
+                return False
+    finally:
+        cap_a.release()
+        cap_b.release()
+
+
+def main():
+    print(f"{os.cpu_count()} CPUs, {N_FRAMES} frames per clip")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        serial_path = os.path.join(tmpdir, "serial.mp4")
+        pipeline_path = os.path.join(tmpdir, "pipeline.mp4")
+        for width, height in SOURCE_SIZES:
+            input_path = os.path.join(tmpdir, f"input_{width}x{height}.mp4")
+            make_video(input_path, width, height, N_FRAMES)
+
+            start = time.perf_counter()
+            serial_preprocess_video(input_path, serial_path)
+            fps_serial = N_FRAMES / (time.perf_counter() - start)
+            print(f"{width}x{height} | serial              {fps_serial:7.1f} frames/s")
+
+            for n_threads in (1, 2, 4, 8):
+                start = time.perf_counter()
+                dlc_utils.preprocess_video(input_path, pipeline_path, n_threads=n_threads)
+                fps_pipeline = N_FRAMES / (time.perf_counter() - start)
+                print(f"{width}x{height} | pipeline, {n_threads} threads "
+                      f"{fps_pipeline:7.1f} frames/s | speedup {fps_pipeline / fps_serial:5.2f}x"
+                      f" | identical {videos_equal(serial_path, pipeline_path)}")
+
+
+if __name__ == "__main__":
+    main()
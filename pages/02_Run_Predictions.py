@@ -6,6 +6,7 @@ from pathlib import Path
 from glob import glob
 
 from src.train_predict import dlc_utils
+from src.train_predict.predictioncache import PredictionCache
 
 # Init session state flags
 if "project_initialized" not in st.session_state:
@@ -47,6 +48,9 @@ with tab1:
         st.session_state["project_path"] = project_path
         st.session_state["videos_dir"] = videos_dir
         st.session_state["training_folder"] = train_folder
+        # Kept outside 'videos', which is cleaned when the project is initialized
+        st.session_state["prediction_cache"] = PredictionCache(
+            os.path.join(project_path, "prediction-cache"))
 
         # Initialize project
         if not st.session_state["project_initialized"]:
@@ -72,7 +76,8 @@ with tab1:
             processed_video_path = os.path.join(videos_dir, processed_video_name)
 
             st.write("Preprocessing video...")
-            dlc_utils.preprocess_video(temp_input_path, processed_video_path)
+            dlc_utils.preprocess_video_cached(temp_input_path, processed_video_path,
+                                              st.session_state["prediction_cache"])
             os.remove(temp_input_path)
             st.success("✅ Video preprocessed and saved.")
             st.session_state["processed_video_path"] = processed_video_path
@@ -82,7 +87,8 @@ with tab1:
             if st.button("Run Prediction and Create Labeled Video"):
                 dlc_utils.predict_and_show_labeled_video(config_path,
                                     st.session_state["processed_video_path"],
-                                    videos_dir)
+                                    videos_dir,
+                                    cache=st.session_state["prediction_cache"])
                 st.markdown("### ✅ Happy with the result? Continue to **Post Processing** page on the left.")
                 st.markdown("### If not, scroll up to the **Labeling/Retraining** tab at the top of this page.")
 
@@ -142,7 +148,8 @@ with tab2:
                 # Make prediction and show labeled video
                 dlc_utils.predict_and_show_labeled_video(config_path,
                                         st.session_state["processed_video_path"],
-                                        videos_dir)
+                                        videos_dir,
+                                        cache=st.session_state["prediction_cache"])
                 st.markdown("### ✅ Happy with the result? Continue to **Post Processing** page on the left")
                 st.markdown("### If not, try label more frames or increase number of epochs")
     else:
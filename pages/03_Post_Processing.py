@@ -116,29 +116,75 @@ with tab1:
         with col2:
             model_name_square = st.selectbox(
                 "Select the model for square outlier imputation:",
-                options=["All Models"] + list(OutlierImputer.models.keys()),
+                options=["All Models"] + list(OutlierImputer.models.keys()) + OutlierImputer.temporal_models,
                 index=6, key="model_name_square"
             )
             model_name_square = None if model_name_square == "All Models"else model_name_square
 
             model_name_filament = st.selectbox(
                 "Select the model for filament outlier imputation:",
-                options=["All Models"] + list(OutlierImputer.models.keys()),
+                options=["All Models"] + list(OutlierImputer.models.keys()) + OutlierImputer.temporal_models,
                 index=6, key="model_name_filament"
             )
             model_name_filament = None if model_name_filament == "All Models"\
                 else model_name_filament
 
+        reuse_selection = st.checkbox(
+            "Reuse the models selected in previous sessions",
+            value=False, key="reuse_selection",
+            help="Skips the model search for the columns whose stored selection is recent "
+                 "and was made on similar data. The stored selections and when they were "
+                 "made are listed under Selected Imputation Models."
+        )
+        search_mode = st.radio(
+            "Model search:",
+            options=["Thorough (full grid)", "Quick (time budget)"],
+            horizontal=True, key="search_mode",
+            help="The thorough search cross-validates every model and hyperparameter on all "
+                 "the frames. The quick search races the models on growing subsets of the "
+                 "frames and keeps the best one found within the budget."
+        )
+        search = "halving" if search_mode.startswith("Quick") else "grid"
+        time_budget = st.number_input(
+            "Time budget per column (seconds):",
+            min_value=1.0, value=10.0, step=1.0, key="time_budget",
+            disabled=search == "grid"
+        )
+        max_gap = st.number_input(
+            "Longest gap filled by the Kalman and Cubic models (frames):",
+            min_value=1, value=5, step=1, key="max_gap",
+            help="Kalman and Cubic fill short gaps from the neighbouring frames in "
+                 "milliseconds. Longer gaps are imputed with the regression models."
+        )
+        local_imputation = st.checkbox(
+            "Impute locally around the outliers", value=False, key="local_imputation",
+            help="Fits the models on the frames around the outliers and a sample of the "
+                 "rest of the session instead of on every frame."
+        )
+        window = st.number_input(
+            "Frames around each outlier:",
+            min_value=0, value=30, step=5, key="local_window",
+            disabled=not local_imputation
+        )
+        search_params = {"reuse": reuse_selection, "search": search,
+                         "time_budget": time_budget if search == "halving" else None,
+                         "max_gap": int(max_gap),
+                         "window": int(window) if local_imputation else None}
+
         # Reset imputation flags if parameters have changed
         if (st.session_state.last_square_params["std_threshold"] != std_threshold_square or
-                st.session_state.last_square_params["model_name"] != model_name_square):
+                st.session_state.last_square_params["model_name"] != model_name_square or
+                st.session_state.last_square_params.get("search_params") != search_params):
             st.session_state.imputed_square = False
-            st.session_state.last_square_params = {"std_threshold": std_threshold_square, "model_name": model_name_square}
+            st.session_state.last_square_params = {"std_threshold": std_threshold_square, "model_name": model_name_square,
+                                                   "search_params": search_params}
 
         if (st.session_state.last_filament_params["std_threshold"] != std_threshold_filament or
-                st.session_state.last_filament_params["model_name"] != model_name_filament):
+                st.session_state.last_filament_params["model_name"] != model_name_filament or
+                st.session_state.last_filament_params.get("search_params") != search_params):
             st.session_state.imputed_filament = False
-            st.session_state.last_filament_params = {"std_threshold": std_threshold_filament, "model_name": model_name_filament}
+            st.session_state.last_filament_params = {"std_threshold": std_threshold_filament, "model_name": model_name_filament,
+                                                     "search_params": search_params}
 
         # Impute outliers for the square points
         if not st.session_state.imputed_square:
@@ -146,7 +192,8 @@ with tab1:
                 std_threshold=std_threshold_square,
                 square=True,
                 filament=False,
-                model_name=model_name_square
+                model_name=model_name_square,
+                **search_params
             )
             st.session_state.imputed_square = True
             st.success("Outliers imputed successfully for the square points!")
@@ -163,13 +210,20 @@ with tab1:
                 std_threshold=std_threshold_filament,
                 square=False,
                 filament=True,
-                model_name=model_name_filament
+                model_name=model_name_filament,
+                **search_params
             )
             st.session_state.imputed_filament = True
             st.success("Outliers imputed successfully for the filament points!")
         else:
             st.info("Filament points already imputed. Skipping this step.")
 
+        with st.expander("Selected Imputation Models", expanded=False):
+            st.write("Square points:")
+            st.dataframe(OutlierImputer.selection_summary("latest_square.json"))
+            st.write("Filament points:")
+            st.dataframe(OutlierImputer.selection_summary("latest_filament.json"))
+
         with st.expander("Plotting Imputing Comparisons", expanded=False):
             if st.checkbox("Plot Square Derivative Outlier Comparison"):
                 try:
@@ -316,7 +370,7 @@ with tab1:
 
             if st.button("Generate and Download a Homography Video"):
                 try:
-                    video_bytes = PlottingPlotly.generate_homography_video(
+                    video_path = PlottingPlotly.generate_homography_video(
                         st.session_state.data_dlc.homography_points,
                         st.session_state.data_dlc.df_transformed_monofil,
                         fps=30,
@@ -324,17 +378,14 @@ with tab1:
                         x_label=x_label,
                         y_label=y_label,
                         color=color,
-                        figsize=figsize
+                        figsize=figsize,
+                        output="path"
                     )
                     st.success("Video generated!")
-                    st.video(video_bytes)
-
-                    st.download_button(
-                        label="Download Homography Video",
-                        data=video_bytes,
-                        file_name="homography_animation.mp4",
-                        mime="video/mp4"
-                    )
+                    processing_utils.show_video(video_path,
+                                                label="Download Homography Video",
+                                                file_name="homography_animation.mp4",
+                                                session_key="homography_video_path")
                 except Exception as e:
                     st.error(f"Error creating homography video: {e}")
 
@@ -424,7 +475,8 @@ with tab2:
             For the downsampling, the max value of the IFF for the window is taken,
             whereas the sum of the Neuron spikes is taken for the window.
             """)
-        # Downsample the neuron data to the target frequency
+        # Downsample the neuron data to the target frequency, at the length of the recording.
+        # MergedData trims or pads it to the video frames once it is aligned.
         st.session_state.neuron_data.downsample(target_fps)
         st.success("Neuron data downsampled successfully!")
 
@@ -592,7 +644,7 @@ with tab3:
             if st.button("Generate RF Mapping Animation"):
                 try:
                     st.write("Generating RF Mapping Animation...")
-                    video_bytes = PlottingPlotly.plot_rf_mapping_animated(
+                    video_path = PlottingPlotly.plot_rf_mapping_animated(
                         merged_data=st.session_state.merged_data,
                         x_col="tf_FB2_x",
                         y_col="tf_FB2_y",
@@ -603,20 +655,16 @@ with tab3:
                         cmap=cmap,
                         bending=bending,
                         spikes=spikes,
-                        fps=fps
+                        fps=fps,
+                        output="path"
                     )
                     st.success("RF Mapping Animation generated successfully!")
 
-                    # Display the video in Streamlit
-                    st.video(video_bytes)
-
-                    # Provide a download button for the video
-                    st.download_button(
-                        label="Download RF Mapping Animation",
-                        data=video_bytes,
-                        file_name="rf_mapping_animation.mp4",
-                        mime="video/mp4"
-                    )
+                    # Display the video in Streamlit and provide a download button for it
+                    processing_utils.show_video(video_path,
+                                                label="Download RF Mapping Animation",
+                                                file_name="rf_mapping_animation.mp4",
+                                                session_key="rf_mapping_video_path")
                 except Exception as e:
                     st.error(f"Error generating RF Mapping Animation: {e}")
 
@@ -754,7 +802,8 @@ with tab3:
                             figsize=figsize,
                             frame=True,
                             video_path=st.session_state.labeled_video_path,
-                            index=index_frame
+                            index=index_frame,
+                            proxy=True
                         )
                         st.pyplot(fig, use_container_width=True)
                     except Exception as e:
@@ -776,7 +825,8 @@ with tab3:
                             figsize=figsize,
                             frame=True,
                             video_path=st.session_state.labeled_video_path,
-                            index=index_frame
+                            index=index_frame,
+                            proxy=True
                         )
                         st.pyplot(fig, use_container_width=True)
                     except Exception as e:
@@ -824,25 +874,23 @@ with tab3:
                         try:
                             st.write("Generating Scrolling Video...")
 
-                            video_bytes = PlottingPlotly.generate_scroll_over_video(
+                            video_path = PlottingPlotly.generate_scroll_over_video(
                                 merged_data=st.session_state.merged_data,
                                 columns=scroll_columns,
                                 video_path=st.session_state.labeled_video_path,
                                 color_1=color_1,
                                 color_2=color_2,
-                                title=title
+                                title=title,
+                                output="path"
                             )
 
                             st.success(
                                 "Scrolling Overlay Video generated successfully!")
-                            st.video(video_bytes)
-
-                            st.download_button(
+                            processing_utils.show_video(
+                                video_path,
                                 label="Download Scrolling Overlay Video",
-                                data=video_bytes,
                                 file_name="scrolling_overlay_video.mp4",
-                                mime="video/mp4"
-                            )
+                                session_key="scroll_video_path")
                         except Exception as e:
                             st.error(
                                 f"Error generating Scrolling Overlay Video: {e}")
@@ -1,46 +1,37 @@
+import argparse
+import json
 import cv2
 import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.post_processing.framereader import FrameReader
 
-def process_video_with_roi(input_path, output_path):
+VIDEO_EXTENSIONS = ('.mov', '.mp4')
+
+
+def select_roi(input_path):
     """
-    Process a video by allowing the user to select a Region of Interest (ROI)
-    on the middle frame, then crop all frames based on the ROI and save the processed video.
+    Let the user select a Region of Interest (ROI) on the middle frame of a video.
 
     Args:
         input_path (str): Path to the input video.
-        output_path (str): Path to save the processed video.
+
+    Returns:
+        tuple[int, int, int, int] | None: The ROI as (x, y, width, height), or None if the
+            video cannot be read or no ROI was selected.
     """
     # Check if the input file exists
     if not os.path.exists(input_path):
         print(f"Error: File not found: {input_path}")
-        return
-
-    # Open the input video
-    cap = cv2.VideoCapture(input_path)
+        return None
 
-    # Check if the video is opened successfully
-    if not cap.isOpened():
-        print(f"Error: Cannot open video: {input_path}")
-        return
-
-    # Get video properties
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-    original_fps = cap.get(cv2.CAP_PROP_FPS)
-    original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-
-    print(f"Video Properties: FPS={original_fps}, Width={original_width}, Height={original_height}, Total Frames={total_frames}")
-
-    # Seek to the middle frame
-    middle_frame_index = total_frames // 2
-    cap.set(cv2.CAP_PROP_POS_FRAMES, middle_frame_index)
-
-    # Read the middle frame
-    ret, middle_frame = cap.read()
-    if not ret:
-        print("Error: Cannot read the middle frame.")
-        cap.release()
-        return
+    # Read the middle frame through the shared frame reader, which decodes from the
+    # nearest keyframe. The frame count of the header avoids indexing the whole video.
+    reader = FrameReader.shared(input_path)
+    try:
+        middle_frame = reader.read((reader.header_frame_count() or len(reader)) // 2)
+    except (TypeError, ValueError):
+        print(f"Error: Cannot read the middle frame of {input_path}.")
+        return None
 
     # Let the user select the ROI
     roi = cv2.selectROI("Select ROI", middle_frame, fromCenter=False, showCrosshair=True)
@@ -48,58 +39,264 @@ def process_video_with_roi(input_path, output_path):
 
     if roi == (0, 0, 0, 0):
         print("Error: No ROI selected.")
-        cap.release()
-        return
+        return None
 
-    x, y, w, h = roi
+    x, y, w, h = (int(value) for value in roi)
     print(f"Selected ROI: x={x}, y={y}, width={w}, height={h}")
+    return x, y, w, h
+
+def crop_video(input_path, output_path, roi):
+    """
+    Crop all frames of a video to a Region of Interest (ROI) and save the result.
+
+    The video is first written to a partial file next to `output_path` and renamed once
+    complete, so an interrupted run never leaves a truncated video at `output_path`.
+
+    Args:
+        input_path (str): Path to the input video.
+        output_path (str): Path to save the processed video.
+        roi (tuple[int, int, int, int]): The ROI as (x, y, width, height).
+
+    Returns:
+        int: The number of frames written.
+
+    Raises:
+        FileNotFoundError: If the input video does not exist.
+        ValueError: If the ROI is invalid or the video cannot be read.
+    """
+    if not os.path.exists(input_path):
+        raise FileNotFoundError(f"File not found: {input_path}")
+    x, y, w, h = (int(value) for value in roi)
+    if x < 0 or y < 0 or w <= 0 or h <= 0:
+        raise ValueError(f"Invalid ROI: {roi}")
+
+    cap = cv2.VideoCapture(input_path)
+    if not cap.isOpened():
+        raise ValueError(f"Cannot open video: {input_path}")
+    original_fps = cap.get(cv2.CAP_PROP_FPS)
+    original_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    original_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if x + w > original_width or y + h > original_height:
+        cap.release()
+        raise ValueError(f"ROI {roi} exceeds the {original_width}x{original_height} frame size.")
 
     # Set the codec and create VideoWriter object
+    partial_path = f"{os.path.splitext(output_path)[0]}.partial.mp4"
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')  # codec for .mp4
-    out = cv2.VideoWriter(output_path, fourcc, original_fps, (w, h))
+    out = cv2.VideoWriter(partial_path, fourcc, original_fps, (w, h))
 
     # Process each frame
-    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)  # Reset to the first frame
+    n_frames = 0
     while cap.isOpened():
         ret, frame = cap.read()
         if not ret:
             break
 
-        # Crop the frame to the selected ROI
-        cropped_frame = frame[y:y + h, x:x + w]
-
-        # Write the cropped frame to the output video
-        out.write(cropped_frame)
+        # Crop the frame to the selected ROI and write it to the output video
+        out.write(frame[y:y + h, x:x + w])
+        n_frames += 1
 
     # Release resources
     cap.release()
     out.release()
 
+    if n_frames == 0:
+        os.remove(partial_path)
+        raise ValueError(f"No frames could be read from {input_path}")
+    os.replace(partial_path, output_path)
+    return n_frames
+
+def process_video_with_roi(input_path, output_path):
+    """
+    Process a video by allowing the user to select a Region of Interest (ROI)
+    on the middle frame, then crop all frames based on the ROI and save the processed video.
+
+    Args:
+        input_path (str): Path to the input video.
+        output_path (str): Path to save the processed video.
+    """
+    roi = select_roi(input_path)
+    if roi is None:
+        return
+
+    try:
+        crop_video(input_path, output_path, roi)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return
+
     print(f"Processed video saved to {output_path}")
 
-def convert_all_videos_in_directory(input_dir, output_dir):
+def list_videos(input_dir):
     """
-    Convert all videos in a directory by allowing the user to select an ROI
-    for each video and saving the processed videos to the output directory.
+    List the video files of a directory.
+
+    Args:
+        input_dir (str): Path to the directory containing input videos.
+
+    Returns:
+        list[str]: The sorted file names of the videos.
+    """
+    return sorted(filename for filename in os.listdir(input_dir)
+                  if filename.lower().endswith(VIDEO_EXTENSIONS))
+
+def _load_json(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def _save_json(path, data):
+    # Write to a temporary file first, so an interrupted run never leaves a truncated file
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(temp_path, path)
+
+def collect_rois(input_dir, roi_file, fixed_roi=None, overwrite=False):
+    """
+    Phase one of the batch conversion: collect the ROI of every video in a sidecar JSON file.
+
+    Videos that already have an ROI in `roi_file` are skipped, unless `overwrite` is set.
+    The file is saved after every video, so an interrupted selection session resumes
+    where it stopped.
+
+    Args:
+        input_dir (str): Path to the directory containing input videos.
+        roi_file (str): Path of the JSON file mapping video file names to [x, y, width, height].
+        fixed_roi (tuple[int, int, int, int], optional): Use this ROI for every video instead
+            of selecting them interactively, which needs no display. Defaults to None.
+        overwrite (bool, optional): Replace the ROIs already in `roi_file`. Defaults to False.
+
+    Returns:
+        dict[str, list[int]]: The ROI of every video that has one.
+    """
+    rois = _load_json(roi_file)
+    for filename in list_videos(input_dir):
+        if filename in rois and not overwrite:
+            continue
+        if fixed_roi is not None:
+            roi = fixed_roi
+        else:
+            print(f"Select the ROI of {filename}...")
+            roi = select_roi(os.path.join(input_dir, filename))
+            if roi is None:
+                continue
+        rois[filename] = [int(value) for value in roi]
+        _save_json(roi_file, rois)
+    return rois
+
+def _init_worker():
+    # One OpenCV thread per process, the parallelism comes from the processes
+    cv2.setNumThreads(1)
+
+def convert_videos_with_rois(input_dir, output_dir, roi_file, n_workers=None):
+    """
+    Phase two of the batch conversion: crop and encode all videos with a process pool.
+
+    The ROIs come from the sidecar JSON file written by `collect_rois`, so no display is
+    needed. The outcome of every video is recorded in 'conversion_status.json' in
+    `output_dir`, keyed by file name, together with the input size, modification time
+    and ROI. A video that was converted is skipped on the next run as long as these are
+    unchanged and the output exists, so a failed or interrupted run resumes with the
+    remaining videos. A failing video does not stop the others.
 
     Args:
         input_dir (str): Path to the directory containing input videos.
         output_dir (str): Path to the directory where processed videos will be saved.
+        roi_file (str): Path of the JSON file mapping video file names to [x, y, width, height].
+        n_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        dict[str, str]: The status of every video: 'converted', 'skipped', 'no roi'
+            or 'failed: <error>'.
     """
-    # Ensure the output directory exists
     os.makedirs(output_dir, exist_ok=True)
+    status_file = os.path.join(output_dir, "conversion_status.json")
+    status = _load_json(status_file)
+    rois = _load_json(roi_file)
+
+    results = {}
+    jobs = {}
+    for filename in list_videos(input_dir):
+        if filename not in rois:
+            results[filename] = "no roi"
+            continue
+        input_video = os.path.join(input_dir, filename)
+        output_video = os.path.join(output_dir, f"{os.path.splitext(filename)[0]}_converted.mp4")
+        stat = os.stat(input_video)
+        key = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "roi": rois[filename]}
+        previous = status.get(filename, {})
+        if previous.get("status") == "converted" and os.path.exists(output_video) and \
+                all(previous.get(name) == value for name, value in key.items()):
+            results[filename] = "skipped"
+            continue
+        jobs[filename] = (input_video, output_video, key)
+
+    print(f"{len(jobs)} videos to convert, {list(results.values()).count('skipped')} already converted.")
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker) as executor:
+        futures = {executor.submit(crop_video, input_video, output_video, key["roi"]): filename
+                   for filename, (input_video, output_video, key) in jobs.items()}
+        for n_done, future in enumerate(as_completed(futures), start=1):
+            filename = futures[future]
+            try:
+                n_frames = future.result()
+                results[filename] = "converted"
+                print(f"[{n_done}/{len(jobs)}] {filename}: {n_frames} frames converted.")
+            except Exception as e:
+                results[filename] = f"failed: {e}"
+                print(f"[{n_done}/{len(jobs)}] {filename}: Error: {e}")
+            status[filename] = {"status": results[filename], **jobs[filename][2]}
+            _save_json(status_file, status)
 
-    for filename in os.listdir(input_dir):
-        if filename.endswith('.mov') or filename.endswith('.mp4'):
-            input_video = os.path.join(input_dir, filename)
-            output_video = os.path.join(output_dir, f"{os.path.splitext(filename)[0]}_converted.mp4")
+    return results
+
+def convert_all_videos_in_directory(input_dir, output_dir, roi_file=None, fixed_roi=None, n_workers=None):
+    """
+    Convert all videos in a directory by cropping each one to a Region of Interest (ROI)
+    and saving the processed videos to the output directory.
+
+    The ROIs are collected first, interactively or from `fixed_roi`, and saved to a
+    sidecar JSON file. All videos are then converted in parallel. Rerunning the
+    function resumes a previous run: known ROIs are not asked again and converted
+    videos are skipped.
+
+    Args:
+        input_dir (str): Path to the directory containing input videos.
+        output_dir (str): Path to the directory where processed videos will be saved.
+        roi_file (str, optional): Path of the ROI sidecar JSON file. Defaults to
+            'rois.json' in `output_dir`.
+        fixed_roi (tuple[int, int, int, int], optional): Use this (x, y, width, height) ROI
+            for every video instead of selecting them interactively. Defaults to None.
+        n_workers (int, optional): Number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        dict[str, str]: The status of every video, see `convert_videos_with_rois`.
+    """
+    # Ensure the output directory exists
+    os.makedirs(output_dir, exist_ok=True)
+    if roi_file is None:
+        roi_file = os.path.join(output_dir, "rois.json")
 
-            print(f"Processing {filename}...")
-            process_video_with_roi(input_video, output_video)
+    collect_rois(input_dir, roi_file, fixed_roi=fixed_roi)
+    results = convert_videos_with_rois(input_dir, output_dir, roi_file, n_workers=n_workers)
 
-    print("All videos converted.")
+    n_failed = sum(result.startswith("failed") for result in results.values())
+    print(f"All videos converted, {n_failed} failed." if n_failed else "All videos converted.")
+    return results
 
 
-#input_dir = r'C:\Python Programming\LIU\Data\Videos\videos_from_Ackerley_Lab_Marseilles'
-#output_dir = r'C:\Python Programming\LIU\Data\Videos\videos_from_Ackerley_Lab_Marseilles\Converted'
-#convert_all_videos_in_directory(input_dir, output_dir)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Crop all videos of a directory to a region of interest.")
+    parser.add_argument("input_dir", help="Directory containing the input videos.")
+    parser.add_argument("output_dir", help="Directory where the processed videos are saved.")
+    parser.add_argument("--roi-file", default=None,
+                        help="ROI sidecar JSON file, defaults to rois.json in the output directory.")
+    parser.add_argument("--roi", type=int, nargs=4, metavar=("X", "Y", "WIDTH", "HEIGHT"),
+                        help="Use a fixed ROI for all videos instead of selecting them.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes, defaults to the number of CPUs.")
+    args = parser.parse_args()
+    convert_all_videos_in_directory(args.input_dir, args.output_dir, roi_file=args.roi_file,
+                                    fixed_roi=args.roi, n_workers=args.workers)
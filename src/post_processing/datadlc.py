@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 import cv2
 from src.post_processing.outlierimputer import OutlierImputer
+from src.post_processing.posearray import PoseArray
 from src.components.validation import Validation as Val
 
 class DataDLC:
@@ -15,10 +16,18 @@ class DataDLC:
     applies homography transformations, imputes outliers, and merges all processed
     data into a single DataFrame for downstream analysis.
 
+    All tracking values are held in a single array-backed `PoseArray`; `df_square`,
+    `df_monofil` and `df_likelihoods` are zero-copy DataFrame views over it.
+
     Attributes:
+        pose (PoseArray): Contiguous float32 store of the x, y and likelihood values of all bodyparts.
+        square_parts (list[str]): Names of the square bodyparts, in the order of `df_square`.
+        monofil_parts (list[str]): Names of the monofilament bodyparts, in the order of `df_monofil`.
         df_square (pd.DataFrame): DataFrame containing the square calibration points.
         df_monofil (pd.DataFrame): DataFrame containing monofilament tracking points.
         df_likelihoods (pd.DataFrame): DataFrame of likelihood values from DLC tracking.
+        imputed (np.ndarray): Boolean (n_frames, n_bodyparts) mask, in pose slot order, of the
+            positions that were replaced by `impute_outliers`.
         df_merged (pd.DataFrame): Combined DataFrame of square, monofilament, transformed points, and bending coefficients.
         df_bending_coefficients (pd.Series): Bending coefficients for each frame based on monofilament curvature.
         df_transformed_monofil (pd.DataFrame): Homography-transformed monofilament points.
@@ -32,9 +41,13 @@ class DataDLC:
     """
     def __init__(self, h5_file) -> None:
         df = pd.read_hdf(h5_file)
+        self.pose = None
+        self.square_parts = None
+        self.monofil_parts = None
         self.df_square = None
         self.df_monofil = None
         self.df_likelihoods = None
+        self.imputed = None
         self.df_merged = None
         self.df_bending_coefficients = None
         self.df_transformed_monofil = None
@@ -42,22 +55,21 @@ class DataDLC:
         self.assign_homography_points()
 
         try:  # Extract desired parts from the h5 file
-            df.columns = [
-                f"{bodypart}_{coord}" for bodypart, coord in zip(
-                    df.columns.get_level_values(1),
-                    df.columns.get_level_values(2)
-                )
-            ]
-
-            self.df_monofil = df.loc[:, df.columns.str.startswith(('FR', 'FG', 'FB')) &
-                                     ~df.columns.str.endswith('likelihood')]
-
-            self.df_square = df.loc[:, df.columns.str.startswith(
-                ('Top_left', 'Top_right', 'Bottom_left', 'Bottom_right')) &
-                ~df.columns.str.endswith('likelihood')]
-
-            self.df_likelihoods = df.loc[:, df.columns.str.endswith('likelihood')]
-        except AttributeError as e:
+            bodyparts = list(dict.fromkeys(df.columns.get_level_values(1)))
+            self.square_parts = [part for part in bodyparts if part.startswith(
+                ('Top_left', 'Top_right', 'Bottom_left', 'Bottom_right'))]
+            self.monofil_parts = [part for part in bodyparts
+                                  if part.startswith(('FR', 'FG', 'FB'))]
+            other = [part for part in bodyparts
+                     if part not in self.square_parts + self.monofil_parts]
+
+            # Keep each group in consecutive slots so the DataFrames below are views
+            self.pose = PoseArray(df, self.square_parts + self.monofil_parts + other)
+            self.df_monofil = self.pose.xy_dataframe(self.monofil_parts)
+            self.df_square = self.pose.xy_dataframe(self.square_parts)
+            self.df_likelihoods = self.pose.likelihood_dataframe()
+            self.imputed = np.zeros(self.pose.likelihood.shape, dtype=bool)
+        except (AttributeError, IndexError, ValueError) as e:
             raise AttributeError(
                 f"Invalid h5 file. Please check the file format.\n{e}"
             )
@@ -120,7 +132,13 @@ class DataDLC:
                         std_threshold: int|float = 2,
                         square: bool = True,
                         filament: bool = False,
-                        model_name: str = None) -> None:
+                        model_name: str = None,
+                        n_jobs: int = -1,
+                        reuse: bool = False,
+                        search: str = "grid",
+                        time_budget: int | float = None,
+                        max_gap: int = 5,
+                        window: int = None) -> None:
         """Detects and imputes outliers in the square or filament dataset.
 
         This method applies outlier detection and imputation using a statistical threshold on the 
@@ -135,11 +153,26 @@ class DataDLC:
             filament (bool, optional): Whether to impute outliers in the filament dataset. 
                 Defaults to False.
             model_name (str, optional): The name of a custom model to use for imputation. 
-                If None, a default model is used.
+                If None, a default model is used. A temporal model ("Kalman" or "Cubic") fills
+                the short gaps from the neighbouring frames and leaves only the longer ones to
+                the regression models.
+            n_jobs (int, optional): Number of processes selecting the imputation models,
+                -1 for one per CPU. Defaults to -1.
+            reuse (bool, optional): Whether to reuse the models selected in a previous session,
+                logged in latest_square.json or latest_filament.json, and only grid search the
+                columns whose selection is stale. Defaults to False.
+            search (str, optional): "grid" for the exhaustive model search, "halving" for the
+                quicker successive halving search. Defaults to "grid".
+            time_budget (int | float, optional): Wall-clock seconds allowed to the halving search
+                of each column, None for no limit. Defaults to None.
+            max_gap (int, optional): Longest run of missing frames filled by a temporal model.
+                Defaults to 5.
+            window (int, optional): Frames on each side of the missing values the models are
+                fitted and imputed on, None to use all the frames. Defaults to None.
 
         Returns:
-            None: The function updates the relevant DataFrame in place 
-            (`self.df_square` or `self.df_monofil`) with outliers imputed.
+            pd.DataFrame: The imputed DataFrame. The values are written back into `self.pose`,
+            so `self.df_square` or `self.df_monofil` is updated in place.
 
         Raises:
             TypeError: If input types are incorrect.
@@ -159,18 +192,52 @@ class DataDLC:
 
         # Impute outliers for the square and monofilament points
         if square:
-            outlier_imputer = OutlierImputer("latest_square.json")
-            self.df_square = outlier_imputer.impute_outliers(self.df_square,
-                                                             std_threshold,
-                                                             model_name)
+            outlier_imputer = OutlierImputer("latest_square.json", n_jobs=n_jobs, reuse=reuse,
+                                             search=search, time_budget=time_budget,
+                                             max_gap=max_gap, window=window)
+            df_imputed = outlier_imputer.impute_outliers(self.df_square,
+                                                         std_threshold,
+                                                         model_name)
+            self._write_pose(self.square_parts, df_imputed)
             return self.df_square
         elif filament:
-            outlier_imputer = OutlierImputer("latest_filament.json")
-            self.df_monofil = outlier_imputer.impute_outliers(self.df_monofil,
-                                                              std_threshold,
-                                                              model_name)
+            outlier_imputer = OutlierImputer("latest_filament.json", n_jobs=n_jobs, reuse=reuse,
+                                             search=search, time_budget=time_budget,
+                                             max_gap=max_gap, window=window)
+            df_imputed = outlier_imputer.impute_outliers(self.df_monofil,
+                                                         std_threshold,
+                                                         model_name)
+            self._write_pose(self.monofil_parts, df_imputed)
             return self.df_monofil
 
+    def _write_pose(self,
+                    bodyparts: list[str],
+                    df_values: pd.DataFrame) -> None:
+        """Writes x and y coordinates of the given bodyparts into the pose array.
+
+        Since `df_square` and `df_monofil` are views of `self.pose`, they reflect the new values.
+        Positions whose values change are flagged in `self.imputed`.
+
+        Args:
+            bodyparts (list[str]): The bodyparts to update.
+            df_values (pd.DataFrame): The new coordinates with '<bodypart>_x', '<bodypart>_y' columns.
+
+        Raises:
+            TypeError: If `df_values` is not a DataFrame.
+            ValueError: If `df_values` does not match the bodyparts or the number of frames.
+        """
+        Val.validate_type(df_values, pd.DataFrame, "Values")
+        columns = [f"{bodypart}_{coord}" for bodypart in bodyparts for coord in ("x", "y")]
+        if list(df_values.columns) != columns or len(df_values) != len(self.pose):
+            raise ValueError("Values must have the same columns and length as the pose data.")
+
+        slots = self.pose.slots(bodyparts)
+        values = df_values.to_numpy(dtype=np.float32).reshape(len(df_values), -1, 2)
+        previous = self.pose.xy[:, slots]
+        changed = (values != previous) & ~(np.isnan(values) & np.isnan(previous))
+        self.imputed[:, slots] |= changed.any(axis=2)
+        self.pose.xy[:, slots] = values
+
     def get_bending_coefficients(self) -> pd.Series:
         """Calculates bending coefficients from the monofilament coordinates.
 
@@ -185,33 +252,77 @@ class DataDLC:
 
         Notes:
             The bending coefficient reflects the degree of curvature of the monofilament in each frame.
+            All frames are fitted at once, see `_fit_bending_coefficients`.
         """
+        # Step 1: Take the (n_frames, n_points, 2) monofilament coordinates from the pose array
+        points = self.pose.xy[:, self.pose.slots(self.monofil_parts)].astype(np.float64)
 
-        # Initialize a list to store bending coefficients
-        bending_coefficients = []
+        # Step 2: Fit every frame in one pass and keep the quadratic term
+        bending_coefficients = np.abs(self._fit_bending_coefficients(points))
 
-        # Process each row of df_monofil
-        for index, row in self.df_monofil.iterrows():
-            # Step 1: Extract x and y coordinates for the current row
-            x_coords = row.filter(like="_x").values
-            y_coords = row.filter(like="_y").values
+        # Step 3: Add the bending coefficients as a new series attribute
+        self.df_bending_coefficients = pd.Series(bending_coefficients,
+                                                 name='Bending_Coefficient')
+        return self.df_bending_coefficients
 
-            # Step 2: Center coordinates around their mean
-            x_centered = x_coords - np.mean(x_coords)
-            y_centered = y_coords - np.mean(y_coords)
+    @staticmethod
+    def _fit_bending_coefficients(points: np.ndarray) -> np.ndarray:
+        """Fits a degree-2 polynomial to every frame at once and returns the quadratic terms.
 
-            # Step 3: Fit a polynomial (degree 2)
-            degree = 2
-            coefficients = np.polyfit(x_centered, y_centered, degree)
-            bending_coeff = coefficients[0]  # Coefficient of the quadratic term
+        The coordinates of each frame are centered around their mean, which makes the
+        first-order moments vanish, so the 3x3 normal equations of the least-squares fit
+        `y = a*x^2 + b*x + c` reduce to a closed form for `a`:
 
-            # Store the bending coefficient for this frame
-            bending_coefficients.append(abs(bending_coeff))
+            a = (Sxx * Sxxy - Sxxx * Sxy) / (Sxx * Sxxxx - Sxx^3 / n - Sxxx^2)
 
-        # Step 4: Add the bending coefficients as a new series attribute
-        self.df_bending_coefficients = pd.Series(bending_coefficients,
-                                                 name='Bending_Coefficient')
-        return self.df_bending_coefficients
+        where `S...` are sums of products of the centered coordinates. This is evaluated
+        for all frames with vectorized reductions instead of one `np.polyfit` per frame.
+
+        Args:
+            points (np.ndarray): Array of shape (n_frames, n_points, 2) holding the x and y
+                coordinates of the monofilament points for each frame.
+
+        Returns:
+            np.ndarray: Array of shape (n_frames,) with the signed quadratic coefficient per frame.
+
+        Raises:
+            ValueError: If `points` is not a 3D array with a last dimension of size 2.
+
+        Notes:
+            - Frames with fewer than three distinct x values make the system singular;
+              those few frames fall back to `np.polyfit` so the result matches the previous
+              frame-by-frame implementation.
+            - Frames with identical x coordinates or NaN coordinates yield NaN instead of raising.
+        """
+        if not isinstance(points, np.ndarray) or points.ndim != 3 or points.shape[2] != 2:
+            raise ValueError(
+                f"Points must be an array of shape (n_frames, n_points, 2). Got {getattr(points, 'shape', type(points))} instead.")
+
+        n_points = points.shape[1]
+        centered = points - points.mean(axis=1, keepdims=True)
+        x, y = centered[..., 0], centered[..., 1]
+        x2 = x * x
+
+        s_xx = x2.sum(axis=1)
+        s_xxx = (x2 * x).sum(axis=1)
+        s_xxxx = (x2 * x2).sum(axis=1)
+        s_xy = (x * y).sum(axis=1)
+        s_xxy = (x2 * y).sum(axis=1)
+
+        numerator = s_xx * s_xxy - s_xxx * s_xy
+        denominator = s_xx * s_xxxx - s_xx ** 3 / n_points - s_xxx ** 2
+
+        # Relative tolerance for a singular system (scale of the determinant is s_xx^3)
+        singular = np.abs(denominator) <= 1e-12 * np.abs(s_xx) ** 3
+        with np.errstate(divide="ignore", invalid="ignore"):
+            coefficients = np.where(singular, np.nan, numerator / denominator)
+
+        # Fall back to the least-squares solver for the (rare) degenerate frames
+        fallback = singular & (s_xx > 0) & np.isfinite(points).all(axis=(1, 2))
+        for i in np.flatnonzero(fallback):
+            coefficients[i] = np.polyfit(x[i], y[i], 2)[0]
+
+        return coefficients
 
     def apply_homography(self) -> pd.DataFrame:
         """Applies a homography transformation to the monofilament points.
@@ -226,41 +337,105 @@ class DataDLC:
             The result is also stored as an attribute `self.df_transformed_monofil`.
 
         Notes:
-            - The homography matrix is calculated frame-by-frame.
-            - Transformed coordinates are flattened into a 1D array for each frame.
+            - The homography matrices of all frames are solved in one batch,
+              see `_get_homography_matrices`.
+            - All six points of all frames are projected with a single einsum.
+            - Frames with a degenerate square produce NaN coordinates.
         """
-        transformed_monofil_points = []
-
-        for i in range(len(self.df_square)):
-            # Find the homography matrix
-            h_matrix = self._get_homography_matrix(i)
-
-            monofil_points = np.array([
-                [self.df_monofil.iloc[i]['FR1_x'], self.df_monofil.iloc[i]['FR1_y']],
-                [self.df_monofil.iloc[i]['FR2_x'], self.df_monofil.iloc[i]['FR2_y']],
-                [self.df_monofil.iloc[i]['FG1_x'], self.df_monofil.iloc[i]['FG1_y']],
-                [self.df_monofil.iloc[i]['FG2_x'], self.df_monofil.iloc[i]['FG2_y']],
-                [self.df_monofil.iloc[i]['FB1_x'], self.df_monofil.iloc[i]['FB1_y']],
-                [self.df_monofil.iloc[i]['FB2_x'], self.df_monofil.iloc[i]['FB2_y']]
-            ], dtype=np.float32)
-
-            # Apply homography to the monofilament points
-            monofil_points_transformed = cv2.perspectiveTransform(
-                monofil_points.reshape(-1, 1, 2), h_matrix
-                ).reshape(-1, 2)
-            # Store the transformed points
-            transformed_monofil_points.append(
-                monofil_points_transformed.flatten()
-                )
-
-        columns = ['tf_FR1_x', 'tf_FR1_y', 'tf_FR2_x', 'tf_FR2_y',
-                   'tf_FG1_x', 'tf_FG1_y', 'tf_FG2_x', 'tf_FG2_y',
-                   'tf_FB1_x', 'tf_FB1_y', 'tf_FB2_x', 'tf_FB2_y']
-        self.df_transformed_monofil = pd.DataFrame(transformed_monofil_points,
-                                                   columns=columns)
+        h_matrices = self._get_homography_matrices()
+
+        monofil_parts = ['FR1', 'FR2', 'FG1', 'FG2', 'FB1', 'FB2']
+        monofil_points = self.pose.xy[:, self.pose.slots(monofil_parts)].astype(np.float64)
+
+        # Apply homography to the monofilament points in homogeneous coordinates
+        homogeneous = np.concatenate(
+            [monofil_points, np.ones(monofil_points.shape[:2] + (1,))], axis=-1)
+        projected = np.einsum('nij,npj->npi', h_matrices, homogeneous)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            transformed_monofil_points = projected[..., :2] / projected[..., 2:]
+
+        columns = [f"tf_{part}_{coord}" for part in monofil_parts for coord in ("x", "y")]
+        self.df_transformed_monofil = pd.DataFrame(
+            transformed_monofil_points.reshape(len(monofil_points), -1),
+            columns=columns)
 
         return self.df_transformed_monofil
 
+    def _get_homography_matrices(self,
+                                 dst_points: np.ndarray = None) -> np.ndarray:
+        """Computes the homography matrices for all frames at once.
+
+        Each frame maps the four square corners (`src_points`) onto `dst_points`. With
+        `h33` fixed to 1, the direct linear transform (DLT) of four correspondences is an
+        8x8 linear system per frame; all systems are stacked into an (n_frames, 8, 8)
+        tensor and solved with a single `np.linalg.solve`. The source points are centered
+        and scaled per frame beforehand to keep the systems well conditioned.
+
+        Args:
+            dst_points (np.ndarray, optional): A (4, 2) array of destination points to map to. 
+                Defaults to `self.homography_points`.
+
+        Returns:
+            np.ndarray: An (n_frames, 3, 3) array of homography matrices. Frames whose
+            square points are missing or degenerate (e.g. three collinear corners) are NaN.
+
+        Raises:
+            ValueError: If `dst_points` is not a valid (4, 2) array.
+
+        Notes:
+            Equivalent to calling `cv2.findHomography` on every frame, which
+            `_get_homography_matrix` still does for single frames.
+        """
+        if dst_points is None:
+            dst_points = self.homography_points
+        Val.validate_array_int_float(dst_points,
+                                     shape=(4, 2),
+                                     name="Destination Points")
+
+        corners = ['Top_left', 'Top_right', 'Bottom_right', 'Bottom_left']
+        src_points = self.pose.xy[:, self.pose.slots(corners)].astype(np.float64)
+        n_frames = len(src_points)
+
+        # Normalize the source points: centroid at the origin, mean distance sqrt(2)
+        centroid = src_points.mean(axis=1, keepdims=True)
+        mean_dist = np.linalg.norm(src_points - centroid, axis=2).mean(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.sqrt(2) / mean_dist
+        scale[~np.isfinite(scale)] = 1.0  # coincident points, caught as singular below
+        norm_points = (src_points - centroid) * scale[:, None, None]
+        x, y = norm_points[..., 0], norm_points[..., 1]
+        u, v = np.broadcast_to(dst_points[:, 0].astype(np.float64), x.shape), \
+            np.broadcast_to(dst_points[:, 1].astype(np.float64), y.shape)
+
+        # Build the DLT systems, two rows per correspondence
+        zeros, ones = np.zeros_like(x), np.ones_like(x)
+        rows_u = np.stack([x, y, ones, zeros, zeros, zeros, -u * x, -u * y], axis=-1)
+        rows_v = np.stack([zeros, zeros, zeros, x, y, ones, -v * x, -v * y], axis=-1)
+        a_matrices = np.stack([rows_u, rows_v], axis=2).reshape(n_frames, 8, 8)
+        b_vectors = np.stack([u, v], axis=2).reshape(n_frames, 8)
+
+        # Replace unsolvable systems so the batch solve cannot fail on a single frame
+        valid = np.isfinite(a_matrices).all(axis=(1, 2))
+        valid[valid] = np.abs(np.linalg.det(a_matrices[valid])) > 1e-12
+        a_matrices[~valid] = np.eye(8)
+        b_vectors[~valid] = 0
+
+        h_vectors = np.linalg.solve(a_matrices, b_vectors[..., None])[..., 0]
+        h_normalized = np.concatenate([h_vectors, np.ones((n_frames, 1))],
+                                      axis=1).reshape(n_frames, 3, 3)
+
+        # Undo the normalization: H = H_norm @ T, with T mapping src to norm_points
+        t_matrices = np.zeros((n_frames, 3, 3))
+        t_matrices[:, 0, 0] = t_matrices[:, 1, 1] = scale
+        t_matrices[:, :2, 2] = -centroid[:, 0] * scale[:, None]
+        t_matrices[:, 2, 2] = 1
+        h_matrices = h_normalized @ t_matrices
+        with np.errstate(divide="ignore", invalid="ignore"):
+            h_matrices /= h_matrices[:, 2:, 2:]
+        h_matrices[~valid] = np.nan
+
+        return h_matrices
+
     def _get_homography_matrix(self,
                                index: int,
                                dst_points: np.ndarray = None) -> np.ndarray:
@@ -283,7 +458,7 @@ class DataDLC:
             ValueError: If input validation fails (e.g., invalid index or improperly shaped array).
 
         Notes:
-            - The source points are extracted from the square corners in `self.df_square`.
+            - The source points are the square corners, read from `self.pose` by slot.
             - The destination points are typically a normalized square area.
         """
         if dst_points is None:
@@ -294,16 +469,8 @@ class DataDLC:
                                      shape=(4, 2),
                                      name="Destination Points")
 
-        src_points = np.array([
-            [self.df_square.iloc[index]['Top_left_x'],
-             self.df_square.iloc[index]['Top_left_y']],
-            [self.df_square.iloc[index]['Top_right_x'],
-             self.df_square.iloc[index]['Top_right_y']],
-            [self.df_square.iloc[index]['Bottom_right_x'],
-             self.df_square.iloc[index]['Bottom_right_y']],
-            [self.df_square.iloc[index]['Bottom_left_x'],
-             self.df_square.iloc[index]['Bottom_left_y']]
-        ], dtype=np.float32)
+        corners = ['Top_left', 'Top_right', 'Bottom_right', 'Bottom_left']
+        src_points = self.pose.xy[index, self.pose.slots(corners)]
 
         # Find the homography matrix
         h_matrix, _ = cv2.findHomography(src_points, dst_points)
@@ -83,6 +83,9 @@ class DataNeuron:
         the dataframe. Any missing IFF values are forward-filled, with any remaining 
         missing values being filled with zero.
 
+        The time differences of all spikes are computed at once with `np.diff`, and the
+        forward fill uses `np.maximum.accumulate` over the positions of the valid values.
+
         This method modifies the dataframe in place by adding the 'IFF' column.
 
         Returns:
@@ -90,19 +93,19 @@ class DataNeuron:
         """
         # Create Instantaneous Frequency Firing (IFF):
         # 1 divided by the difference between the current time and last spike time
-        spikes_loc = self.df[self.df['Spikes'] == 1].index
-        self.df["IFF"] = np.nan
+        time = self.df['Time'].to_numpy(dtype=np.float64)
+        spikes_pos = np.flatnonzero(self.df['Spikes'].to_numpy() == 1)
 
-        for i in range(1, len(spikes_loc)):
-            diff = self.df.loc[spikes_loc[i], 'Time'] - \
-                   self.df.loc[spikes_loc[i-1], 'Time']
-            # calculate the reciprocal of the difference
-            self.df.loc[spikes_loc[i], "IFF"] = 1 / diff
+        iff = np.full(len(time), np.nan)
+        with np.errstate(divide="ignore"):
+            iff[spikes_pos[1:]] = 1 / np.diff(time[spikes_pos])
 
-        # fill the NaN values with the previous non-NaN value
-        self.df["IFF"].fillna(method='ffill', inplace=True)
+        # fill the NaN values with the previous non-NaN value, by carrying
+        # the position of the last valid value forward
+        last_valid = np.where(np.isnan(iff), 0, np.arange(len(iff)))
+        iff = iff[np.maximum.accumulate(last_valid)]
         # fill the remaining NaN values with 0
-        self.df["IFF"].fillna(0, inplace=True)
+        self.df["IFF"] = np.where(np.isnan(iff), 0, iff)
 
     def _get_frequency(self) -> int:
         """
@@ -158,18 +161,28 @@ class DataNeuron:
         self.df = filled_df
 
     def downsample(self,
-                   target_freq: int) -> pd.DataFrame:
+                   target_freq: int,
+                   n_frames: int = None) -> pd.DataFrame:
         """
         Downsample the data to a lower frequency.
 
-        This method reduces the frequency of the 'Spikes' and 'IFF' columns by applying 
-        a rolling window technique. The 'Spikes' column is downsampled by summing values 
-        within the window, while the 'IFF' column is downsampled by taking the maximum value 
-        within the window. The DataFrame is then reduced by selecting every `downsample_factor`-th row.
+        This method reduces the frequency of the 'Spikes' and 'IFF' columns by splitting the
+        samples into consecutive bins, one per output row, and reducing each bin exactly once.
+        The 'Spikes' column is downsampled by summing the values within the bin, while the
+        'IFF' column is downsampled by taking the maximum value within the bin.
+
+        Bin `j` covers the samples recorded in the interval [j / target_freq, (j + 1) / target_freq).
+        With sample `i` recorded at i / original_freq, the bin edges are computed exactly with
+        integer arithmetic, so ratios such as 20000 -> 30 Hz are not truncated and the bin
+        widths alternate between the neighbouring integer sample counts.
 
         Args:
             target_freq (int): The target frequency to downsample the data to. It must be less than or 
                                 equal to the original frequency.
+            n_frames (int, optional): The number of output rows, typically the number of video frames.
+                                Bins past the end of the recording get 0 spikes and the last IFF value,
+                                and the recording is cut after the last bin.
+                                Defaults to the number of bins needed to cover the recording.
 
         Returns:
             pd.DataFrame: The downsampled DataFrame containing the 'Spikes' and 'IFF' columns at the 
@@ -182,58 +195,34 @@ class DataNeuron:
         Val.validate_positive(target_freq, "Target Frequency")
         if target_freq > self.original_freq:
             raise ValueError("Target frequency must be less than or equal to the original frequency.")
-
-        # Calculate the downsampling factor
-        downsample_factor = int(self.original_freq / target_freq)
-
-        # Apply a rolling window with a maximum function to preserve binary components
-        downsampled_df = pd.DataFrame()
-
-        # Downsample the iff/freq column by picking the maximum value in the window
-        downsampled_df['IFF'] = \
-            self.df['IFF'].rolling(window=downsample_factor,
-                                             min_periods=1).max()
-
-        # Downsample the spikes column by summing the values in the window
-        downsampled_df['Spikes'] = \
-            self.df['Spikes'].rolling(window=downsample_factor,
-                                                min_periods=1).sum()
-
-        # Downsample the DataFrame by selecting every downsample_factor-th row
-        downsampled_df = downsampled_df.iloc[::downsample_factor]
-
-        # Reset the index to ensure it is sequential
-        downsampled_df.reset_index(drop=True, inplace=True)
+        n_samples = len(self.df)
+        if n_frames is None:
+            # Number of bins needed to cover all samples, ceil(n * target / original)
+            n_frames = -(-n_samples * target_freq // self.original_freq)
+        Val.validate_type(n_frames, int, "Number of Frames")
+        Val.validate_positive(n_frames, "Number of Frames")
+
+        # First sample of every bin, ceil(j * original / target), clipped to the recording
+        edges = -(-np.arange(n_frames + 1) * self.original_freq // target_freq)
+        edges = np.minimum(edges, n_samples)
+        starts, stops = edges[:-1], edges[1:]
+
+        # Reduce the non-empty bins in one pass, bins are contiguous so each
+        # start runs up to the next non-empty start
+        non_empty = stops > starts
+        spikes = np.zeros(n_frames)
+        iff = np.full(n_frames, np.nan)
+        if non_empty.any():
+            end = edges[-1]
+            spikes[non_empty] = np.add.reduceat(
+                self.df['Spikes'].to_numpy(dtype=np.float64)[:end], starts[non_empty])
+            iff[non_empty] = np.maximum.reduceat(
+                self.df['IFF'].to_numpy(dtype=np.float64)[:end], starts[non_empty])
+
+        downsampled_df = pd.DataFrame({'IFF': iff, 'Spikes': spikes})
+        # Bins past the end of the recording hold the last IFF value
+        downsampled_df['IFF'] = downsampled_df['IFF'].ffill().fillna(0)
 
         # Update the DataFrame
         self.downsampled_df = downsampled_df
         return self.downsampled_df
-
-    #! Might not be needed, but keeping for now
-    def _fill_downsample_length(self,
-                                target_length: int) -> pd.DataFrame:
-        """
-        Fill the downsampled DataFrame to a specified length.
-
-        This method ensures that the downsampled DataFrame has the desired number of rows, 
-        by forward filling missing values in the 'IFF' column and filling missing 'Spikes' values with 0.
-
-        Args:
-            target_length (int): The target length to which the DataFrame should be filled.
-
-        Returns:
-            pd.DataFrame: The downsampled DataFrame, now extended to the specified length 
-                        with forward-filled 'IFF' values and 'Spikes' values set to 0 where necessary.
-        
-        Raises:
-            ValueError: If the target length is not a positive integer.
-        """
-        Val.validate_type(target_length, int, "Target Length")
-        Val.validate_positive(target_length, "Target Length")
-
-        # Fill the data up to a target length by forward filling the data
-        self.downsampled_df = self.downsampled_df.reindex(range(target_length))
-        self.downsampled_df['Spikes'].fillna(0, inplace=True)
-        self.downsampled_df['IFF'].ffill(inplace=True)
-
-        return self.downsampled_df
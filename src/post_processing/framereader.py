@@ -0,0 +1,292 @@
+import os
+import subprocess
+import threading
+from collections import OrderedDict
+import cv2
+import numpy as np
+from src.post_processing.videoencoder import VideoEncoder
+
+
+class FrameReader:
+    """
+    Random access to the frames of a video, with a keyframe index and an LRU frame cache.
+
+    The video stays open between reads. Once a second frame has to be decoded, the
+    packets of the video stream are listed once with ffmpeg (demuxing only, no
+    decoding) to build:
+        - `timestamps`: the presentation time of every frame, in display order.
+        - `keyframes`: the display indices of the keyframes.
+
+    A frame can only be decoded starting from a keyframe. OpenCV seeks by jumping to
+    the last keyframe at least 16 frames before the target and decoding forward, so
+    the index tells exactly what a seek costs. Each read either keeps decoding forward
+    from the current position or seeks, whichever decodes fewer frames. Skipped
+    frames are only grabbed, not converted. A single read, e.g. of one preview frame,
+    is a plain OpenCV seek, so it never pays for listing the packets of the whole
+    file. Decoded frames are kept in an LRU cache bounded by `cache_bytes`, so going
+    back and forth between frames is free. When stepping backwards, the frames
+    preceding the target are cached on the way, so the next steps back are served
+    from the cache.
+
+    If the index cannot be built (e.g. ffmpeg is not available), reads fall back to
+    plain OpenCV seeking and `keyframes` and `timestamps` are None.
+
+    Use `FrameReader.shared` to reuse one reader, its index and its cache across
+    calls for the same file.
+
+    Attributes:
+        video_path (str): Path of the video.
+        keyframes (np.ndarray | None): Display indices of the keyframes.
+        timestamps (np.ndarray | None): Presentation time of every frame in seconds.
+        frame_count (int | None): Number of frames, exact when the index is available.
+
+    Args:
+        video_path (str): Path of the video.
+        cache_bytes (int, optional): Memory budget of the frame cache. Defaults to 256 MiB.
+
+    Raises:
+        TypeError: If `video_path` is not a string or `cache_bytes` is not an integer.
+        ValueError: If `cache_bytes` is negative.
+    """
+    # OpenCV seeks to the last keyframe before this many frames ahead of the target
+    seek_back_frames = 16
+    # Frames decoded and cached ahead of the target when stepping backwards
+    backfill_frames = 32
+    max_shared_readers = 4
+    _shared = OrderedDict()
+    _shared_lock = threading.Lock()
+
+    def __init__(self, video_path: str, cache_bytes: int = 256 * 2**20) -> None:
+        if not isinstance(video_path, str):
+            raise TypeError(f"Video path must be a string. Got {type(video_path)} instead.")
+        if not isinstance(cache_bytes, int):
+            raise TypeError(f"Cache bytes must be an integer. Got {type(cache_bytes)} instead.")
+        if cache_bytes < 0:
+            raise ValueError(f"Cache bytes must be non-negative. Got {cache_bytes} instead.")
+
+        self.video_path = video_path
+        self.cache_bytes = cache_bytes
+        self.keyframes = None
+        self.timestamps = None
+        self.frame_count = None
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._cap = None
+        self._position = 0  # Index of the next frame the decoder returns
+        self._indexed = False
+        self._decoded = False  # Whether a frame was decoded, after which reads are indexed
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FrameReader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        self._build_index()
+        if self.frame_count is None:
+            raise TypeError("The frame count is unknown, the video could not be indexed.")
+        return self.frame_count
+
+    @classmethod
+    def shared(cls, video_path: str) -> "FrameReader":
+        """
+        Get the reader shared by all callers for a video file.
+
+        Readers are keyed by the absolute path, modification time and size of the file,
+        so a file that changes on disk gets a new reader. The least recently used
+        readers beyond `max_shared_readers` are closed.
+
+        Args:
+            video_path (str): Path of the video.
+
+        Returns:
+            FrameReader: The shared reader. A new, unshared reader if the file does not exist.
+        """
+        if not isinstance(video_path, str) or not os.path.isfile(video_path):
+            return cls(video_path)
+        stat = os.stat(video_path)
+        key = (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+        with cls._shared_lock:
+            reader = cls._shared.get(key)
+            if reader is None:
+                reader = cls._shared[key] = cls(video_path)
+            cls._shared.move_to_end(key)
+            while len(cls._shared) > cls.max_shared_readers:
+                _, evicted = cls._shared.popitem(last=False)
+                evicted.close()
+        return reader
+
+    @staticmethod
+    def _list_packets(video_path: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        List the packets of the first video stream without decoding them.
+
+        Args:
+            video_path (str): Path of the video.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The presentation timestamps (in seconds) and
+                keyframe flags of the packets, in decode order.
+
+        Raises:
+            RuntimeError: If ffmpeg cannot read the video.
+        """
+        result = subprocess.run([VideoEncoder.ffmpeg_exe(), "-v", "error", "-i", video_path,
+                                 "-map", "0:v:0", "-c", "copy", "-f", "framecrc", "-"],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Could not index {video_path}: {result.stderr.strip()}")
+
+        # Lines are "stream, dts, pts, duration, size, crc[, F=flags]", keyframes carry no flags
+        time_base = 1.0
+        pts, is_key = [], []
+        for line in result.stdout.splitlines():
+            if line.startswith("#tb 0:"):
+                numerator, denominator = line.split(":")[1].strip().split("/")
+                time_base = int(numerator) / int(denominator)
+            elif line and not line.startswith("#"):
+                fields = [field.strip() for field in line.split(",")]
+                flags = int(fields[6][2:], 16) if len(fields) > 6 and fields[6].startswith("F=") else 1
+                pts.append(int(fields[2]))
+                is_key.append(bool(flags & 1))
+        return np.array(pts, dtype=np.float64) * time_base, np.array(is_key, dtype=bool)
+
+    def _build_index(self) -> None:
+        if self._indexed:
+            return
+        self._indexed = True
+        try:
+            pts, is_key = self._list_packets(self.video_path)
+        except (OSError, RuntimeError, ValueError, IndexError):
+            return
+        if not len(pts):
+            return
+        # Display order is presentation order
+        order = np.argsort(pts, kind="stable")
+        display_index = np.empty(len(pts), dtype=np.int64)
+        display_index[order] = np.arange(len(pts))
+        self.timestamps = pts[order] - pts[order[0]]
+        self.keyframes = np.sort(display_index[is_key])
+        self.frame_count = len(pts)
+
+    def _seek_start(self, index: int) -> int | None:
+        """Index of the frame that decoding starts from when OpenCV seeks to `index`."""
+        if self.keyframes is None or not len(self.keyframes):
+            return None
+        target = max(index - self.seek_back_frames, 0)
+        return int(self.keyframes[max(np.searchsorted(self.keyframes, target, side="right") - 1, 0)])
+
+    def _open(self) -> None:
+        if self._cap is None:
+            self._cap = cv2.VideoCapture(self.video_path)
+            self._position = 0
+
+    def header_frame_count(self) -> int:
+        """
+        Number of frames stored in the header of the video, without indexing it.
+
+        Returns:
+            int: The frame count, which can be approximate, or 0 if the header has none.
+        """
+        with self._lock:
+            if self.frame_count is not None:
+                return self.frame_count
+            self._open()
+            return max(int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)), 0)
+
+    def _decode(self, index: int) -> np.ndarray | None:
+        self._open()
+
+        forward = index - self._position
+        seek_start = self._seek_start(index)
+        seek = index - seek_start if seek_start is not None else self.seek_back_frames
+        if forward < 0 or forward > seek:
+            start = index
+            backfill = self._backfill_frames()
+            if seek_start is not None and -backfill <= forward < 0:
+                # Stepping backwards, also keep the frames before `index`. Seeking to `start`
+                # decodes from the same keyframe, so they only cost the color conversion.
+                start = min(index, max(index - backfill, seek_start + self.seek_back_frames))
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            for position in range(start, index):
+                ret, frame = self._cap.read()
+                if not ret:
+                    self._cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                    break
+                frame.setflags(write=False)
+                self._store(position, frame)
+        else:
+            for _ in range(forward):
+                if not self._cap.grab():
+                    self._position = index
+                    return None
+        ret, frame = self._cap.read()
+        self._position = index + 1
+        return frame if ret else None
+
+    def _backfill_frames(self) -> int:
+        """Number of frames to keep when stepping backwards, at most half of the cache."""
+        if not self._cache:
+            return 0
+        frame_bytes = next(reversed(self._cache.values())).nbytes
+        return min(self.backfill_frames, self.cache_bytes // (2 * frame_bytes))
+
+    def _store(self, index: int, frame: np.ndarray) -> None:
+        if frame.nbytes > self.cache_bytes:
+            return
+        self._cache[index] = frame
+        self._cached_bytes += frame.nbytes
+        while self._cached_bytes > self.cache_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted.nbytes
+
+    def read(self, index: int) -> np.ndarray:
+        """
+        Read one frame.
+
+        Args:
+            index (int): Display index of the frame.
+
+        Returns:
+            np.ndarray: The read-only (height, width, 3) BGR frame.
+
+        Raises:
+            TypeError: If `index` is not an integer.
+            ValueError: If the frame cannot be read.
+        """
+        if not isinstance(index, (int, np.integer)) or isinstance(index, bool):
+            raise TypeError(f"Index must be an integer. Got {type(index)} instead.")
+        index = int(index)
+        with self._lock:
+            frame = self._cache.get(index)
+            if frame is not None:
+                self._cache.move_to_end(index)
+                return frame
+
+            if self._decoded:
+                # A single read does not need the index
+                self._build_index()
+            if index < 0 or (self.frame_count is not None and index >= self.frame_count):
+                frame = None
+            else:
+                frame = self._decode(index)
+                self._decoded = True
+            if frame is None:
+                raise ValueError(f"Could not read frame {index} from video {self.video_path}.")
+
+            frame.setflags(write=False)
+            self._store(index, frame)
+            return frame
+
+    def close(self) -> None:
+        """
+        Release the video and empty the cache.
+        """
+        with self._lock:
+            if self._cap is not None:
+                self._cap.release()
+                self._cap = None
+            self._cache.clear()
+            self._cached_bytes = 0
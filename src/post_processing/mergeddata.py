@@ -1,6 +1,7 @@
-from scipy.signal import correlate
+from scipy.signal import fftconvolve
 from scipy.stats import zscore
 from src.components.validation import Validation as Val
+import numpy as np
 import pandas as pd
 from src.post_processing.dataneuron import DataNeuron
 from src.post_processing.datadlc import DataDLC
@@ -28,6 +29,11 @@ class MergedData:
         neuron (DataNeuron): An instance of the DataNeuron class, providing the neuron data.
         max_gap_fill (int): The maximum gap width for filling neuron spikes (default is 10).
         threshold (float): The z-score threshold for identifying significant bending events (default is 0.1).
+        max_lag (int): The maximum shift (in rows) searched when aligning the data, None for all shifts.
+        best_shift (int): The shift applied to the neuron data to align it with the DLC data.
+        correlation_peak (float): The cross-correlation at `best_shift`.
+        correlation_runner_up (float): The highest cross-correlation outside the main peak,
+            a runner-up close to the peak flags an ambiguous alignment.
         df_merged (pd.DataFrame): The merged DataFrame containing both DLC and neuron data, aligned by time.
         df_merged_cleaned (pd.DataFrame): The cleaned DataFrame filtered based on bending and spike conditions.
 
@@ -36,26 +42,37 @@ class MergedData:
         neuron (DataNeuron): The DataNeuron object containing the neuron data.
         max_gap_fill (int, optional): The maximum gap size (in rows) for filling neuron spike data (default is 10).
         threshold (float, optional): The z-score threshold for identifying significant bending events (default is 0.1).
+        max_lag (int, optional): The maximum shift (in rows) between the DLC and neuron data (default is None,
+            all shifts are searched).
 
     Raises:
-        ValueError: If the threshold is not between 0 and 1, or if the max gap fill is not a positive integer.
+        ValueError: If the threshold is not between 0 and 1, if the max gap fill is not a positive integer,
+            or if the max lag is negative.
     """
     def __init__(self,
                  dlc: DataDLC,
                  neuron: DataNeuron,
                  max_gap_fill: int = 10,
-                 threshold: float = 0.1) -> None:
+                 threshold: float = 0.1,
+                 max_lag: int = None) -> None:
         Val.validate_type(dlc, DataDLC, "DLC Object")
         Val.validate_type(neuron, DataNeuron, "Neuron Object")
         Val.validate_type(max_gap_fill, int, "Max Gap Fill")
         Val.validate_positive(max_gap_fill, "Max Gap Fill")
         Val.validate_type(threshold, float, "Threshold")
         Val.validate_float_in_range(threshold, 0, 1, "Threshold")
+        if max_lag is not None:  # None is allowed as a default value
+            Val.validate_type(max_lag, int, "Max Lag")
+            Val.validate_positive(max_lag, "Max Lag", zero_allowed=True)
 
         self.dlc = dlc
         self.neuron = neuron
         self.max_gap_fill = max_gap_fill
         self.threshold = threshold
+        self.max_lag = max_lag
+        self.best_shift = None
+        self.correlation_peak = None
+        self.correlation_runner_up = None
         self.df_merged = None
         self._merge()
         self.df_merged_cleaned = None
@@ -69,9 +86,12 @@ class MergedData:
         This function performs the following steps:
         1. Merges the DLC data (with calculated bending coefficients) and neuron spike data.
         2. Calculates z-scores for the bending coefficients and identifies spikes using a threshold.
-        3. Fills gaps in the neuron spike data (Spikes column) by expanding spikes within a maximum gap width.
-        4. Aligns the bending binary data with the neuron spike data using cross-correlation.
-        5. Shifts the neuron data index to align with the DLC data.
+        3. Fills gaps in the neuron spike data (Spikes column) by expanding spikes within a maximum gap width,
+           see `fill_gaps`.
+        4. Aligns the bending binary data with the neuron spike data using cross-correlation,
+           see `align_sequences`.
+        5. Shifts the neuron data index to align with the DLC data, keeping one row per video frame:
+           the recording is aligned at its full length, then trimmed or padded to the frames.
         6. Merges the DLC and neuron data into a single DataFrame.
         7. Fills missing values after the shift for columns like Spikes, Spikes_Filled, and IFF.
 
@@ -89,23 +109,17 @@ class MergedData:
         df_dlc['Bending_Binary'] = (df_dlc['Bending_ZScore'] > self.threshold).astype(int)
 
         # Fill gaps in neuron Spikes column with dynamic width
-        df_neuron['Spikes_Filled'] = df_neuron['Spikes'].copy()
-        gap_start = None
-        for i in range(len(df_neuron)):
-            if df_neuron['Spikes'][i] == 1:
-                if gap_start is not None and (i - gap_start) <= self.max_gap_fill:
-                    df_neuron['Spikes_Filled'][gap_start:i] = 1
-                gap_start = i + 1
-            elif df_neuron['Spikes'][i] == 0 and gap_start is None:
-                gap_start = i
+        df_neuron['Spikes_Filled'] = self.fill_gaps(df_neuron['Spikes'].to_numpy(),
+                                                    self.max_gap_fill)
 
         # Perform sequence alignment using cross-correlation
-        correlation = correlate(
-            df_dlc['Bending_Binary'], df_neuron['Spikes_Filled'], mode='full')
-        best_shift = correlation.argmax() - (len(df_neuron) - 1)
+        self.best_shift, self.correlation_peak, self.correlation_runner_up = self.align_sequences(
+            df_dlc['Bending_Binary'].to_numpy(), df_neuron['Spikes_Filled'].to_numpy(),
+            self.max_lag)
 
-        # Shift df_neuron index accordingly
-        df_neuron = df_neuron.shift(periods=best_shift).reset_index(drop=True)
+        # Shift df_neuron index accordingly, the recorded rows that land on a frame are kept
+        df_neuron.index = df_neuron.index + self.best_shift
+        df_neuron = df_neuron.reindex(df_dlc.index)
         # Merge the DataFrames
         self.df_merged = pd.concat([df_dlc, df_neuron], axis=1)
 
@@ -115,7 +129,7 @@ class MergedData:
             self.df_merged[['Spikes', 'Spikes_Filled']].fillna(0).astype(int)
 
         # Fill IFF column based on shift direction
-        if best_shift < 0:
+        if self.best_shift < 0:
             self.df_merged["IFF"].fillna(method='ffill', inplace=True)
             self.df_merged["IFF"].fillna(0, inplace=True)
         else:
@@ -123,6 +137,117 @@ class MergedData:
 
         return self.df_merged
 
+    @staticmethod
+    def align_sequences(reference: np.ndarray,
+                        signal: np.ndarray,
+                        max_lag: int = None) -> tuple[int, float, float]:
+        """
+        Find the shift of `signal` that best aligns it with `reference` using FFT cross-correlation.
+
+        The cross-correlation `c[lag] = sum(reference[n + lag] * signal[n])` is computed for all
+        lags at once as an FFT convolution, which matches `scipy.signal.correlate(..., mode='full')`.
+        Only lags within [-max_lag, max_lag] are searched for the peak, and ties are broken
+        towards the smallest lag, as `argmax` does on the full correlation.
+
+        Args:
+            reference (np.ndarray): 1D array the signal is aligned to, e.g. binary bending events.
+            signal (np.ndarray): 1D array to align, e.g. filled neuron spikes.
+            max_lag (int, optional): The maximum absolute shift to consider. Defaults to None (all shifts).
+
+        Returns:
+            tuple[int, float, float]: The best shift, the correlation at that shift (peak height) and
+                the highest correlation outside the main peak (runner-up). The runner-up is NaN
+                when the main peak spans all searched lags.
+
+        Raises:
+            ValueError: If the inputs are not non-empty 1D arrays or `max_lag` is negative.
+            TypeError: If `max_lag` is not an integer.
+        """
+        reference, signal = np.asarray(reference), np.asarray(signal)
+        if reference.ndim != 1 or signal.ndim != 1 or not len(reference) or not len(signal):
+            raise ValueError("Reference and signal must be non-empty 1D arrays.")
+        if max_lag is not None:
+            Val.validate_type(max_lag, int, "Max Lag")
+            Val.validate_positive(max_lag, "Max Lag", zero_allowed=True)
+
+        # Full cross-correlation, index k holds lag k - (len(signal) - 1)
+        correlation = fftconvolve(reference.astype(np.float64),
+                                  signal[::-1].astype(np.float64), mode='full')
+        if all(np.array_equal(x, np.round(x)) for x in (reference, signal)):
+            correlation = np.rint(correlation)  # remove FFT round-off so ties stay ties
+        lags = np.arange(-(len(signal) - 1), len(reference))
+
+        # Keep only the plausible lags
+        if max_lag is not None:
+            in_window = np.abs(lags) <= max_lag
+            correlation, lags = correlation[in_window], lags[in_window]
+
+        peak_index = int(correlation.argmax())
+        peak = float(correlation[peak_index])
+
+        # The main peak extends as long as the correlation keeps decreasing on either side
+        left = correlation[peak_index::-1]
+        right = correlation[peak_index:]
+        left_rise = np.flatnonzero(np.diff(left) > 0)
+        right_rise = np.flatnonzero(np.diff(right) > 0)
+        lobe_start = peak_index - (left_rise[0] if len(left_rise) else len(left) - 1)
+        lobe_stop = peak_index + (right_rise[0] if len(right_rise) else len(right) - 1)
+        outside = np.concatenate([correlation[:lobe_start], correlation[lobe_stop + 1:]])
+        runner_up = float(outside.max()) if len(outside) else np.nan
+
+        return int(lags[peak_index]), peak, runner_up
+
+    @staticmethod
+    def fill_gaps(events: np.ndarray,
+                  max_gap: int) -> np.ndarray:
+        """
+        Fill short gaps between events with ones.
+
+        The events (values equal to 1, e.g. single spikes or binary bending events) are
+        run-length encoded by their positions: the difference between consecutive event
+        positions gives the length of the run between them. Every run between two events,
+        or from the first 0 to the first event, no longer than `max_gap` is set to 1 with a
+        single mask. Values other than 0 and 1 (e.g. bins with several spikes) are not events
+        and are part of the run they are in. A run after the last event is left unchanged.
+
+        Args:
+            events (np.ndarray): 1D array of event values, where 1 means an event.
+            max_gap (int): The maximum length of a run that is filled.
+
+        Returns:
+            np.ndarray: A copy of `events` with the short gaps filled with 1.
+
+        Raises:
+            TypeError: If `max_gap` is not an integer.
+            ValueError: If `events` is not 1D or `max_gap` is negative.
+        """
+        Val.validate_type(max_gap, int, "Max Gap")
+        Val.validate_positive(max_gap, "Max Gap", zero_allowed=True)
+        events = np.asarray(events)
+        if events.ndim != 1:
+            raise ValueError(f"Events must be a 1D array. Got {events.ndim} dimensions instead.")
+
+        positions = np.flatnonzero(events == 1)
+        if positions.size == 0:
+            return events.copy()
+
+        # Runs between consecutive events, and the leading run from the first 0 to the first event
+        starts, ends = positions[:-1] + 1, positions[1:]
+        leading_zeros = np.flatnonzero(events[:positions[0]] == 0)
+        if leading_zeros.size:
+            starts = np.append(leading_zeros[0], starts)
+            ends = np.append(positions[0], ends)
+        run_lengths = ends - starts
+        fill = (run_lengths > 0) & (run_lengths <= max_gap)
+
+        # Mark the start (+1) and end (-1) of each run to fill, the cumulative sum is the mask
+        boundaries = np.zeros(len(events) + 1, dtype=np.int64)
+        boundaries[starts[fill]] = 1
+        boundaries[ends[fill]] = -1
+        mask = np.cumsum(boundaries[:-1]) > 0
+
+        return np.where(mask, 1, events).astype(events.dtype)
+
     def _clean(self) -> pd.DataFrame:
         """
         Clean the data by filtering rows where the bending coefficient is above the threshold
@@ -1,7 +1,8 @@
 from src.components.validation import Validation as Val
 from sklearn.experimental import enable_iterative_imputer
 from sklearn.impute import IterativeImputer
-from sklearn.model_selection import GridSearchCV
+from sklearn.model_selection import GridSearchCV, ParameterGrid, cross_validate
+from scipy.interpolate import PchipInterpolator
 from sklearn.preprocessing import PolynomialFeatures
 from sklearn.pipeline import make_pipeline
 from sklearn.linear_model import BayesianRidge
@@ -9,13 +10,28 @@ from sklearn.svm import SVR
 from xgboost import XGBRegressor
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.base import clone
+from threadpoolctl import threadpool_limits
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from itertools import zip_longest
+import sklearn
+import xgboost
+import joblib
+import hashlib
 import json
+import logging
+import math
+import time
+import warnings
 import numpy as np
 import pandas as pd
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+logger = logging.getLogger(__name__)
+
 
 class OutlierImputer:
     """
@@ -24,28 +40,108 @@ class OutlierImputer:
 
     This class provides methods to:
         - Detect outliers in paired (x, y) coordinate data using velocity thresholds.
-        - Select the best regression model for each column using grid search.
+        - Select the best regression model for each column using grid search, in parallel
+          over the (column, model) pairs and the cross-validation folds, or using a
+          time-budgeted successive halving search over the frames.
         - Impute missing/outlier values using iterative imputation.
-        - Log model performance and selections to a JSON file.
+        - Fill short gaps quickly with a Kalman smoother or cubic interpolation over time,
+          leaving only the longer gaps to the models (see `temporal_imputation`).
+        - Impute locally, fitting only around the missing values (see `local_rows`).
+        - Log model performance and selections to a JSON file, and reuse them in later sessions.
+
+    The log file records, for each column, the selected model and hyperparameters, the
+    cross-validated MSE, when it was selected and the statistics of the data it was selected
+    on. The fitted estimators are saved with joblib next to it, in `<log file>_models/`,
+    under a key that includes the library versions, so a file written by other versions is
+    never loaded. With `reuse=True`, `impute_outliers` loads this selection and only grid
+    searches the columns whose selection is stale: missing, older than `max_age` days, for
+    another model than `model_name`, or selected on data that drifted by more than
+    `drift_threshold` (see `load_selection`).
 
     Attributes:
         models (dict): Dictionary of available regression models for imputation.
         param_grids (dict): Dictionary of hyperparameter grids for each model.
         best_models (dict): Stores the best model selected for each column after grid search.
         log_file (str): Path to the JSON file where model performance is logged.
+        best_scores (dict): Cross-validated MSE of the best model of each searched column.
+        selections (dict): Log entry of each column, as written to `log_file`.
+        fitted_models (dict): Saved estimators loaded by `load_selection`, already fitted, by
+            column.
+        model_dir (str): Directory of the saved estimators.
+        n_jobs (int): Number of processes used by the grid search, -1 for one per CPU.
+        reuse (bool): Whether `impute_outliers` reuses the logged selection.
+        max_age (float | None): Age in days after which a logged selection is stale.
+        drift_threshold (float): Drift of the data after which a logged selection is stale.
+        search (str): Model search strategy, "grid" or "halving".
+        time_budget (float | None): Wall-clock seconds allowed to the halving search of each column.
+        search_reports (dict): Summary of the halving search of each searched column.
+        max_gap (int): Longest run of missing frames filled by the temporal models.
+        fallback_model (str | None): Model imputing the longer runs after a temporal model.
+        temporal_fills (dict): Summary of the temporal imputation of each column.
+        imputation_rounds (list[dict]): Iteration, relative change and seconds of every round of
+            the last `iterative_imputation`.
+        window (int | None): Frames around the missing values used by the local imputation,
+            None to impute over all the frames.
+        max_train_rows (int): Number of complete rows of the local imputation.
+        local_summary (dict): Number of frames, of frames with missing values and of frames
+            used by the last local imputation.
 
     Args:
         log_file (str, optional): Path to the JSON file for logging model performance. Defaults to "model_performance.json".
+        n_jobs (int, optional): Number of processes used by the grid search, -1 for one per CPU.
+            Defaults to -1.
+        reuse (bool, optional): Whether to reuse the logged selection. Defaults to False.
+        max_age (int | float, optional): Age in days after which a logged selection is stale,
+            None for no limit. Defaults to None.
+        drift_threshold (int | float, optional): Shift of the mean, in standard deviations of the
+            logged data, or relative change of the standard deviation after which a logged
+            selection is stale. Defaults to 0.5.
+        search (str, optional): "grid" to cross-validate every hyperparameter combination of
+            every model on all the frames, "halving" for a successive halving search (see
+            `_halving_search`). Defaults to "grid".
+        time_budget (int | float, optional): Wall-clock seconds allowed to the halving search of
+            each column, None for no limit. Defaults to None.
+        max_gap (int, optional): Longest run of missing frames filled by the temporal models
+            ("Kalman" and "Cubic"). Defaults to 5.
+        fallback_model (str, optional): Name of the model imputing the runs longer than `max_gap`
+            after a temporal model. If None, tries all models. Defaults to None.
+        window (int, optional): Frames on each side of the missing values that the models are
+            fitted and imputed on (see `local_rows`), None to use all the frames. Defaults to None.
+        max_train_rows (int, optional): Number of complete rows the local imputation trains on, the
+            rows within the window and evenly spaced rows from the rest of the session.
+            Defaults to 5000.
 
     Raises:
-        TypeError: If log_file is not a string.
-        ValueError: If log_file does not have a .json extension.
+        TypeError: If an argument has the wrong type.
+        ValueError: If log_file does not have a .json extension, n_jobs is neither positive nor -1,
+            max_age, drift_threshold, time_budget, max_gap or max_train_rows is not positive,
+            window is negative, or search or fallback_model is invalid.
     """
+    # Models imputing short gaps from the neighbouring frames, selectable like `models`
+    temporal_models = ["Kalman", "Cubic"]
+    # Frames on each side of a gap seen by the Kalman smoother
+    kalman_window = 30
+    searches = ["grid", "halving"]
+    # Successive halving keeps 1/factor of the candidates each round, on factor times more frames
+    halving_factor = 3
+    halving_min_frames = 50
+    # Models from the cheapest to the most expensive to fit, the order of the halving search
+    halving_order = ["BR", "KNR", "Poly", "HGBR", "XGB", "SVR", "RFR"]
+    # Share of the time budget kept for the final refit of the halving search
+    halving_refit_share = 0.25
+    # Growth of the fit time with the number of frames, fit time ~ frames ** exponent, measured
+    # on the tracked points. Models not listed scale linearly.
+    fit_time_exponents = {"SVR": 1.5, "RFR": 1.25}
+    random_state = 42
+    # Version of the log format, part of the keys of the saved estimators
+    selection_version = 1
+
     models = {
         "RFR": RandomForestRegressor(n_estimators=100, random_state=42),
-        "HGBR": HistGradientBoostingRegressor(),
+        "HGBR": HistGradientBoostingRegressor(random_state=42),
         "KNR": KNeighborsRegressor(n_neighbors=10),
-        "XGB": XGBRegressor(n_estimators=100, learning_rate=0.1),
+        # One thread per fit, the grid search runs the fits in parallel instead
+        "XGB": XGBRegressor(n_estimators=100, learning_rate=0.1, random_state=42, n_jobs=1),
         "SVR": SVR(kernel='rbf', C=100, gamma=0.1, epsilon=0.1),
         "BR": BayesianRidge(),
         "Poly": make_pipeline(PolynomialFeatures(degree=2), BayesianRidge())
@@ -69,22 +165,93 @@ class OutlierImputer:
                  "polynomialfeatures__degree": [2]}
     }
 
-    def __init__(self, log_file="model_performance.json") -> None:
+    def __init__(self,
+                 log_file="model_performance.json",
+                 n_jobs: int = -1,
+                 reuse: bool = False,
+                 max_age: int | float = None,
+                 drift_threshold: int | float = 0.5,
+                 search: str = "grid",
+                 time_budget: int | float = None,
+                 max_gap: int = 5,
+                 fallback_model: str = None,
+                 window: int = None,
+                 max_train_rows: int = 5000) -> None:
         """
         Initialize the OutlierImputer.
 
         Args:
             log_file (str, optional): Path to the JSON file for logging model performance. Defaults to "model_performance.json".
+            n_jobs (int, optional): Number of processes used by the grid search, -1 for one per CPU.
+                Defaults to -1.
+            reuse (bool, optional): Whether to reuse the logged selection. Defaults to False.
+            max_age (int | float, optional): Age in days after which a logged selection is stale,
+                None for no limit. Defaults to None.
+            drift_threshold (int | float, optional): Drift of the data after which a logged
+                selection is stale. Defaults to 0.5.
+            search (str, optional): Model search strategy, "grid" or "halving". Defaults to "grid".
+            time_budget (int | float, optional): Wall-clock seconds allowed to the halving search
+                of each column, None for no limit. Defaults to None.
+            max_gap (int, optional): Longest run of missing frames filled by the temporal models.
+                Defaults to 5.
+            fallback_model (str, optional): Name of the model imputing the longer runs after a
+                temporal model. If None, tries all models. Defaults to None.
+            window (int, optional): Frames on each side of the missing values used by the local
+                imputation, None to use all the frames. Defaults to None.
+            max_train_rows (int, optional): Number of complete rows the local imputation trains on.
+                Defaults to 5000.
 
         Raises:
-            TypeError: If log_file is not a string.
-            ValueError: If log_file does not have a .json extension.
+            TypeError: If an argument has the wrong type.
+            ValueError: If log_file does not have a .json extension, n_jobs is neither positive nor -1,
+                max_age, drift_threshold, time_budget, max_gap or max_train_rows is not positive,
+                window is negative, or search or fallback_model is invalid.
         """
         Val.validate_type(log_file, str, "Log File")
         Val.validate_path(log_file, file_types=[".json"])
+        Val.validate_type(n_jobs, int, "Number of Jobs")
+        if n_jobs != -1:
+            Val.validate_positive(n_jobs, "Number of Jobs", zero_allowed=False)
+        Val.validate_type(reuse, bool, "Reuse")
+        if max_age is not None:
+            Val.validate_type(max_age, (int, float), "Max Age")
+            Val.validate_positive(max_age, "Max Age")
+        Val.validate_type(drift_threshold, (int, float), "Drift Threshold")
+        Val.validate_positive(drift_threshold, "Drift Threshold")
+        Val.validate_in_list(search, self.searches, "Search")
+        if time_budget is not None:
+            Val.validate_type(time_budget, (int, float), "Time Budget")
+            Val.validate_positive(time_budget, "Time Budget")
+        Val.validate_type(max_gap, int, "Max Gap")
+        Val.validate_positive(max_gap, "Max Gap")
+        if fallback_model is not None:
+            Val.validate_in_list(fallback_model, list(self.models), "Fallback Model")
+        if window is not None:
+            Val.validate_type(window, int, "Window")
+            Val.validate_positive(window, "Window", zero_allowed=True)
+        Val.validate_type(max_train_rows, int, "Max Train Rows")
+        Val.validate_positive(max_train_rows, "Max Train Rows")
 
         self.best_models = {}
+        self.best_scores = {}
+        self.selections = {}
+        self.fitted_models = {}
         self.log_file = log_file
+        self.model_dir = f"{os.path.splitext(log_file)[0]}_models"
+        self.n_jobs = n_jobs
+        self.reuse = reuse
+        self.max_age = max_age
+        self.drift_threshold = drift_threshold
+        self.search = search
+        self.time_budget = time_budget
+        self.search_reports = {}
+        self.max_gap = max_gap
+        self.fallback_model = fallback_model
+        self.temporal_fills = {}
+        self.imputation_rounds = []
+        self.window = window
+        self.max_train_rows = max_train_rows
+        self.local_summary = {}
 
     @staticmethod
     def transform_to_derivative(df: pd.DataFrame) -> pd.DataFrame:
@@ -141,15 +308,197 @@ class OutlierImputer:
         df[outlier_mask] = np.nan
         return df
 
-    def _grid_search_models_per_col(self, df: pd.DataFrame, model_name: str = None) -> None:
+    @staticmethod
+    def _worker_counts(n_jobs: int, n_tasks: int) -> tuple[int, int]:
+        """
+        Split the workers between the (column, model) searches and their cross-validation folds.
+
+        The searches run in `outer` processes, each running the fits of its grid search in
+        `inner` processes, so that at most `n_jobs` fits run at once.
+
+        Args:
+            n_jobs (int): Number of workers, -1 for one per CPU.
+            n_tasks (int): Number of (column, model) or column searches.
+
+        Returns:
+            tuple[int, int]: The (outer, inner) numbers of workers.
+        """
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        outer = max(1, min(n_jobs, n_tasks))
+        return outer, max(1, n_jobs // outer)
+
+    @staticmethod
+    def _init_worker() -> None:
+        # The workers already use every CPU, so each fit runs single-threaded
+        threadpool_limits(limits=1)
+
+    @staticmethod
+    def _search_model(model, param_grid: dict, X_train: pd.DataFrame, y_train: pd.Series,
+                      n_jobs: int) -> tuple[float, object]:
+        """
+        Grid search the hyperparameters of one model for one column.
+
+        Args:
+            model: The estimator to tune.
+            param_grid (dict): Hyperparameter grid of the estimator.
+            X_train (pd.DataFrame): The other columns, for the rows where all values are known.
+            y_train (pd.Series): The column to predict.
+            n_jobs (int): Number of processes fitting the candidates and folds.
+
+        Returns:
+            tuple[float, object]: The cross-validated MSE and the refitted best estimator.
+        """
+        grid = GridSearchCV(model,
+                            param_grid,
+                            scoring="neg_mean_squared_error",
+                            cv=3,
+                            n_jobs=n_jobs)
+        grid.fit(X_train, y_train)
+        return -grid.best_score_, grid.best_estimator_
+
+    @staticmethod
+    def _halving_search(models: list[tuple], X_train: pd.DataFrame, y_train: pd.Series,
+                        time_budget: float | None, n_jobs: int) -> tuple[float, object, dict]:
+        """
+        Race the hyperparameter combinations of all the models of one column by successive halving.
+
+        Every (model, hyperparameters) candidate is cross-validated on a subset of evenly spaced
+        frames, the best 1/`halving_factor` of them are kept and cross-validated on
+        `halving_factor` times more frames, and so on until the last candidates are
+        cross-validated on all the frames. Most candidates are therefore only fitted on a few
+        frames. The first round alternates between the models and the later rounds evaluate the
+        candidates best first.
+
+        The search is held to `time_budget` seconds, including the final refit. The models are
+        evaluated from the cheapest to the most expensive (see `halving_order`), so a short
+        budget tries the fast models first. The time of the cross-validation of a candidate is
+        projected from the previous candidate of its model, and a candidate that would end after
+        the budget, less the `halving_refit_share` of it kept for the refit, is skipped. The
+        search then keeps the best candidate evaluated on the most frames. Its refit time is
+        extrapolated from its fit times (see `fit_time_exponents`), and the refit uses the
+        largest subset of evenly spaced frames that fits in the time left, all the frames if
+        they fit. The first candidate is always evaluated and a candidate is never stopped
+        halfway, so the budget can be exceeded by the cross-validation of one candidate.
+
+        Args:
+            models (list[tuple]): The (name, estimator, param_grid) of the models to try.
+            X_train (pd.DataFrame): The other columns, for the rows where all values are known.
+            y_train (pd.Series): The column to predict.
+            time_budget (float | None): Wall-clock seconds allowed to the search, None for no limit.
+            n_jobs (int): Number of processes fitting the folds.
+
+        Returns:
+            tuple[float, object, dict]: The cross-validated MSE of the best candidate on the frames
+                of its last round, the refitted best estimator and a summary of the search.
+        """
+        start = time.perf_counter()
+        deadline = start + time_budget if time_budget is not None else float("inf")
+        factor = OutlierImputer.halving_factor
+        order = OutlierImputer.halving_order
+        models = sorted(models, key=lambda m: order.index(m[0]) if m[0] in order else len(order))
+        # Round-robin over the models, so that a short budget still tries every model
+        per_model = [[(name, model, params) for params in ParameterGrid(param_grid)]
+                     for name, model, param_grid in models]
+        candidates = [candidate for group in zip_longest(*per_model) for candidate in group
+                      if candidate is not None]
+        n_frames = len(y_train)
+        n_rounds = max(1, math.ceil(math.log(len(candidates), factor)))
+        frames = min(n_frames, max(OutlierImputer.halving_min_frames,
+                                   math.ceil(n_frames / factor ** (n_rounds - 1))))
+
+        def projected(seconds: float, measured_frames: int, target_frames: int, name: str) -> float:
+            exponent = OutlierImputer.fit_time_exponents.get(name, 1.0)
+            return seconds * (target_frames / measured_frames) ** exponent
+
+        # (frames, seconds) of the last cross-validation of each model and of the folds of
+        # each candidate, to project the time of the next ones
+        cv_times, fit_times = {}, {}
+        refit_seconds = OutlierImputer.halving_refit_share * (time_budget or 0.0)
+        best, rounds, fits, timed_out, tried = None, 0, 0, False, []
+        while True:
+            rows = np.unique(np.linspace(0, n_frames - 1, frames).round().astype(int))
+            scores = []
+            for name, model, params in candidates:
+                # At least one candidate is evaluated, however small the budget
+                if (scores or best) and time_budget is not None:
+                    cv_seconds = 0.0
+                    if name in cv_times:
+                        cv_frames, cv_seconds = cv_times[name]
+                        cv_seconds = projected(cv_seconds, cv_frames, len(rows), name)
+                    if time.perf_counter() + cv_seconds + refit_seconds > deadline:
+                        timed_out = True
+                        continue
+                cv_results = cross_validate(clone(model).set_params(**params),
+                                            X_train.iloc[rows], y_train.iloc[rows],
+                                            scoring="neg_mean_squared_error", cv=3,
+                                            n_jobs=n_jobs, error_score=np.nan)
+                mse = -np.mean(cv_results["test_score"])
+                scores.append((mse if np.isfinite(mse) else float("inf"), name, model, params))
+                fits += 1
+                if name not in tried:
+                    tried.append(name)
+                cv_times[name] = (len(rows), float(np.sum(cv_results["fit_time"] +
+                                                          cv_results["score_time"])))
+                # Each fold is fitted on 2/3 of the rows
+                fit_times[(name, repr(params))] = (max(len(rows) * 2 // 3, 1),
+                                                   float(np.max(cv_results["fit_time"])))
+            rounds += 1
+            if scores:
+                # Stable sort, so ties keep the order of `models` and `param_grids`
+                scores.sort(key=lambda score: score[0])
+                best = scores[0]
+            if timed_out or frames >= n_frames or len(scores) <= 1:
+                break
+            candidates = [(name, model, params) for _, name, model, params
+                          in scores[:math.ceil(len(scores) / factor)]]
+            frames = min(n_frames, frames * factor)
+
+        mse, name, model, params = best
+        # Refit on the most frames that fit in the time left
+        fold_frames, fold_seconds = fit_times[(name, repr(params))]
+        remaining = max(deadline - time.perf_counter(), 0.0)
+        refit_frames = n_frames
+        if projected(fold_seconds, fold_frames, n_frames, name) > remaining:
+            exponent = OutlierImputer.fit_time_exponents.get(name, 1.0)
+            refit_frames = int(fold_frames * (remaining / fold_seconds) ** (1 / exponent)) \
+                if fold_seconds > 0 else n_frames
+            refit_frames = min(n_frames, max(refit_frames, fold_frames))
+        refit_rows = np.unique(np.linspace(0, n_frames - 1, refit_frames).round().astype(int))
+        estimator = clone(model).set_params(**params).fit(X_train.iloc[refit_rows],
+                                                          y_train.iloc[refit_rows])
+        report = {"strategy": "halving",
+                  "model": name,
+                  "models_tried": tried,
+                  "rounds": rounds,
+                  "frames": int(len(rows)),
+                  "refit_frames": int(len(refit_rows)),
+                  "fits": fits,
+                  "seconds": round(time.perf_counter() - start, 3),
+                  "completed": not timed_out}
+        return mse, estimator, report
+
+    def _grid_search_models_per_col(self,
+                                    df: pd.DataFrame,
+                                    model_name: str = None,
+                                    columns: list[str] = None) -> None:
         """
         Perform grid search to select the best regression model for each column.
 
         For each column, fits all candidate models (or a specified model) using grid search and stores the best model.
+        The (column, model) searches run in parallel processes and the workers left over run the
+        cross-validation fits of each search, using `self.n_jobs` workers in total. The folds and
+        the models are seeded, so the selection does not depend on the number of workers.
+
+        With `self.search == "halving"`, the models of each column are raced by `_halving_search`
+        within `self.time_budget` instead, one column per process, and the summary of each search
+        is stored in `self.search_reports`.
 
         Args:
             df (pd.DataFrame): DataFrame with missing values to impute.
             model_name (str, optional): Name of a specific model to use. If None, tries all models.
+            columns (list[str], optional): Columns to search, keeping the models of the others.
+                If None, all the columns are searched.
 
         Returns:
             None
@@ -165,64 +514,593 @@ class OutlierImputer:
                 raise ValueError(
                     f"Invalid model name '{model_name}'. Available models: {list(self.models.keys())}")
 
-        self.best_models = {}
-        for target_col in df.columns:
+        models_to_try = {
+            model_name: self.models[model_name]} if model_name else self.models
+
+        if columns is None:
+            self.best_models, self.best_scores = {}, {}
+            columns = list(df.columns)
+        tasks = []
+        for target_col in columns:
             train_df = df.dropna(subset=[target_col]).dropna(how="any")
+            self.best_models[target_col] = None
+            self.fitted_models.pop(target_col, None)
+            self.best_scores.pop(target_col, None)
+            self.search_reports.pop(target_col, None)
             if train_df.empty:
-                self.best_models[target_col] = None
                 continue
 
             X_train = train_df.drop(columns=[target_col])
             y_train = train_df[target_col]
+            if self.search == "halving":
+                models = [(name, model, self.param_grids.get(name, {}))
+                          for name, model in models_to_try.items()]
+                tasks.append((target_col, self._halving_search,
+                              (models, X_train, y_train, self.time_budget)))
+                continue
+            for name, model in models_to_try.items():
+                tasks.append((target_col, self._search_model,
+                              (model, self.param_grids.get(name, {}), X_train, y_train)))
 
-            models_to_try = {
-                model_name: self.models[model_name]} if model_name else self.models
-            best_model, best_score = None, float("inf")
+        outer, inner = self._worker_counts(self.n_jobs, len(tasks))
+        if outer == 1:
+            results = [search(*args, inner) for _, search, args in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=outer, initializer=self._init_worker) as executor:
+                futures = [executor.submit(search, *args, inner) for _, search, args in tasks]
+                results = [future.result() for future in futures]
 
-            for name, model in models_to_try.items():
-                param_grid = self.param_grids.get(name, {})
+        # Same order and tie-breaking as a serial search
+        for (target_col, *_), (mse, estimator, *report) in zip(tasks, results):
+            if report:
+                self.search_reports[target_col] = report[0]
+            if mse < self.best_scores.get(target_col, float("inf")):
+                self.best_scores[target_col] = mse
+                self.best_models[target_col] = estimator
+
+    @staticmethod
+    def _column_stats(values: pd.Series) -> dict:
+        """Number, mean and standard deviation of the known values of a column."""
+        values = values.dropna()
+        return {"n": int(values.size),
+                "mean": float(values.mean()) if values.size else None,
+                "std": float(values.std()) if values.size > 1 else None}
+
+    def _is_drifted(self, stats: dict, logged_stats: dict) -> bool:
+        """Whether the data drifted by more than `drift_threshold` since it was logged."""
+        if stats["std"] is None or logged_stats.get("std") is None or logged_stats.get("mean") is None:
+            return True
+        logged_std = max(logged_stats["std"], np.finfo(float).eps)
+        mean_shift = abs(stats["mean"] - logged_stats["mean"]) / logged_std
+        std_change = abs(stats["std"] - logged_std) / logged_std
+        return mean_shift > self.drift_threshold or std_change > self.drift_threshold
+
+    def _describe_model(self, model) -> tuple[str, dict] | None:
+        """
+        Name and grid searched hyperparameters of an estimator, None if it is not one of `models`.
+        """
+        for name, template in self.models.items():
+            if type(model) is type(template):
+                params = model.get_params()
+                return name, {param: params[param] for param in self.param_grids.get(name, {})}
+        return None
+
+    def _model_path(self, column: str, name: str, params: dict) -> str:
+        """
+        Path of the saved estimator of a column.
+
+        The file name is a hash of the selection and of the versions of the log format and the
+        libraries, since joblib files can only be loaded reliably by the versions that wrote them.
+        """
+        key = json.dumps([self.selection_version, column, name, params, sklearn.__version__,
+                          xgboost.__version__, np.__version__], sort_keys=True, default=str)
+        digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.model_dir, f"{digest}.joblib")
+
+    def load_selection(self, df: pd.DataFrame, model_name: str = None) -> list[str]:
+        """
+        Load the logged model of every column whose selection is still valid.
+
+        The saved estimator is loaded if it was written by the current library versions,
+        otherwise the model is rebuilt from its logged hyperparameters. A column's selection is
+        stale, and is not loaded, if:
+            - the log has no valid entry for it (e.g. logs written before selections were reused),
+            - it is older than `max_age` days,
+            - it is for another model than `model_name`, or
+            - the mean of the column shifted by more than `drift_threshold` logged standard
+              deviations, or its standard deviation changed by more than `drift_threshold`
+              times the logged one.
+
+        Args:
+            df (pd.DataFrame): DataFrame to impute, with outliers replaced by NaN.
+            model_name (str, optional): Name of the model the selection must use. If None, any.
+
+        Returns:
+            list[str]: The columns with a stale selection, which need a grid search.
+
+        Raises:
+            TypeError: If df is not a DataFrame.
+        """
+        Val.validate_type(df, pd.DataFrame, "DataFrame")
+        try:
+            with open(self.log_file, "r") as f:
+                log = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            log = {}
+        if not isinstance(log, dict):
+            log = {}
+
+        now = datetime.now(timezone.utc)
+        stale = []
+        for column in df.columns:
+            entry = log.get(column)
+            if not isinstance(entry, dict) or entry.get("model") not in self.models or \
+                    not isinstance(entry.get("params"), dict):
+                stale.append(column)
+                continue
+            try:
+                age = now - datetime.fromisoformat(entry["selected_at"])
+            except (KeyError, TypeError, ValueError):
+                stale.append(column)
+                continue
+            if (self.max_age is not None and age.total_seconds() > self.max_age * 86400) or \
+                    (model_name and entry["model"] != model_name) or \
+                    self._is_drifted(self._column_stats(df[column]), entry.get("stats", {})):
+                stale.append(column)
+                continue
 
-                grid = GridSearchCV(model,
-                                    param_grid,
-                                    scoring="neg_mean_squared_error",
-                                    cv=3)
-                grid.fit(X_train, y_train)
-                mse = -grid.best_score_
-                if mse < best_score:
-                    best_score, best_model = mse, grid.best_estimator_
+            model_path = self._model_path(column, entry["model"], entry["params"])
+            try:
+                model = joblib.load(model_path)
+                self.fitted_models[column] = model
+            except Exception:
+                # Missing or written by other library versions
+                model = clone(self.models[entry["model"]]).set_params(**entry["params"])
+                self.fitted_models.pop(column, None)
+            self.best_models[column] = model
+            self.selections[column] = entry
+        return stale
 
-            self.best_models[target_col] = best_model
+    def save_selection(self, df: pd.DataFrame) -> None:
+        """
+        Log the selected model of every column and save the estimators with joblib.
+
+        Columns whose selection was loaded by `load_selection` keep their logged entry, so their
+        age and drift are still measured from when they were selected.
 
-    def iterative_imputation(self, df: pd.DataFrame, max_iter=1000) -> pd.DataFrame:
+        Args:
+            df (pd.DataFrame): The data the models were selected on, with outliers replaced by NaN.
+
+        Raises:
+            TypeError: If df is not a DataFrame.
+        """
+        Val.validate_type(df, pd.DataFrame, "DataFrame")
+        selected_at = datetime.now(timezone.utc).isoformat()
+        log = {}
+        for column, model in self.best_models.items():
+            description = self._describe_model(model) if model is not None else None
+            logged = self.selections.get(column, {})
+            if description and description == (logged.get("model"), logged.get("params")):
+                log[column] = self.selections[column]
+                continue
+            if model is None:
+                log[column] = None
+                continue
+
+            entry = {"estimator": str(model)}
+            if description:
+                name, params = description
+                model_path = self._model_path(column, name, params)
+                os.makedirs(self.model_dir, exist_ok=True)
+                joblib.dump(model, model_path)
+                entry.update({"model": name,
+                              "params": params,
+                              "mse": self.best_scores.get(column),
+                              "selected_at": selected_at,
+                              "stats": self._column_stats(df[column]) if column in df else None,
+                              "search": self.search_reports.get(column, {"strategy": "grid"}),
+                              "model_file": os.path.basename(model_path)})
+            log[column] = entry
+            self.selections[column] = entry
+
+        for column, fill in self.temporal_fills.items():
+            log[column] = {**(log.get(column) or {}), "temporal": fill}
+
+        with open(self.log_file, "w") as f:
+            json.dump(log, f, indent=4)
+
+    @staticmethod
+    def _short_gaps(missing: np.ndarray, max_gap: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the runs of at most `max_gap` missing frames with known values on both sides.
+
+        Args:
+            missing (np.ndarray): (n_frames, n_columns) boolean mask of the missing values.
+            max_gap (int): Longest run to keep.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The first frame, the frame after the last
+                one and the column of every run.
+        """
+        n_frames, n_columns = missing.shape
+        padded = np.zeros((n_frames + 2, n_columns), dtype=np.int8)
+        padded[1:-1] = missing
+        edges = np.diff(padded, axis=0)
+        # Column-major, so the starts and ends of the runs of each column pair up in order
+        columns, starts = np.nonzero(edges.T == 1)
+        _, ends = np.nonzero(edges.T == -1)
+        keep = (ends - starts <= max_gap) & (starts > 0) & (ends < n_frames)
+        return starts[keep], ends[keep], columns[keep]
+
+    @staticmethod
+    def _kalman_scale(values: np.ndarray) -> np.ndarray:
+        """
+        Variance of each column, or its mean square if it is constant, or 1 if it is all zero.
+
+        The noise floor and the prior of the Kalman smoother are set relative to it, so their
+        ratio does not depend on the units and a noiseless column stays well conditioned.
+
+        Args:
+            values (np.ndarray): (n_frames, n_columns) coordinates, NaN where missing.
+
+        Returns:
+            np.ndarray: The scale of every column.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            variance = np.nan_to_num(np.nanvar(values, axis=0))
+            mean_square = np.nan_to_num(np.nanmean(values ** 2, axis=0))
+        return np.where(variance > 0, variance, np.where(mean_square > 0, mean_square, 1.0))
+
+    @staticmethod
+    def _kalman_noise(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Estimate the process and measurement noise of a constant-velocity model of each column.
+
+        With an acceleration of variance q held over each frame and a measurement noise of
+        variance r, the second differences of a column have a variance of q/2 + 6r and a lag-one
+        covariance of q/4 - 4r, which are solved for q and r. Both are at least 1e-6 times the
+        scale of the column (see `_kalman_scale`).
+
+        Args:
+            values (np.ndarray): (n_frames, n_columns) coordinates, NaN where missing.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The process noise q and measurement noise r of every column.
+        """
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            second_diff = np.diff(values, n=2, axis=0)
+            second_diff = second_diff - np.nanmean(second_diff, axis=0)
+            gamma0 = np.nanmean(second_diff ** 2, axis=0)
+            gamma1 = np.nanmean(second_diff[1:] * second_diff[:-1], axis=0)
+        gamma0 = np.nan_to_num(gamma0, nan=1.0)
+        gamma1 = np.nan_to_num(gamma1, nan=0.0)
+        r = np.clip((gamma0 - 2 * gamma1) / 14, 1e-3 * gamma0, None)
+        q = np.clip(2 * (gamma0 - 6 * r), 1e-3 * gamma0, None)
+        floor = 1e-6 * OutlierImputer._kalman_scale(values)
+        return np.maximum(q, floor), np.maximum(r, floor)
+
+    @staticmethod
+    def _kalman_smooth(values: np.ndarray, q: np.ndarray, r: np.ndarray) -> np.ndarray:
+        """
+        Constant-velocity Kalman filter and Rauch-Tung-Striebel smoother, vectorized over the columns.
+
+        Args:
+            values (np.ndarray): (n_frames, n_columns) coordinates, NaN where missing.
+            q (np.ndarray): Process noise (variance of the acceleration) of every column.
+            r (np.ndarray): Measurement noise of every column.
+
+        Returns:
+            np.ndarray: (n_frames, n_columns) smoothed coordinates.
+        """
+        n_frames, n_columns = values.shape
+        observed = ~np.isnan(values)
+        first = values[np.argmax(observed, axis=0), np.arange(n_columns)]
+        # Noise of an acceleration held over one frame
+        q00, q01, q11 = q / 4, q / 2, q
+
+        # Vague prior around the first known value, finite relative to the noise
+        prior = 1e4 * OutlierImputer._kalman_scale(values)
+        x0, x1 = np.nan_to_num(first), np.zeros(n_columns)
+        p00, p01, p11 = prior.copy(), np.zeros(n_columns), prior.copy()
+        filtered = np.empty((n_frames, 5, n_columns))
+        predicted = np.empty((n_frames, 5, n_columns))
+        for t in range(n_frames):
+            if t > 0:
+                x0, x1 = x0 + x1, x1
+                p00, p01, p11 = p00 + 2 * p01 + p11 + q00, p01 + p11 + q01, p11 + q11
+            predicted[t] = x0, x1, p00, p01, p11
+
+            seen = observed[t]
+            gain0 = np.where(seen, p00 / (p00 + r), 0.0)
+            gain1 = np.where(seen, p01 / (p00 + r), 0.0)
+            innovation = np.where(seen, values[t] - x0, 0.0)
+            x0, x1 = x0 + gain0 * innovation, x1 + gain1 * innovation
+            p00, p01, p11 = (1 - gain0) * p00, (1 - gain0) * p01, p11 - gain1 * p01
+            filtered[t] = x0, x1, p00, p01, p11
+
+        smoothed = np.empty((n_frames, n_columns))
+        s0, s1 = filtered[-1, 0], filtered[-1, 1]
+        smoothed[-1] = s0
+        for t in range(n_frames - 2, -1, -1):
+            f0, f1, f00, f01, f11 = filtered[t]
+            n0, n1, n00, n01, n11 = predicted[t + 1]
+            # Smoother gain P_t F^T inv(P_pred), with F = [[1, 1], [0, 1]]
+            a00, a01, a10, a11 = f00 + f01, f01, f01 + f11, f11
+            det = n00 * n11 - n01 ** 2
+            # A singular prediction keeps the filtered state
+            invertible = det > 0
+            inv_det = np.where(invertible, 1 / np.where(invertible, det, 1.0), 0.0)
+            g00, g01 = (a00 * n11 - a01 * n01) * inv_det, (a01 * n00 - a00 * n01) * inv_det
+            g10, g11 = (a10 * n11 - a11 * n01) * inv_det, (a11 * n00 - a10 * n01) * inv_det
+            d0, d1 = s0 - n0, s1 - n1
+            s0, s1 = f0 + g00 * d0 + g01 * d1, f1 + g10 * d0 + g11 * d1
+            smoothed[t] = s0
+        return smoothed
+
+    def temporal_imputation(self, df: pd.DataFrame, method: str = "Kalman") -> pd.DataFrame:
+        """
+        Fill the short runs of missing values from the neighbouring frames.
+
+        Runs of at most `self.max_gap` frames with known values on both sides are filled, either
+        by a constant-velocity Kalman/RTS smoother ("Kalman") or by piecewise cubic Hermite
+        interpolation of the known values of the column ("Cubic"), which does not overshoot.
+        Longer runs and runs at the start or end stay missing. The smoother runs on the
+        `kalman_window` frames around each run, all the runs at once, with the noise of each
+        column estimated from the whole column (see `_kalman_noise`). No model is trained, so
+        this takes milliseconds. The number of filled values of each column is stored in
+        `self.temporal_fills`.
+
+        Args:
+            df (pd.DataFrame): DataFrame with missing values to impute, one row per frame.
+            method (str, optional): "Kalman" or "Cubic". Defaults to "Kalman".
+
+        Returns:
+            pd.DataFrame: DataFrame with the short runs filled.
+
+        Raises:
+            TypeError: If df is not a DataFrame.
+            ValueError: If df is empty or not numeric, or method is invalid.
+        """
+        Val.validate_type(df, pd.DataFrame, "DataFrame")
+        Val.validate_dataframe_numeric(df, "DataFrame")
+        Val.validate_in_list(method, self.temporal_models, "Method")
+
+        values = df.to_numpy(dtype=float)
+        n_frames = len(values)
+        starts, ends, columns = self._short_gaps(np.isnan(values), self.max_gap)
+        # Frame and column of every value to fill, and the run it belongs to
+        lengths = ends - starts
+        runs = np.repeat(np.arange(len(starts)), lengths)
+        frames = starts[runs] + np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        cells_columns = columns[runs]
+
+        filled = values.copy()
+        if len(starts) and method == "Kalman":
+            # One window per run, smoothed side by side
+            length = min(n_frames, self.max_gap + 2 * self.kalman_window)
+            window_starts = np.clip(starts - self.kalman_window, 0, n_frames - length)
+            window_frames = window_starts[None, :] + np.arange(length)[:, None]
+            q, r = self._kalman_noise(values)
+            smoothed = self._kalman_smooth(values[window_frames, columns[None, :]],
+                                           q[columns], r[columns])
+            filled[frames, cells_columns] = smoothed[frames - window_starts[runs], runs]
+        elif len(starts):
+            frame_numbers = np.arange(n_frames)
+            for col in np.unique(columns):
+                known = ~np.isnan(values[:, col])
+                to_fill = frames[cells_columns == col]
+                interpolator = PchipInterpolator(frame_numbers[known], values[known, col])
+                filled[to_fill, col] = interpolator(to_fill)
+
+        # Only the values that could be imputed count as filled
+        finite = np.isfinite(filled[frames, cells_columns])
+        n_filled = np.bincount(cells_columns[finite], minlength=values.shape[1])
+        self.temporal_fills = {column: {"method": method,
+                                        "max_gap": self.max_gap,
+                                        "filled": int(n)}
+                               for column, n in zip(df.columns, n_filled)}
+        return pd.DataFrame(filled, columns=df.columns, index=df.index)
+
+    def log_temporal_fills(self) -> None:
+        """
+        Record `self.temporal_fills` in the log without changing the logged model selection.
+
+        Used when a temporal model filled every gap, so that the models selected in earlier
+        sessions, and their saved estimators, can still be reused.
+        """
+        try:
+            with open(self.log_file, "r") as f:
+                log = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            log = {}
+        if not isinstance(log, dict):
+            log = {}
+
+        for column, fill in self.temporal_fills.items():
+            entry = log.get(column)
+            if not isinstance(entry, dict):
+                entry = {} if entry is None else {"estimator": entry}
+            log[column] = {**entry, "temporal": fill}
+
+        with open(self.log_file, "w") as f:
+            json.dump(log, f, indent=4)
+
+    def iterative_imputation(self,
+                             df: pd.DataFrame,
+                             max_iter: int = 20,
+                             tol: float = 1e-3,
+                             n_iter_no_change: int = 3) -> pd.DataFrame:
         """
         Impute missing values in the DataFrame using iterative model-based imputation.
 
-        Uses the best model(s) found by grid search to iteratively impute missing values.
+        Uses the best model found by grid search for each column to iteratively impute its missing values.
+        The missing values are first interpolated over time, then every round refits the model of
+        each column, fewest missing values first, on its known values and predicts its missing
+        ones from the current values of the other columns. Columns without a selected model use
+        a BayesianRidge. The saved estimators loaded by `load_selection` are not refitted: they
+        predict the missing values of their column in every round, if they were fitted on the
+        same other columns. The rounds stop once the largest change of an imputed value, relative to
+        the largest known value, is below `tol`, once it has not decreased for `n_iter_no_change`
+        rounds, or after `max_iter` rounds. The change and duration of every round are logged
+        and stored in `self.imputation_rounds`.
+
+        Without any selected model, a single random forest is used for all the columns by
+        sklearn's IterativeImputer, with the same `max_iter` and `tol`.
 
         Args:
             df (pd.DataFrame): DataFrame with missing values to impute.
-            max_iter (int, optional): Maximum number of imputation iterations. Defaults to 1000.
+            max_iter (int, optional): Maximum number of imputation rounds. Defaults to 20.
+            tol (float, optional): Relative change below which the imputation has converged.
+                Defaults to 1e-3.
+            n_iter_no_change (int, optional): Number of rounds without a smaller change after which
+                the imputation stops. Defaults to 3.
 
         Returns:
             pd.DataFrame: DataFrame with imputed values.
 
         Raises:
-            TypeError: If df is not a DataFrame or max_iter is not an integer.
-            ValueError: If max_iter is not positive.
+            TypeError: If df is not a DataFrame, or max_iter, tol or n_iter_no_change has the wrong type.
+            ValueError: If df is empty or not numeric, or max_iter, tol or n_iter_no_change is not positive.
         """
         Val.validate_type(df, pd.DataFrame, "DataFrame")
         Val.validate_type(max_iter, int, "Max Iterations")
         Val.validate_positive(max_iter, "Max Iterations")
+        Val.validate_type(tol, (int, float), "Tolerance")
+        Val.validate_positive(tol, "Tolerance")
+        Val.validate_type(n_iter_no_change, int, "Iterations Without Change")
+        Val.validate_positive(n_iter_no_change, "Iterations Without Change")
+        Val.validate_dataframe_numeric(df, "DataFrame")
 
+        self.imputation_rounds = []
         df_copy = df.copy()
-        estimators = [model for model in self.best_models.values() if model]
-        estimator = estimators[0] if estimators else RandomForestRegressor()
+        if not any(model is not None for model in self.best_models.values()):
+            imputer = IterativeImputer(estimator=RandomForestRegressor(),
+                                       max_iter=max_iter,
+                                       tol=tol,
+                                       random_state=101)
+            imputed_array = imputer.fit_transform(df_copy)
+            return pd.DataFrame(imputed_array, columns=df.columns, index=df.index)
+
+        values = df_copy.to_numpy(dtype=float)
+        missing = np.isnan(values)
+        usable = np.flatnonzero(~missing.all(axis=0))
+        targets = sorted((col for col in usable if missing[:, col].any()),
+                         key=lambda col: missing[:, col].sum())
+        # Start from the values interpolated over time
+        filled = df_copy.astype(float).interpolate(limit_direction="both").to_numpy()
+        if not targets or len(usable) < 2:
+            return pd.DataFrame(filled, columns=df.columns, index=df.index)
 
-        imputer = IterativeImputer(estimator=estimator,
-                                   max_iter=max_iter,
-                                   random_state=101)
-        imputed_array = imputer.fit_transform(df_copy)
-        return pd.DataFrame(imputed_array, columns=df.columns, index=df.index)
+        scale = np.nanmax(np.abs(values[:, usable])) or 1.0
+        models = [self.best_models.get(column) for column in df.columns]
+        best_change, rounds_without_change = float("inf"), 0
+        for iteration in range(1, max_iter + 1):
+            start = time.perf_counter()
+            previous = filled.copy()
+            for col in targets:
+                features = usable[usable != col]
+                known = ~missing[:, col]
+                fitted = self.fitted_models.get(df.columns[col])
+                if fitted is not None and \
+                        list(getattr(fitted, "feature_names_in_", [])) == list(df.columns[features]):
+                    X_missing = pd.DataFrame(filled[~known][:, features], columns=df.columns[features])
+                    filled[~known, col] = fitted.predict(X_missing)
+                    continue
+                estimator = clone(models[col]) if models[col] is not None else BayesianRidge()
+                estimator.fit(filled[known][:, features], values[known, col])
+                filled[~known, col] = estimator.predict(filled[~known][:, features])
+
+            change = float(np.max(np.abs(filled - previous)[missing])) / scale
+            seconds = time.perf_counter() - start
+            self.imputation_rounds.append({"iteration": iteration,
+                                           "change": change,
+                                           "seconds": round(seconds, 3)})
+            logger.info("Imputation round %d: change %.2e in %.2f s", iteration, change, seconds)
+            if change < tol:
+                break
+            if change < best_change:
+                best_change, rounds_without_change = change, 0
+            else:
+                rounds_without_change += 1
+                if rounds_without_change >= n_iter_no_change:
+                    logger.info("Imputation stopped after %d rounds without a smaller change.",
+                                n_iter_no_change)
+                    break
+        return pd.DataFrame(filled, columns=df.columns, index=df.index)
+
+    @staticmethod
+    def selection_summary(log_file: str) -> pd.DataFrame:
+        """
+        Summarize the logged model selection, e.g. to show which model each search found.
+
+        Args:
+            log_file (str): Path to the JSON log written by `save_selection`.
+
+        Returns:
+            pd.DataFrame: One row per column with the model, the temporal model and the number
+                of values it filled, the cross-validated MSE, when the model was selected and the
+                search strategy, frames, fits, seconds and completion of the halving search.
+                Empty if the log is missing or unreadable.
+        """
+        try:
+            with open(log_file, "r") as f:
+                log = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return pd.DataFrame()
+        if not isinstance(log, dict):
+            return pd.DataFrame()
+
+        rows = {}
+        for column, entry in log.items():
+            if not isinstance(entry, dict):
+                entry = {"estimator": entry}
+            search = entry.get("search") or {}
+            rows[column] = {"model": entry.get("model", entry.get("estimator")),
+                            "temporal": (entry.get("temporal") or {}).get("method"),
+                            "temporal_filled": (entry.get("temporal") or {}).get("filled"),
+                            "mse": entry.get("mse"),
+                            "selected_at": entry.get("selected_at"),
+                            "search": search.get("strategy"),
+                            "frames": search.get("frames"),
+                            "fits": search.get("fits"),
+                            "seconds": search.get("seconds"),
+                            "completed": search.get("completed")}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    @staticmethod
+    def local_rows(missing_rows: np.ndarray, window: int, max_train_rows: int) -> np.ndarray:
+        """
+        Select the rows a local imputation is fitted on.
+
+        These are the rows with missing values, the rows within `window` frames of them and, if
+        these hold fewer than `max_train_rows` complete rows, evenly spaced complete rows from the
+        rest of the session to make up `max_train_rows`. The models thus see the neighbourhood of
+        every gap plus a bounded sample of the whole session, so the cost of the imputation
+        depends on the number of missing values rather than on the length of the session.
+
+        Args:
+            missing_rows (np.ndarray): Boolean mask of the rows with missing values.
+            window (int): Frames on each side of the missing rows to include.
+            max_train_rows (int): Number of complete rows to aim for.
+
+        Returns:
+            np.ndarray: Sorted positions of the selected rows.
+        """
+        missing_rows = np.asarray(missing_rows, dtype=bool)
+        # Dilate the missing rows by `window` frames on each side
+        counts = np.concatenate([[0], np.cumsum(missing_rows)])
+        positions = np.arange(len(missing_rows))
+        lower = np.clip(positions - window, 0, len(missing_rows))
+        upper = np.clip(positions + window + 1, 0, len(missing_rows))
+        near = counts[upper] - counts[lower] > 0
+
+        n_extra = max(0, max_train_rows - int(np.count_nonzero(near & ~missing_rows)))
+        far = np.flatnonzero(~near)
+        if n_extra < len(far):
+            far = far[np.linspace(0, len(far) - 1, n_extra).round().astype(int)]
+        return np.union1d(np.flatnonzero(near), far)
 
     def impute_outliers(self, df: pd.DataFrame, std_threshold: int | float = 2.0, model_name: str = None) -> pd.DataFrame:
         """
@@ -232,12 +1110,23 @@ class OutlierImputer:
             1. Detects and removes outliers using velocity-based thresholding.
             2. Runs grid search to select the best model(s) for each column.
             3. Imputes missing values using iterative imputation.
-            4. Logs the selected models to a JSON file.
+            4. Logs the selected models to a JSON file and saves the estimators.
+
+        With `reuse=True`, step 2 loads the logged selection and only searches the columns
+        whose selection is stale (see `load_selection`).
+
+        With a temporal model ("Kalman" or "Cubic") as `model_name`, the runs of at most
+        `max_gap` missing frames are filled by `temporal_imputation` first, and steps 2 and 3
+        only run, with `fallback_model`, if longer runs remain.
+
+        With a `window`, steps 2 and 3 only use the rows selected by `local_rows` and the
+        imputed values are written back into the full DataFrame.
 
         Args:
             df (pd.DataFrame): Input DataFrame with numeric columns.
             std_threshold (int | float, optional): Number of standard deviations for outlier detection. Defaults to 2.0.
-            model_name (str, optional): Name of a specific model to use for imputation. If None, tries all models.
+            model_name (str, optional): Name of a specific model, or of a temporal model, to use for
+                imputation. If None, tries all models.
 
         Returns:
             pd.DataFrame: DataFrame with outliers imputed.
@@ -251,11 +1140,36 @@ class OutlierImputer:
         Val.validate_positive(std_threshold, "STD Threshold")
 
         df_copy = self.detect_outliers_velocity(df.copy(), std_threshold)
-        self._grid_search_models_per_col(df_copy, model_name=model_name)
-        df_copy = self.iterative_imputation(df_copy)
+        self.temporal_fills = {}
+        if model_name in self.temporal_models:
+            df_copy = self.temporal_imputation(df_copy, method=model_name)
+            model_name = self.fallback_model
+            if not df_copy.isna().any().any():
+                # No model was selected, so the logged selection is kept as it is
+                self.log_temporal_fills()
+                return df_copy
 
-        with open(self.log_file, "w") as f:
-            json.dump({col: str(model)
-                      for col, model in self.best_models.items()}, f, indent=4)
+        df_fit = df_copy
+        if self.window is not None:
+            missing_rows = df_copy.isna().any(axis=1).to_numpy()
+            rows = self.local_rows(missing_rows, self.window, self.max_train_rows)
+            df_fit = df_copy.iloc[rows]
+            self.local_summary = {"frames": len(df_copy),
+                                  "missing_frames": int(missing_rows.sum()),
+                                  "fitted_frames": len(rows)}
+            logger.info("Local imputation on %d of %d frames, %d with missing values.",
+                        len(rows), len(df_copy), missing_rows.sum())
+
+        if self.reuse:
+            stale = self.load_selection(df_copy, model_name)
+            if stale:
+                self._grid_search_models_per_col(df_fit, model_name=model_name, columns=stale)
+        else:
+            self._grid_search_models_per_col(df_fit, model_name=model_name)
+        df_imputed = self.iterative_imputation(df_fit)
+        if self.window is not None:
+            # Only the missing values change, the other rows are taken from df_copy
+            df_imputed = df_copy.fillna(df_imputed)
 
-        return df_copy
+        self.save_selection(df_copy)
+        return df_imputed
@@ -1,14 +1,18 @@
 import warnings
 from scipy.stats import gaussian_kde
-import tempfile
-import imageio.v2 as imageio  # newer version
+from scipy.signal import fftconvolve
+from collections.abc import Iterator
 from src.components.validation import Validation as Val
 from src.post_processing.datadlc import DataDLC
 from src.post_processing.mergeddata import MergedData
+from src.post_processing.videoencoder import VideoEncoder
+from src.post_processing.framereader import FrameReader
+from src.post_processing.videorenderer import EncoderSink, VideoRenderer
+from src.post_processing.proxyvideo import ProxyVideo
 import cv2
 from sklearn.preprocessing import MinMaxScaler
 from matplotlib.lines import Line2D
-from matplotlib.animation import FuncAnimation
+from matplotlib.colors import to_rgba_array
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 import plotly.express as px
@@ -17,6 +21,8 @@ import pandas as pd
 import numpy as np
 import sys
 import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import seaborn as sns
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
@@ -54,6 +60,8 @@ class PlottingPlotly():
         - plot_kde_density: Static KDE density plot with optional video background.
         - plot_scatter: Static scatter plot with homography and video overlay.
         - generate_scroll_over_video: Create a scrolling plot video synchronized with video frames.
+        - labeled_sink, scroll_over_sink, homography_sink: Sinks of a `VideoRenderer`, which
+          renders several of these videos from a single decode of the recording.
 
     All methods are static and require explicit input arguments.
 
@@ -66,6 +74,11 @@ class PlottingPlotly():
             size_col="size", color_col="Spikes"
         )
     """
+    # Shortest segment worth a process of its own when rendering videos in parallel
+    segment_min_frames = 300
+    # Where the homography square is mapped to in the warped background frames, in pixels
+    _background_dst_points = np.array([[300, 500], [500, 500], [500, 300], [300, 300]])
+
     @staticmethod
     def _get_lim(homography_points: np.ndarray = None) -> tuple[int, int]:
         Val.validate_array_int_float(homography_points,
@@ -174,21 +187,42 @@ class PlottingPlotly():
     def generate_labeled_video(dlc_data: DataDLC,
                             video_path: str,
                             square_cmap: str = "Accent",
-                            filament_cmap: str = "Blues") -> bytes:
+                            filament_cmap: str = "Blues",
+                            output: str = "bytes",
+                            output_path: str = None,
+                            encoder_options: dict = None,
+                            n_jobs: int = 1) -> bytes | str | Iterator[bytes]:
         """
         Generate a video with labeled tracking points overlaid on video frames.
 
+        The overlay coordinates are converted to integer pixels once, up front. Missing
+        (NaN) points are not drawn and points replaced by `DataDLC.impute_outliers` are
+        drawn as rings instead of filled circles. If the video and the tracking data
+        differ in length, the frames without tracking data are written unlabeled and
+        a warning is issued.
+
+        With `n_jobs` > 1, the video is split into contiguous segments rendered and encoded
+        by separate processes, then joined without re-encoding. The result has the same
+        frames, with an extra keyframe at the start of every segment.
+
         Args:
-            df (pd.DataFrame): DataFrame with tracking data.
+            dlc_data (DataDLC): The tracking data.
             video_path (str): Path to the input video file.
-            output_path (str): Path to save the output video.
-            columns (list of str): List of columns to plot as points.
-            colors (list of str): List of colors for each point.
-            fps (int): Frames per second for output video.
-            codec (str): Video codec to use.
+            square_cmap (str): Colormap for the square points.
+            filament_cmap (str): Colormap for the filament points.
+            output (str, optional): "bytes" to return the video as bytes, "path" to return the
+                path of the MP4 file, or "chunks" to return an iterator of byte chunks.
+                Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file,
+                which is removed once read for the "bytes" and "chunks" outputs.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder, such as
+                `preset`, `crf` and `threads`.
+            n_jobs (int, optional): Number of processes rendering segments of the video,
+                -1 for one per CPU. Defaults to 1.
 
         Returns:
-            bytes: The video as a byte stream.
+            bytes | str | Iterator[bytes]: The video as bytes, its file path or an
+                iterator of byte chunks, depending on `output`.
 
         Raises:
             TypeError, ValueError: If input validation fails.
@@ -198,10 +232,10 @@ class PlottingPlotly():
         Val.validate_path(video_path, file_types=[".mp4", ".avi"])
         Val.validate_path_exists(video_path)
         Val.validate_strings(square_cmap=square_cmap, filament_cmap=filament_cmap)
-
-        # Extract data
-        df_square = dlc_data.df_square.copy()
-        df_monofil = dlc_data.df_monofil.copy()
+        Val.validate_in_list(output, VideoEncoder.outputs, "Output")
+        Val.validate_type(n_jobs, int, "Number of Jobs")
+        if n_jobs != -1:
+            Val.validate_positive(n_jobs, "Number of Jobs", zero_allowed=False)
 
         # Open the video
         cap = cv2.VideoCapture(video_path)
@@ -209,52 +243,316 @@ class PlottingPlotly():
         frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
 
+        points, visible, imputed, colors = PlottingPlotly._labeled_overlay(
+            dlc_data, frame_width, frame_height, square_cmap, filament_cmap)
+        n_points_frames = len(points)
+
+        # Render the frames, in segments spread over processes if n_jobs > 1
+        n_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+        video_file, n_video_frames = PlottingPlotly._render_segments(
+            PlottingPlotly._render_labeled_segment, n_frames, frame_rate, n_jobs,
+            output_path, encoder_options, video_path, points, visible, imputed, colors)
+
+        if n_video_frames != n_points_frames:
+            warnings.warn(f"The video has {n_video_frames} frames but the tracking data has "
+                          f"{n_points_frames}, only the first {min(n_video_frames, n_points_frames)} "
+                          f"frames are labeled.")
+
+        return VideoEncoder.collect(video_file, output, delete=output_path is None)
+
+    @staticmethod
+    def _labeled_overlay(dlc_data: DataDLC,
+                         frame_width: int,
+                         frame_height: int,
+                         square_cmap: str,
+                         filament_cmap: str) -> tuple[np.ndarray, np.ndarray, np.ndarray, list]:
+        """
+        Prepare the overlay of `generate_labeled_video` for all frames at once.
+
+        Returns:
+            tuple: The int32 (n_frames, n_points, 2) coordinates, the boolean masks of
+                the visible and imputed points and the BGR color of every point, with
+                the square points first, then the filament points, in drawing order.
+        """
+        slots = dlc_data.pose.slots(dlc_data.square_parts + dlc_data.monofil_parts)
+        n_square = len(dlc_data.square_parts)
+        points, visible = PlottingPlotly._overlay_coordinates(
+            dlc_data.pose.xy[:, slots], frame_width, frame_height, radius=5)
+        imputed = dlc_data.imputed[:, slots]
+
         # Get Matplotlib colormaps
-        square_colors = plt.get_cmap(square_cmap)(np.linspace(0, 1, len(df_square.columns) // 2))
-        filament_colors = plt.get_cmap(filament_cmap)(np.linspace(0, 1, len(df_monofil.columns) // 2))
+        square_colors = plt.get_cmap(square_cmap)(np.linspace(0, 1, n_square))
+        filament_colors = plt.get_cmap(filament_cmap)(np.linspace(0, 1, len(slots) - n_square))
 
         # Convert colors to BGR and scale to 0–255
-        square_colors = [(int(c[2] * 255), int(c[1] * 255), int(c[0] * 255)) for c in square_colors]
-        filament_colors = [(int(c[2] * 255), int(c[1] * 255), int(c[0] * 255)) for c in filament_colors]
+        colors = [(int(c[2] * 255), int(c[1] * 255), int(c[0] * 255))
+                  for c in np.concatenate([square_colors, filament_colors])]
+        return points, visible, imputed, colors
+
+    @staticmethod
+    def _draw_labels(frame: np.ndarray,
+                     frame_idx: int,
+                     points: np.ndarray,
+                     visible: np.ndarray,
+                     imputed: np.ndarray,
+                     colors: list[tuple[int, int, int]]) -> None:
+        """
+        Draw the tracking points of one frame in place, see `_labeled_overlay`.
+        """
+        # Frames beyond the tracking data are written without labels
+        if frame_idx >= len(points):
+            return
+        frame_points = points[frame_idx].tolist()
+        for i in np.flatnonzero(visible[frame_idx]).tolist():
+            # Imputed points are drawn as rings, detected points as discs
+            cv2.circle(frame, frame_points[i], radius=5, color=colors[i],
+                       thickness=2 if imputed[frame_idx, i] else -1)
+
+    @staticmethod
+    def labeled_sink(dlc_data: DataDLC,
+                     square_cmap: str = "Accent",
+                     filament_cmap: str = "Blues",
+                     output: str = "bytes",
+                     output_path: str = None,
+                     encoder_options: dict = None) -> EncoderSink:
+        """
+        Create a `VideoRenderer` sink producing the video of `generate_labeled_video`.
+
+        Args:
+            dlc_data (DataDLC): The tracking data.
+            square_cmap (str): Colormap for the square points.
+            filament_cmap (str): Colormap for the filament points.
+            output (str, optional): "bytes", "path" or "chunks", see `generate_labeled_video`.
+                Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder.
+
+        Returns:
+            EncoderSink: The sink.
+
+        Raises:
+            TypeError, ValueError: If input validation fails.
+        """
+        Val.validate_type(dlc_data, DataDLC, "DLC Data")
+        Val.validate_strings(square_cmap=square_cmap, filament_cmap=filament_cmap)
+        overlay = None
+        labeled = None
+
+        def render(frame_idx: int, frame: np.ndarray) -> np.ndarray:
+            nonlocal overlay, labeled
+            if overlay is None:
+                overlay = PlottingPlotly._labeled_overlay(
+                    dlc_data, frame.shape[1], frame.shape[0], square_cmap, filament_cmap)
+                labeled = np.empty_like(frame)
+            # The decoded frame is shared with the other sinks
+            np.copyto(labeled, frame)
+            PlottingPlotly._draw_labels(labeled, frame_idx, *overlay)
+            return cv2.cvtColor(labeled, cv2.COLOR_BGR2RGB)
+
+        return EncoderSink(render, output=output, output_path=output_path,
+                           encoder_options=encoder_options, expected_frames=len(dlc_data.pose.xy))
+
+    @staticmethod
+    def homography_sink(merged_data: MergedData,
+                        output: str = "bytes",
+                        output_path: str = None,
+                        encoder_options: dict = None) -> EncoderSink:
+        """
+        Create a `VideoRenderer` sink producing the video warped onto the homography square.
 
-        # Use imageio writer with proper codec
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmpfile:
-            temp_path = tmpfile.name
+        Every frame is warped with its own homography, as the frame of `background_framing`
+        is, so the square stays still while the camera or the skin moves. Frames without
+        a valid homography are black.
 
-        writer = imageio.get_writer(temp_path, fps=frame_rate, codec='libx264')
+        Args:
+            merged_data (MergedData): The merged data object, with the tracking data.
+            output (str, optional): "bytes", "path" or "chunks". Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder.
+
+        Returns:
+            EncoderSink: The sink.
 
-        frame_idx = 0
-        while cap.isOpened():
+        Raises:
+            TypeError, ValueError: If input validation fails.
+        """
+        Val.validate_type(merged_data, MergedData, "Merged Data")
+        h_matrices = merged_data.dlc._get_homography_matrices(PlottingPlotly._background_dst_points)
+        valid = np.isfinite(h_matrices).all(axis=(1, 2))
+
+        def render(frame_idx: int, frame: np.ndarray) -> np.ndarray:
+            if frame_idx >= len(h_matrices) or not valid[frame_idx]:
+                return np.zeros(frame.shape, dtype=np.uint8)
+            return PlottingPlotly._warp_frame(frame, h_matrices[frame_idx])
+
+        return EncoderSink(render, output=output, output_path=output_path,
+                           encoder_options=encoder_options, expected_frames=len(h_matrices))
+
+    @staticmethod
+    def _warp_frame(frame: np.ndarray,
+                    h_matrix: np.ndarray,
+                    size: tuple[int, int] = None) -> np.ndarray:
+        """Warp a BGR frame with a homography matrix into a (width, height) RGB frame,
+        by default of the same size."""
+        if size is None:
+            size = (frame.shape[1], frame.shape[0])
+        return cv2.warpPerspective(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB), h_matrix, size)
+
+    @staticmethod
+    def _render_labeled_segment(encoder: VideoEncoder,
+                                start: int,
+                                stop: int | None,
+                                video_path: str,
+                                points: np.ndarray,
+                                visible: np.ndarray,
+                                imputed: np.ndarray,
+                                colors: list[tuple[int, int, int]]) -> int:
+        """
+        Draw the tracking points on the frames [start, stop) of a video and encode them.
+
+        Args:
+            encoder (VideoEncoder): The encoder of the segment.
+            start (int): First frame of the segment.
+            stop (int | None): Frame after the last one of the segment, None for the end of the video.
+            video_path (str): Path to the input video file.
+            points (np.ndarray): int32 (n_frames, n_points, 2) overlay coordinates.
+            visible (np.ndarray): Boolean (n_frames, n_points) mask of the points to draw.
+            imputed (np.ndarray): Boolean (n_frames, n_points) mask of the imputed points.
+            colors (list[tuple[int, int, int]]): BGR color of every point.
+
+        Returns:
+            int: The number of frames encoded.
+        """
+        cap = cv2.VideoCapture(video_path)
+        if start > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+        frame_idx = start
+        while cap.isOpened() and (stop is None or frame_idx < stop):
             ret, frame = cap.read()
             if not ret:
                 break
 
-            # Draw square points
-            for i in range(len(df_square.columns) // 2):  # Assuming x, y pairs
-                x = int(df_square.iloc[frame_idx, i * 2])
-                y = int(df_square.iloc[frame_idx, i * 2 + 1])
-                color = square_colors[i]  # Use precomputed BGR color
-                cv2.circle(frame, (x, y), radius=5, color=color, thickness=-1)
-
-            # Draw filament points
-            for i in range(len(df_monofil.columns) // 2):  # Assuming x, y pairs
-                x = int(df_monofil.iloc[frame_idx, i * 2])
-                y = int(df_monofil.iloc[frame_idx, i * 2 + 1])
-                color = filament_colors[i]  # Use precomputed BGR color
-                cv2.circle(frame, (x, y), radius=5, color=color, thickness=-1)
-
-            # Convert frame to RGB for imageio
+            PlottingPlotly._draw_labels(frame, frame_idx, points, visible, imputed, colors)
+
+            # Convert frame to RGB for the encoder
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            writer.append_data(frame_rgb)
+            encoder.write(frame_rgb)
 
             frame_idx += 1
 
         cap.release()
-        writer.close()
+        return frame_idx - start
+
+    @staticmethod
+    def _encode_segment(render_segment,
+                        start: int,
+                        stop: int | None,
+                        fps: float,
+                        segment_path: str,
+                        encoder_options: dict,
+                        args: tuple) -> int:
+        """
+        Render and encode one segment to its own file, in a worker process.
+
+        Returns:
+            int: The number of frames encoded. An empty segment writes no file.
+        """
+        encoder = VideoEncoder(fps, output_path=segment_path, **encoder_options)
+        with encoder:
+            n_frames = render_segment(encoder, start, stop, *args)
+            if n_frames == 0:
+                encoder.abort()
+                return 0
+        return n_frames
+
+    @staticmethod
+    def _render_segments(render_segment,
+                         n_frames: int,
+                         fps: float,
+                         n_jobs: int,
+                         output_path: str = None,
+                         encoder_options: dict = None,
+                         *args) -> tuple[str, int]:
+        """
+        Render a video, in parallel segments if `n_jobs` > 1.
+
+        `render_segment(encoder, start, stop, *args)` renders the frames [start, stop) into
+        the encoder and returns the number of frames it wrote, with `stop` None for the
+        rest of the video. With several jobs, the frame range is split into contiguous
+        segments of at least `segment_min_frames` frames. Each worker process seeks to
+        the start of its segment and encodes it to a file of its own, and the segments
+        are then joined without re-encoding. The last segment runs to the end of the
+        video, so an inexact `n_frames` only affects how the work is split.
+
+        Args:
+            render_segment (callable): Renders a segment. Must be picklable, e.g. a static method.
+            n_frames (int): Expected number of frames.
+            fps (float): Frames per second of the output video.
+            n_jobs (int): Number of processes, -1 for one per CPU.
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder.
+            *args: Further arguments of `render_segment`.
+
+        Returns:
+            tuple[str, int]: Path of the MP4 and the number of frames written.
+        """
+        encoder_options = encoder_options or {}
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        n_segments = max(1, min(n_jobs, n_frames // PlottingPlotly.segment_min_frames))
+        if n_segments == 1:
+            encoder = VideoEncoder(fps, output_path=output_path, **encoder_options)
+            with encoder:
+                n_written = render_segment(encoder, 0, None, *args)
+            return encoder.output_path, n_written
+
+        bounds = np.linspace(0, n_frames, n_segments + 1).astype(int).tolist()
+        stops = bounds[1:-1] + [None]
+        with tempfile.TemporaryDirectory() as segment_dir:
+            segment_paths = [os.path.join(segment_dir, f"segment_{i:04d}.mp4") for i in range(n_segments)]
+            with ProcessPoolExecutor(max_workers=n_segments) as executor:
+                futures = [executor.submit(PlottingPlotly._encode_segment, render_segment, start, stop,
+                                           fps, path, encoder_options, args)
+                           for start, stop, path in zip(bounds, stops, segment_paths)]
+                counts = [future.result() for future in futures]
+
+            if output_path is None:
+                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmpfile:
+                    output_path = tmpfile.name
+            VideoEncoder.concat([path for path, count in zip(segment_paths, counts) if count],
+                                output_path)
+        return output_path, sum(counts)
+
+    @staticmethod
+    def _overlay_coordinates(points: np.ndarray,
+                             frame_width: int,
+                             frame_height: int,
+                             radius: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Convert tracked positions into integer pixel coordinates for drawing.
+
+        Positions are truncated to whole pixels, as `int()` does. Missing (NaN) positions
+        are marked as not visible. Positions far outside the frame are clipped to just
+        beyond the frame edge, where a marker of the given radius is not visible, so
+        that they cannot overflow int32.
 
-        # Return the video as bytes
-        with open(temp_path, "rb") as f:
-            return f.read()
+        Args:
+            points (np.ndarray): (n_frames, n_points, 2) float array of x and y positions.
+            frame_width (int): Width of the video frames in pixels.
+            frame_height (int): Height of the video frames in pixels.
+            radius (int, optional): Radius of the drawn markers. Defaults to 5.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The int32 (n_frames, n_points, 2) coordinates
+                and the boolean (n_frames, n_points) mask of the points to draw.
+        """
+        visible = np.isfinite(points).all(axis=2)
+        lower = -(radius + 1)
+        upper = np.array([frame_width, frame_height]) + radius + 1
+        clipped = np.clip(np.where(visible[..., None], points, 0), lower, upper)
+        return clipped.astype(np.int32), visible
 
     @staticmethod
     def generate_homography_video(homography_points: np.ndarray,
@@ -264,7 +562,10 @@ class PlottingPlotly():
                                   x_label: str = "x (mm)",
                                   y_label: str = "y (mm)",
                                   color: str = "#d62728",
-                                  figsize: tuple[int] = (12, 12)) -> bytes:
+                                  figsize: tuple[int] = (12, 12),
+                                  output: str = "bytes",
+                                  output_path: str = None,
+                                  encoder_options: dict = None) -> bytes | str | Iterator[bytes]:
         """
         Create an animated video showing the homography transformation over time.
 
@@ -277,9 +578,17 @@ class PlottingPlotly():
             y_label (str): Y-axis label.
             color (str): Color for the plot.
             figsize (tuple): Figure size (width, height).
+            output (str, optional): "bytes" to return the video as bytes, "path" to return the
+                path of the MP4 file, or "chunks" to return an iterator of byte chunks.
+                Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file,
+                which is removed once read for the "bytes" and "chunks" outputs.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder, such as
+                `preset`, `crf` and `threads`.
 
         Returns:
-            bytes: The video as a byte stream.
+            bytes | str | Iterator[bytes]: The video as bytes, its file path or an
+                iterator of byte chunks, depending on `output`.
 
         Raises:
             TypeError, ValueError: If input validation fails.
@@ -293,6 +602,7 @@ class PlottingPlotly():
         Val.validate_strings(title=title, x_label=x_label,
                              y_label=y_label, color=color)
         Val.validate_type(figsize, tuple, "Figure Size")
+        Val.validate_in_list(output, VideoEncoder.outputs, "Output")
 
         fig, ax = plt.subplots(figsize=figsize)
         ax.set_xlim(PlottingPlotly._get_lim(homography_points))
@@ -305,27 +615,24 @@ class PlottingPlotly():
             ax.axhline(y=point[1], color='gray', linestyle='--', alpha=0.5)
             ax.axvline(x=point[0], color='gray', linestyle='--', alpha=0.5)
 
-        line, = ax.plot([], [], 'bo-', color=color)
-
-        def init():
-            line.set_data([], [])
-            return line,
+        line, = ax.plot([], [], 'bo-', color=color, animated=True)
 
-        def update(frame):
-            points = df_transformed_monofil.iloc[frame].values.reshape(-1, 2)
-            line.set_data(points[:, 0], points[:, 1])
-            return line,
+        # Draw the static content once and blit the line on top of it for every frame
+        fig.canvas.draw()
+        background = fig.canvas.copy_from_bbox(fig.bbox)
+        points = df_transformed_monofil.to_numpy(dtype=float).reshape(
+            len(df_transformed_monofil), -1, 2)
 
-        anim = FuncAnimation(fig, update, frames=len(df_transformed_monofil),
-                             init_func=init, blit=True, interval=1000 / fps)
+        encoder = VideoEncoder(fps, output_path=output_path, **(encoder_options or {}))
+        with encoder:
+            for frame_points in points:
+                fig.canvas.restore_region(background)
+                line.set_data(frame_points[:, 0], frame_points[:, 1])
+                ax.draw_artist(line)
+                encoder.write(np.asarray(fig.canvas.buffer_rgba()))
+        plt.close(fig)
 
-        # Save to a temp file and return bytes
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".mp4")
-        anim.save(temp_file.name, fps=fps, extra_args=['-vcodec', 'libx264'])
-
-        with open(temp_file.name, "rb") as f:
-            video_bytes = f.read()
-        return video_bytes
+        return VideoEncoder.collect(encoder.output_path, output, delete=output_path is None)
 
     @staticmethod
     def plot_homography_interactive(homography_points: np.ndarray,
@@ -464,7 +771,10 @@ class PlottingPlotly():
                                  ylabel: str = "y (mm)",
                                  fps: int = 30,
                                  figsize: tuple[int] = (12, 12),
-                                 cmap: str = "viridis") -> bytes:
+                                 cmap: str = "viridis",
+                                 output: str = "bytes",
+                                 output_path: str = None,
+                                 encoder_options: dict = None) -> bytes | str | Iterator[bytes]:
         """
         Create an animated video visualizing receptive field mapping.
 
@@ -483,9 +793,17 @@ class PlottingPlotly():
             fps (int): Frames per second for the video.
             figsize (tuple): Figure size (width, height).
             cmap (str): Colormap name.
+            output (str, optional): "bytes" to return the video as bytes, "path" to return the
+                path of the MP4 file, or "chunks" to return an iterator of byte chunks.
+                Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file,
+                which is removed once read for the "bytes" and "chunks" outputs.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder, such as
+                `preset`, `crf` and `threads`.
 
         Returns:
-            bytes: The video as a byte stream.
+            bytes | str | Iterator[bytes]: The video as bytes, its file path or an
+                iterator of byte chunks, depending on `output`.
 
         Raises:
             TypeError, ValueError: If input validation fails.
@@ -500,16 +818,16 @@ class PlottingPlotly():
         Val.validate_type(spikes, bool, "Spikes")
         Val.validate_positive(fps, "FPS", zero_allowed=False)
         Val.validate_type(figsize, tuple, "Figure Size")
+        Val.validate_in_list(output, VideoEncoder.outputs, "Output")
 
         df = merged_data.threshold_data(bending, spikes)
 
         # Normalize size and color
         scaler = MinMaxScaler(feature_range=(1, 30))
-        df["scaled_size"] = scaler.fit_transform(df[[size_col]]) * 5
+        sizes = scaler.fit_transform(df[[size_col]])[:, 0] * 5
 
         if color_col == "Spikes":
-            color_map = df["Spikes"].apply(
-                lambda x: 'blue' if x > 0 else 'grey')
+            colors = to_rgba_array(np.where(df["Spikes"] > 0, 'blue', 'grey'))
         else:
             # Try to get the colormap directly by name (from matplotlib or plotly-compatible strings)
             try:
@@ -522,75 +840,74 @@ class PlottingPlotly():
                                        df[color_col].max())
             color_mapper = plt.cm.ScalarMappable(norm=color_norm,
                                                  cmap=resolved_cmap)
-            color_map = color_mapper.to_rgba(df[color_col])
-
-        # Set up video writer
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmpfile:
-            temp_path = tmpfile.name
-
-        writer = imageio.get_writer(temp_path, fps=fps, codec='libx264')
-
-        # Before loop
-        history_x, history_y, history_size, history_color = [], [], [], []
-
-        # Inside loop
-        for frame_idx in range(len(df)):
-            fig, ax = plt.subplots(figsize=figsize)
-            ax.set_xlim(PlottingPlotly._get_lim(homography_points))
-            ax.set_ylim(PlottingPlotly._get_lim(homography_points))
-            ax.set_title(title)
-            ax.set_xlabel(xlabel)
-            ax.set_ylabel(ylabel)
-
-            # Homography lines
-            for point in homography_points:
-                ax.axhline(y=point[1], color='gray', linestyle='--', alpha=0.5)
-                ax.axvline(x=point[0], color='gray', linestyle='--', alpha=0.5)
-
-            # Append current frame data to history
-            current_row = df.iloc[frame_idx]
-            history_x.append(current_row[x_col])
-            history_y.append(current_row[y_col])
-            history_size.append(current_row["scaled_size"])
-            history_color.append(
-                color_map[frame_idx] if color_col != "Spikes" else color_map.iloc[frame_idx]
-            )
+            colors = color_mapper.to_rgba(df[color_col])
+        offsets = df[[x_col, y_col]].to_numpy(dtype=float)
 
-            # Plot all points up to current frame
-            ax.scatter(history_x, history_y, s=history_size, c=history_color,
-                       alpha=0.7, edgecolors=None)
-
-            # Add legend or colorbar
-            if color_col == "Spikes":
-                legend_elements = [
-                    Line2D([0], [0], marker='o', color='w',
-                           markerfacecolor='blue', markersize=10,
-                           label='Spike'),
-                    Line2D([0], [0], marker='o', color='w',
-                           markerfacecolor='grey', markersize=10,
-                           label='No Spike')
-                ]
-                ax.legend(handles=legend_elements, loc="upper left",
-                          title=f"Spike Status\n Circle Size ∝ {size_col}")
-            else:
-                ax.legend(loc="upper left",
-                          title=f"Circle Size ∝ {size_col}")
-                cbar = fig.colorbar(color_mapper, ax=ax)
-                cbar.set_label(f'{color_col} (Color)')
+        # Build the figure once
+        fig, ax = plt.subplots(figsize=figsize)
+        ax.set_xlim(PlottingPlotly._get_lim(homography_points))
+        ax.set_ylim(PlottingPlotly._get_lim(homography_points))
+        ax.set_title(title)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
 
-            # Convert Matplotlib figure to an image
-            fig.canvas.draw()
-            frame = np.array(fig.canvas.renderer.buffer_rgba())
-            plt.close(fig)
+        # Homography lines
+        overlay = []
+        for point in homography_points:
+            overlay.append(ax.axhline(y=point[1], color='gray', linestyle='--', alpha=0.5))
+            overlay.append(ax.axvline(x=point[0], color='gray', linestyle='--', alpha=0.5))
 
-            # Write the frame to the video
-            writer.append_data(frame)
+        # A single collection, holding only the points added in the current frame
+        scatter = ax.scatter(np.empty((0,)), np.empty((0,)), alpha=0.7, edgecolors=None)
 
-        writer.close()
+        # Add legend or colorbar
+        if color_col == "Spikes":
+            legend_elements = [
+                Line2D([0], [0], marker='o', color='w',
+                       markerfacecolor='blue', markersize=10,
+                       label='Spike'),
+                Line2D([0], [0], marker='o', color='w',
+                       markerfacecolor='grey', markersize=10,
+                       label='No Spike')
+            ]
+            legend = ax.legend(handles=legend_elements, loc="upper left",
+                               title=f"Spike Status\n Circle Size ∝ {size_col}")
+        else:
+            legend = ax.legend(loc="upper left",
+                               title=f"Circle Size ∝ {size_col}")
+            cbar = fig.colorbar(color_mapper, ax=ax)
+            cbar.set_label(f'{color_col} (Color)')
 
-        # Return video bytes
-        with open(temp_path, "rb") as f:
-            return f.read()
+        # Artists drawn above the points are redrawn every frame
+        overlay += [*ax.spines.values(), legend]
+        for artist in overlay + [scatter]:
+            artist.set_animated(True)
+
+        # Draw the static content once, the saved region then accumulates the points
+        fig.canvas.draw()
+        points_layer = fig.canvas.copy_from_bbox(fig.bbox)
+
+        encoder = VideoEncoder(fps, output_path=output_path, **(encoder_options or {}))
+        with encoder:
+            for frame_idx in range(len(df)):
+                # Add the current point on top of the previous ones
+                fig.canvas.restore_region(points_layer)
+                scatter.set_offsets(offsets[frame_idx:frame_idx + 1])
+                scatter.set_sizes(sizes[frame_idx:frame_idx + 1])
+                scatter.set_facecolors(colors[frame_idx:frame_idx + 1])
+                ax.draw_artist(scatter)
+                points_layer = fig.canvas.copy_from_bbox(fig.bbox)
+
+                # Draw the overlay and grab the frame from the canvas buffer
+                for artist in overlay:
+                    ax.draw_artist(artist)
+                frame = np.asarray(fig.canvas.buffer_rgba())
+
+                # Write the frame to the video
+                encoder.write(frame)
+        plt.close(fig)
+
+        return VideoEncoder.collect(encoder.output_path, output, delete=output_path is None)
 
     @staticmethod
     def _compute_kde(df: pd.DataFrame,
@@ -600,6 +917,12 @@ class PlottingPlotly():
         """
         Compute a 2D kernel density estimate (KDE) for scatter data.
 
+        The kernel covariance is taken from `scipy.stats.gaussian_kde`, so `bw_method`
+        has the same meaning (a scalar factor, 'scott', 'silverman' or a callable).
+        Instead of evaluating every point at every grid position, the points are linearly
+        binned onto the grid and the bin counts are convolved with the Gaussian kernel
+        sampled on the grid with an FFT, which costs O(N + G log G) instead of O(N * G).
+
         Args:
             df (pd.DataFrame): DataFrame containing the data.
             x_col (str): Name of the x-axis column.
@@ -612,13 +935,61 @@ class PlottingPlotly():
 
         Raises:
             KeyError, ValueError: If columns or grid limits are invalid.
+
+        Notes:
+            - The grid is padded by four kernel standard deviations (at most 600 cells per side),
+              so points just outside the grid still contribute. Points further away are ignored.
+            - Narrow kernels are binned on a grid up to 8 times finer than the output grid
+              to keep the binning error small.
         """
         xmin, xmax, ymin, ymax = grid_limits
+        if xmax <= xmin or ymax <= ymin:
+            raise ValueError("Grid limits must satisfy xmin < xmax and ymin < ymax.")
+        n_grid, max_pad, max_refine = 200, 600, 8
         xx, yy = np.mgrid[xmin:xmax:200j, ymin:ymax:200j]
-        positions = np.vstack([xx.ravel(), yy.ravel()])
         values = np.vstack([df[x_col].values, df[y_col].values])
         kernel = gaussian_kde(values, bw_method=bw_method)
-        zz = np.reshape(kernel(positions).T, xx.shape)
+        covariance = kernel.covariance
+        std = np.sqrt(np.diag(covariance))
+
+        # Bin on a finer grid when the kernel spans fewer than four grid cells,
+        # every `refine`-th node of the fine grid is a node of the output grid
+        spacing = np.array([(xmax - xmin) / (n_grid - 1), (ymax - ymin) / (n_grid - 1)])
+        refine = np.clip(np.ceil(4 * spacing / std), 1, max_refine).astype(int)
+        spacing = spacing / refine
+        n_fine = (n_grid - 1) * refine + 1
+
+        # Pad the grid so the kernel tails of points outside the limits are included
+        pad = np.minimum(np.ceil(4 * std / spacing), max_pad * refine).astype(int)
+        origin = np.array([xmin, ymin]) - pad * spacing
+        shape = n_fine + 2 * pad
+
+        # Linear binning: split each point's weight over the four surrounding grid nodes
+        position = (values.T - origin) / spacing
+        inside = np.all((position >= 0) & (position <= shape - 1), axis=1)
+        position, weights = position[inside], kernel.weights[inside]
+        lower = np.minimum(np.floor(position).astype(int), shape - 2)
+        frac = position - lower
+        bins = np.zeros(shape[0] * shape[1])
+        for dx, dy in ((0, 0), (1, 0), (0, 1), (1, 1)):
+            w = weights * np.where(dx, frac[:, 0], 1 - frac[:, 0]) * \
+                np.where(dy, frac[:, 1], 1 - frac[:, 1])
+            flat = (lower[:, 0] + dx) * shape[1] + lower[:, 1] + dy
+            bins += np.bincount(flat, weights=w, minlength=bins.size)
+        bins = bins.reshape(shape)
+
+        # Gaussian kernel sampled on the grid offsets, then one FFT convolution
+        offset_x = np.arange(-pad[0], pad[0] + 1) * spacing[0]
+        offset_y = np.arange(-pad[1], pad[1] + 1) * spacing[1]
+        dx, dy = np.meshgrid(offset_x, offset_y, indexing="ij")
+        offsets = np.stack([dx, dy], axis=-1)
+        mahalanobis = np.einsum("...i,ij,...j->...", offsets,
+                                np.linalg.inv(covariance), offsets)
+        gaussian = np.exp(-0.5 * mahalanobis) / \
+            (2 * np.pi * np.sqrt(np.linalg.det(covariance)))
+
+        zz = fftconvolve(bins, gaussian, mode="valid")[::refine[0], ::refine[1]]
+        zz = np.maximum(zz, 0)  # remove FFT round-off below zero
         return xx, yy, zz
 
     @staticmethod
@@ -869,16 +1240,28 @@ class PlottingPlotly():
                            ax: plt.Axes,
                            homography_points: np.ndarray,
                            video_path: str = None,
-                           index: int = None):
+                           index: int = None,
+                           frame: np.ndarray = None,
+                           proxy: bool = False):
         """
         Overlay video frame and homography lines on a Matplotlib axis.
 
+        The frame is read through the shared `FrameReader` of the video, unless it is
+        given as `frame`, e.g. from the `FrameGrabSink` of a `VideoRenderer` run.
+        With `proxy`, it is read from the low-resolution `ProxyVideo` of the video
+        instead, which is much faster to seek and decode for previews. The homography
+        is rescaled accordingly, so the frame lands at the same place.
+
         Args:
             merged_data (MergedData): The merged data object.
             ax (matplotlib.axes.Axes): The axis to draw on.
             homography_points (np.ndarray): Array of homography points (4, 2).
             video_path (str, optional): Path to the video file.
             index (int, optional): Frame index to extract from the video.
+            frame (np.ndarray, optional): The decoded BGR frame at `index`. Defaults to
+                reading it from `video_path`.
+            proxy (bool, optional): Read the frame from the proxy of `video_path`.
+                Defaults to False.
 
         Returns:
             None
@@ -888,31 +1271,30 @@ class PlottingPlotly():
         """
         Val.validate_array(homography_points, shape=(4, 2),
                            name="Homography Points")
-        if video_path is not None and index is not None:
-            Val.validate_path(video_path, file_types=[".mp4", ".avi"])
+        if (video_path is not None or frame is not None) and index is not None:
             Val.validate_type(index, int, "Index")
             Val.validate_positive(index, "Index", zero_allowed=True)
-
-            dst_min, dst_max = 300, 500
-            dst_points = np.array([[dst_min, dst_max],
-                                   [dst_max, dst_max],
-                                   [dst_max, dst_min],
-                                   [dst_min, dst_min]])
+            Val.validate_type(proxy, bool, "Proxy")
             h_matrix = merged_data.dlc._get_homography_matrix(
-                index, dst_points)
-
-            cap = cv2.VideoCapture(video_path)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, index)
-            ret, frame = cap.read()
-            cap.release()
-
-            if not ret:
-                raise ValueError(
-                    f"Could not read frame {index} from video {video_path}.")
+                index, PlottingPlotly._background_dst_points)
+            size = None
+            if frame is None:
+                Val.validate_path(video_path, file_types=[".mp4", ".avi"])
+                # The shared reader keeps the video open and caches decoded frames
+                # between calls, so changing the frame index does not reopen the file
+                if proxy:
+                    frame = FrameReader.shared(ProxyVideo.get(video_path)).read(index)
+                    size = ProxyVideo.frame_size(video_path)
+                    # Map the proxy pixels back to the full-resolution pixels first
+                    h_matrix = h_matrix @ np.diag([size[0] / frame.shape[1],
+                                                   size[1] / frame.shape[0], 1.0])
+                else:
+                    frame = FrameReader.shared(video_path).read(index)
+            else:
+                Val.validate_array(frame, name="Frame")
 
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, _ = frame.shape
-            frame_transformed = cv2.warpPerspective(frame, h_matrix, (w, h))
+            frame_transformed = PlottingPlotly._warp_frame(frame, h_matrix, size)
+            h, w = frame_transformed.shape[:2]
 
             pixel_to_mm = 0.1
             frame_width_mm = w * pixel_to_mm
@@ -943,7 +1325,8 @@ class PlottingPlotly():
                          # Video frame options
                          frame: bool = False,
                          video_path: str = None,
-                         index: int = None):
+                         index: int = None,
+                         proxy: bool = False):
         """
         Generate a static KDE density plot with optional video background.
 
@@ -962,6 +1345,8 @@ class PlottingPlotly():
             frame (bool): Whether to overlay a video frame.
             video_path (str, optional): Path to the video file.
             index (int, optional): Frame index to extract from the video.
+            proxy (bool, optional): Read the frame from the low-resolution proxy of the
+                video, for previews. Defaults to False.
 
         Returns:
             tuple: (matplotlib.figure.Figure, matplotlib.axes.Axes)
@@ -980,7 +1365,8 @@ class PlottingPlotly():
 
         fig, ax = plt.subplots(figsize=figsize)
         PlottingPlotly.background_framing(
-            merged_data, ax, homography_points, video_path if frame else None, index if frame else None)
+            merged_data, ax, homography_points, video_path if frame else None, index if frame else None,
+            proxy=proxy)
 
         df = merged_data.threshold_data(bending, spikes)
 
@@ -1012,7 +1398,8 @@ class PlottingPlotly():
                      # Video frame options
                      frame: bool = False,
                      video_path: str = None,
-                     index: int = None):
+                     index: int = None,
+                     proxy: bool = False):
         """
         Generate a static scatter plot with homography and optional video overlay.
 
@@ -1034,6 +1421,8 @@ class PlottingPlotly():
             frame (bool): Whether to overlay a video frame.
             video_path (str, optional): Path to the video file.
             index (int, optional): Frame index to extract from the video.
+            proxy (bool, optional): Read the frame from the low-resolution proxy of the
+                video, for previews. Defaults to False.
 
         Returns:
             tuple: (matplotlib.figure.Figure, matplotlib.axes.Axes)
@@ -1054,7 +1443,8 @@ class PlottingPlotly():
 
         fig, ax = plt.subplots(figsize=figsize)
         PlottingPlotly.background_framing(
-            merged_data, ax, homography_points, video_path if frame else None, index if frame else None)
+            merged_data, ax, homography_points, video_path if frame else None, index if frame else None,
+            proxy=proxy)
 
         df = merged_data.threshold_data(bending, spikes)
 
@@ -1115,7 +1505,10 @@ class PlottingPlotly():
                                    video_path: str,
                                    title: str = "Scrolling Plot",
                                    color_1: str = "#1f77b4",
-                                   color_2: str = "#d62728") -> bytes:
+                                   color_2: str = "#d62728",
+                                   output: str = "bytes",
+                                   output_path: str = None,
+                                   encoder_options: dict = None) -> bytes | str | Iterator[bytes]:
         """
         Generate a scrolling plot video synchronized with video frames.
 
@@ -1126,9 +1519,17 @@ class PlottingPlotly():
             title (str): Title for the plot.
             color_1 (str): Color for the first signal.
             color_2 (str): Color for the second signal.
+            output (str, optional): "bytes" to return the video as bytes, "path" to return the
+                path of the MP4 file, or "chunks" to return an iterator of byte chunks.
+                Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file,
+                which is removed once read for the "bytes" and "chunks" outputs.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder, such as
+                `preset`, `crf` and `threads`.
 
         Returns:
-            bytes: The video as a byte stream.
+            bytes | str | Iterator[bytes]: The video as bytes, its file path or an
+                iterator of byte chunks, depending on `output`.
 
         Raises:
             TypeError, ValueError: If input validation fails.
@@ -1139,90 +1540,227 @@ class PlottingPlotly():
         Val.validate_path(video_path, file_types=[".mp4", ".avi"])
         Val.validate_strings(title=title, color_1=color_1, color_2=color_2)
         Val.validate_path_exists(video_path)
+        Val.validate_in_list(output, VideoEncoder.outputs, "Output")
 
-        df_merged = merged_data.df_merged.copy()
+        sink = PlottingPlotly.scroll_over_sink(merged_data, columns, title=title,
+                                               color_1=color_1, color_2=color_2, output=output,
+                                               output_path=output_path,
+                                               encoder_options=encoder_options)
+        return VideoRenderer(video_path, {"scroll": sink}).run()["scroll"]
 
-        cap = cv2.VideoCapture(video_path)
-        frame_rate = int(cap.get(cv2.CAP_PROP_FPS))
-        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        scroll_height = frame_height // 5
-        figsize = (frame_width / 100, scroll_height / 100)
+    @staticmethod
+    def scroll_over_sink(merged_data: MergedData,
+                         columns: list[str],
+                         title: str = "Scrolling Plot",
+                         color_1: str = "#1f77b4",
+                         color_2: str = "#d62728",
+                         output: str = "bytes",
+                         output_path: str = None,
+                         encoder_options: dict = None) -> EncoderSink:
+        """
+        Create a `VideoRenderer` sink producing the video of `generate_scroll_over_video`.
 
-        window_size = 100
-        frame_idx = 0
+        The layout depends on the frame size, so it is built on the first frame.
 
-        # Use imageio writer with proper codec
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmpfile:
-            temp_path = tmpfile.name
+        Args:
+            merged_data (MergedData): The merged data object.
+            columns (list of str): List of column names to plot.
+            title (str): Title for the plot.
+            color_1 (str): Color for the first signal.
+            color_2 (str): Color for the second signal.
+            output (str, optional): "bytes", "path" or "chunks", see
+                `generate_scroll_over_video`. Defaults to "bytes".
+            output_path (str, optional): Where to write the MP4. Defaults to a temporary file.
+            encoder_options (dict, optional): Keyword arguments for VideoEncoder.
 
-        writer = imageio.get_writer(temp_path, fps=frame_rate, codec='libx264')
+        Returns:
+            EncoderSink: The sink.
 
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        Raises:
+            TypeError, ValueError: If input validation fails.
+        """
+        Val.validate_type(merged_data, MergedData, "Merged Data")
+        Val.validate_type_in_list(columns, str, "Columns")
+        Val.validate_strings(title=title, color_1=color_1, color_2=color_2)
+        layout = None
 
-            fig_scroll, ax_scroll = plt.subplots(
-                len(columns), 1, figsize=figsize, sharex=True)
-            if len(columns) == 1:
-                ax_scroll = [ax_scroll]
-
-            start_idx = max(0, frame_idx - window_size // 2)
-            end_idx = min(len(df_merged), start_idx + window_size)
-            data_window = df_merged.iloc[start_idx:end_idx]
-
-            start_xlim = start_idx if start_idx != 0 else frame_idx - 50
-            end_xlim = start_xlim + window_size
-
-            line_handles = []
-            line_labels = []
-
-            for i, col in enumerate(columns):
-                ax = ax_scroll[i]
-                ax.clear()
-                color = color_1 if i == 0 else color_2
-
-                # Plot the main signal
-                line, = ax.plot(data_window.index,
-                                data_window[col], label=col, color=color)
-                line_handles.append(line)
-                line_labels.append(col)
-
-                ax.set_ylim(0, df_merged[col].max())
-                ax.set_xlim(start_xlim, end_xlim)
-                ax.axvline(frame_idx, color='black', linestyle='--')
-                ax.xaxis.set_visible(False)
-
-                # Add threshold line if needed
-                if col == "Bending_ZScore":
-                    y = merged_data.threshold
-                    ax.axhline(y=y, color='grey', linestyle='--')
-                    threshold_line = Line2D(
-                        [0], [0], color='grey', linestyle='--', label='Threshold')
-                    line_handles.append(threshold_line)
-                    line_labels.append('Threshold')
-
-            fig_scroll.legend(handles=line_handles,
-                              labels=line_labels,
-                              loc='center right',
-                              ncol=1,
-                              fontsize=8)
-
-            fig_scroll.suptitle(title, fontsize=12)
-            fig_scroll.canvas.draw()
-            scroll_img = np.array(
-                fig_scroll.canvas.renderer.buffer_rgba())[:, :, :3]
-            plt.close(fig_scroll)
+        def render(frame_idx: int, frame: np.ndarray) -> np.ndarray:
+            nonlocal layout
+            if layout is None:
+                layout = PlottingPlotly._scroll_layout(merged_data, columns, title, color_1,
+                                                       color_2, frame.shape[1], frame.shape[0])
+            return layout(frame_idx, frame)
 
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            combined_frame = np.vstack((scroll_img, frame_rgb))
-            writer.append_data(combined_frame)
+        return EncoderSink(render, output=output, output_path=output_path,
+                           encoder_options=encoder_options)
 
-            frame_idx += 1
+    @staticmethod
+    def _scroll_layout(merged_data: MergedData,
+                       columns: list[str],
+                       title: str,
+                       color_1: str,
+                       color_2: str,
+                       frame_width: int,
+                       frame_height: int):
+        """
+        Rasterize the static parts of the scrolling plot for a frame size.
 
-        cap.release()
-        writer.close()
+        Returns:
+            Callable[[int, np.ndarray], np.ndarray]: Composes the scrolling plot of a
+                frame index above the BGR frame, into a reused RGB buffer.
+        """
+        df_merged = merged_data.df_merged
+        scroll_height = frame_height // 5
+        figsize = (frame_width / 100, scroll_height / 100)
+
+        window_size = 100
 
-        with open(temp_path, "rb") as f:
-            return f.read()
+        # Static layout, the signals scroll underneath the cursor and the legend
+        fig_scroll, ax_scroll = plt.subplots(
+            len(columns), 1, figsize=figsize, sharex=True)
+        if len(columns) == 1:
+            ax_scroll = [ax_scroll]
+
+        line_handles = []
+        line_labels = []
+        overlay = []
+
+        for i, col in enumerate(columns):
+            ax = ax_scroll[i]
+            color = color_1 if i == 0 else color_2
+            line_handles.append(Line2D([0], [0], color=color, label=col))
+            line_labels.append(col)
+
+            ax.set_ylim(0, df_merged[col].max())
+            ax.set_xlim(-window_size // 2, window_size // 2)
+            overlay.append(ax.axvline(0, color='black', linestyle='--'))
+            ax.xaxis.set_visible(False)
+
+            # Add threshold line if needed
+            if col == "Bending_ZScore":
+                threshold_line = Line2D(
+                    [0], [0], color='grey', linestyle='--', label='Threshold')
+                line_handles.append(threshold_line)
+                line_labels.append('Threshold')
+
+        overlay.append(fig_scroll.legend(handles=line_handles,
+                                         labels=line_labels,
+                                         loc='center right',
+                                         ncol=1,
+                                         fontsize=8))
+        suptitle = fig_scroll.suptitle(title, fontsize=12)
+
+        # Rasterize the background once, without the overlay
+        for artist in overlay:
+            artist.set_visible(False)
+        fig_scroll.canvas.draw()
+        background = np.array(fig_scroll.canvas.buffer_rgba())[:, :, :3]
+        scroll_height, scroll_width = background.shape[:2]
+
+        # Pixel box of each axes, (top, bottom, left, right)
+        boxes = []
+        for ax in ax_scroll:
+            bbox = ax.get_window_extent()
+            boxes.append((scroll_height - int(round(bbox.y1)), scroll_height - int(round(bbox.y0)),
+                          int(round(bbox.x0)), int(round(bbox.x1))))
+        pixels_per_frame = (boxes[0][3] - boxes[0][2]) / window_size
+
+        # Rasterize the overlay once on a transparent canvas
+        hidden = [fig_scroll.patch, suptitle]
+        for ax in ax_scroll:
+            hidden += [ax.patch, ax.yaxis, *ax.spines.values()]
+        for artist in hidden:
+            artist.set_visible(False)
+        for artist in overlay:
+            artist.set_visible(True)
+        fig_scroll.canvas.draw()
+        overlay_rgba = np.array(fig_scroll.canvas.buffer_rgba()).reshape(-1, 4)
+        plt.close(fig_scroll)
+        overlay_index = np.flatnonzero(overlay_rgba[:, 3])
+        overlay_alpha = overlay_rgba[overlay_index, 3:].astype(np.float32) / 255
+        overlay_rgb = overlay_rgba[overlay_index, :3].astype(np.float32) * overlay_alpha
+
+        # The signals are rasterized in tiles of `tile_frames` frames plus one window,
+        # so every window lies inside a single tile
+        tile_frames = max(window_size, int(16384 / max(pixels_per_frame, 1e-3)) - window_size)
+        tile_index = None
+        tiles = []
+        combined_frame = np.empty((scroll_height + frame_height, scroll_width, 3), dtype=np.uint8)
+
+        def compose(frame_idx: int, frame: np.ndarray) -> np.ndarray:
+            nonlocal tile_index, tiles
+            if frame_idx // tile_frames != tile_index:
+                tile_index = frame_idx // tile_frames
+                tile_start = tile_index * tile_frames - window_size // 2
+                tile_stop = tile_start + tile_frames + window_size
+                tiles = [PlottingPlotly._render_signal_strip(
+                    df_merged[col], tile_start, tile_stop,
+                    width=int(round((tile_frames + window_size) * pixels_per_frame)),
+                    height=bottom - top,
+                    color=color_1 if i == 0 else color_2,
+                    threshold=merged_data.threshold if col == "Bending_ZScore" else None)
+                    for i, (col, (top, bottom, _, _)) in enumerate(zip(columns, boxes))]
+
+            # Slice the window out of each strip, inside the axes spines
+            combined_frame[:scroll_height] = background
+            offset = int(round((frame_idx - tile_index * tile_frames) * pixels_per_frame))
+            for tile, (top, bottom, left, right) in zip(tiles, boxes):
+                combined_frame[top + 1:bottom - 1, left + 1:right - 1] = \
+                    tile[1:bottom - top - 1, offset + 1:offset + right - left - 1]
+
+            # Blend the cursor lines and legend on top
+            scroll_pixels = combined_frame[:scroll_height].reshape(-1, 3)
+            scroll_pixels[overlay_index] = (
+                overlay_rgb + scroll_pixels[overlay_index] * (1 - overlay_alpha)).astype(np.uint8)
+
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=combined_frame[scroll_height:])
+            return combined_frame
+
+        return compose
+
+    @staticmethod
+    def _render_signal_strip(signal: pd.Series,
+                             x_start: int,
+                             x_stop: int,
+                             width: int,
+                             height: int,
+                             color: str,
+                             threshold: float = None) -> np.ndarray:
+        """
+        Rasterize a signal into a wide strip image at a fixed scale.
+
+        The strip spans the x-range [x_start, x_stop] (in frames, the index of `signal`)
+        over `width` pixels and the y-range [0, max(signal)] over `height` pixels, with
+        no axes or margins, so that video frames can be cut out of it by slicing.
+
+        Args:
+            signal (pd.Series): The signal to draw, indexed by frame.
+            x_start (int): The first frame of the strip.
+            x_stop (int): The last frame of the strip.
+            width (int): Width of the strip in pixels.
+            height (int): Height of the strip in pixels.
+            color (str): Color of the signal.
+            threshold (float, optional): Draws a dashed horizontal threshold line if given.
+
+        Returns:
+            np.ndarray: The (height, width, 3) RGB strip.
+        """
+        # Half a pixel is added, the canvas size is truncated to whole pixels
+        fig = plt.figure(figsize=((max(width, 1) + 0.5) / 100, (max(height, 1) + 0.5) / 100),
+                         dpi=100)
+        ax = fig.add_axes([0, 0, 1, 1])
+        ax.set_axis_off()
+
+        # Include one sample beyond each edge so the line runs through the edges
+        index = signal.index.to_numpy()
+        visible = (index >= x_start - 1) & (index <= x_stop + 1)
+        ax.plot(index[visible], signal.to_numpy()[visible], color=color)
+        if threshold is not None:
+            ax.axhline(y=threshold, color='grey', linestyle='--')
+        ax.set_xlim(x_start, x_stop)
+        ax.set_ylim(0, signal.max())
+
+        fig.canvas.draw()
+        strip = np.array(fig.canvas.buffer_rgba())[:, :, :3]
+        plt.close(fig)
+        return strip
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+from src.components.validation import Validation as Val
+
+
+class PoseArray:
+    """
+    A contiguous, array-backed store of DeepLabCut pose estimates.
+
+    The x, y and likelihood values of every bodypart are packed into a single
+    C-contiguous float32 buffer of shape (n_frames, 3 * n_bodyparts). The first
+    2 * n_bodyparts columns hold the interleaved (x, y) pairs and the remaining
+    n_bodyparts columns hold the likelihoods, so that:
+        - `xy` is a zero-copy (n_frames, n_bodyparts, 2) view of the coordinates.
+        - `likelihood` is a zero-copy (n_frames, n_bodyparts) view of the likelihoods.
+        - `xy_dataframe` and `likelihood_dataframe` return DataFrames that share the buffer,
+          so writing through `xy` updates them and vice versa.
+
+    Each bodypart owns one integer slot along the bodypart axis, and `index` maps the
+    bodypart name to that slot, which lets hot paths index arrays by integer instead
+    of going through string-keyed pandas rows.
+
+    Attributes:
+        bodyparts (list[str]): Bodypart names in slot order.
+        index (dict[str, int]): Mapping from bodypart name to slot.
+        data (np.ndarray): The contiguous (n_frames, 3 * n_bodyparts) float32 buffer.
+        xy (np.ndarray): (n_frames, n_bodyparts, 2) view of the x and y coordinates.
+        likelihood (np.ndarray): (n_frames, n_bodyparts) view of the likelihoods.
+
+    Args:
+        df (pd.DataFrame): DeepLabCut output with a (scorer, bodypart, coord) column MultiIndex.
+        bodyparts (list[str], optional): Slot order of the bodyparts. Defaults to the order
+            in which they appear in `df`. Keeping groups of bodyparts next to each other
+            lets `xy_dataframe` return views for those groups.
+
+    Raises:
+        TypeError: If `df` is not a DataFrame or `bodyparts` is not a list of strings.
+        ValueError: If the columns are not a DLC MultiIndex or a bodypart is missing
+            its x, y or likelihood column.
+    """
+    coords = ("x", "y", "likelihood")
+
+    def __init__(self,
+                 df: pd.DataFrame,
+                 bodyparts: list[str] = None) -> None:
+        Val.validate_type(df, pd.DataFrame, "DataFrame")
+        if not isinstance(df.columns, pd.MultiIndex) or df.columns.nlevels < 3:
+            raise ValueError(
+                "DataFrame must have a (scorer, bodypart, coord) column MultiIndex.")
+
+        df_bodyparts = df.columns.get_level_values(1)
+        df_coords = df.columns.get_level_values(2)
+        if bodyparts is None:
+            bodyparts = list(dict.fromkeys(df_bodyparts))
+        Val.validate_type_in_list(bodyparts, str, "Bodyparts")
+
+        self.bodyparts = list(bodyparts)
+        self.index = {bodypart: slot for slot, bodypart in enumerate(self.bodyparts)}
+
+        # Column position of every (bodypart, coord) pair in the source DataFrame
+        positions = {(bodypart, coord): i
+                     for i, (bodypart, coord) in enumerate(zip(df_bodyparts, df_coords))}
+        missing = [f"{bodypart}_{coord}" for bodypart in self.bodyparts
+                   for coord in self.coords if (bodypart, coord) not in positions]
+        if missing:
+            raise ValueError(f"DataFrame is missing pose columns: {missing}")
+
+        xy_positions = [positions[(bodypart, coord)]
+                        for bodypart in self.bodyparts for coord in ("x", "y")]
+        likelihood_positions = [positions[(bodypart, "likelihood")]
+                                for bodypart in self.bodyparts]
+
+        values = df.to_numpy(dtype=np.float32)
+        n_frames, n_bodyparts = len(df), len(self.bodyparts)
+        self.data = np.empty((n_frames, 3 * n_bodyparts), dtype=np.float32)
+        self.data[:, :2 * n_bodyparts] = values[:, xy_positions]
+        self.data[:, 2 * n_bodyparts:] = values[:, likelihood_positions]
+
+        self.xy = self.data[:, :2 * n_bodyparts].reshape(n_frames, n_bodyparts, 2)
+        self.likelihood = self.data[:, 2 * n_bodyparts:]
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def slots(self, bodyparts: list[str]) -> np.ndarray:
+        """
+        Look up the integer slots of the given bodyparts.
+
+        Args:
+            bodyparts (list[str]): Bodypart names.
+
+        Returns:
+            np.ndarray: Integer array of slots, in the order of `bodyparts`.
+
+        Raises:
+            KeyError: If a bodypart is not part of the pose array.
+        """
+        return np.array([self.index[bodypart] for bodypart in bodyparts], dtype=np.intp)
+
+    def xy_dataframe(self, bodyparts: list[str]) -> pd.DataFrame:
+        """
+        Build a DataFrame of the x and y coordinates of the given bodyparts.
+
+        Columns are named '<bodypart>_x', '<bodypart>_y'. When the bodyparts occupy
+        consecutive slots (in slot order), the DataFrame is a zero-copy view of the buffer.
+        Otherwise the values are copied.
+
+        Args:
+            bodyparts (list[str]): Bodypart names.
+
+        Returns:
+            pd.DataFrame: The coordinates, one row per frame.
+        """
+        slots = self.slots(bodyparts)
+        columns = [f"{bodypart}_{coord}" for bodypart in bodyparts for coord in ("x", "y")]
+        if len(slots) and np.array_equal(slots, np.arange(slots[0], slots[0] + len(slots))):
+            values = self.data[:, 2 * slots[0]:2 * (slots[0] + len(slots))]
+        else:
+            values = self.xy[:, slots].reshape(len(self), -1)
+        return pd.DataFrame(values, columns=columns, copy=False)
+
+    def likelihood_dataframe(self) -> pd.DataFrame:
+        """
+        Build a zero-copy DataFrame of the likelihoods of all bodyparts.
+
+        Returns:
+            pd.DataFrame: The likelihoods with columns named '<bodypart>_likelihood'.
+        """
+        columns = [f"{bodypart}_likelihood" for bodypart in self.bodyparts]
+        return pd.DataFrame(self.likelihood, columns=columns, copy=False)
@@ -1,3 +1,4 @@
+import os
 import plotly.express as px
 import streamlit as st
 import matplotlib.cm as cm
@@ -30,6 +31,33 @@ def get_temp_video_path(video_file, session_key="labeled_video_path"):
 
     return st.session_state[session_key]
 
+def show_video(video_path, label, file_name, session_key):
+    """
+    Show a generated video and a button to download it, streamed from its file.
+
+    The path is stored in Streamlit's session state under `session_key`, and the video
+    previously generated under that key is removed, so regenerating a video does not
+    leave temporary files behind.
+
+    Args:
+        video_path (str): Path of the generated MP4 file.
+        label (str): Label of the download button.
+        file_name (str): Name of the downloaded file.
+        session_key (str): The session state key of the generated video.
+
+    Side Effects:
+        Updates `st.session_state[session_key]` and removes the previous video file.
+        Displays the video and the download button in the Streamlit UI.
+    """
+    previous_path = st.session_state.get(session_key)
+    if previous_path and previous_path != video_path and os.path.exists(previous_path):
+        os.remove(previous_path)
+    st.session_state[session_key] = video_path
+
+    st.video(video_path)
+    with open(video_path, "rb") as video_file:
+        st.download_button(label=label, data=video_file, file_name=file_name, mime="video/mp4")
+
 def assign_video_path(key="get_video_key"):
     """
     Assign the labeled video path to Streamlit's session state.
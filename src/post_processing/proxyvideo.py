@@ -0,0 +1,160 @@
+import hashlib
+import os
+import subprocess
+import tempfile
+import threading
+import cv2
+from src.components.validation import Validation as Val
+from src.post_processing.videoencoder import VideoEncoder
+
+
+class ProxyVideo:
+    """
+    Low-resolution, keyframe-dense copies of videos for previews and scrubbing.
+
+    A proxy is the video scaled down to `height` pixels (never up), re-encoded with a
+    keyframe every `gop` frames and without audio. It is a fraction of the size of the
+    original, so it loads quickly in the browser, and any frame is at most `gop - 1`
+    frames away from a keyframe, so seeking in the player or with `FrameReader` is cheap.
+    Full-resolution videos stay reserved for final renders.
+
+    Proxies are created on first use and kept in a cache directory, named after the
+    absolute path, modification time and size of the source and the proxy settings,
+    so a changed source gets a new proxy.
+
+    Usage:
+
+        st.video(ProxyVideo.get(labeled_video_path))
+        frame = FrameReader.shared(ProxyVideo.get(video_path)).read(index)
+    """
+    height = 480
+    gop = 10
+    crf = 28
+    preset = "veryfast"
+    cache_dir = os.path.join(tempfile.gettempdir(), "rf_mapping_proxies")
+    _locks = {}
+    _locks_lock = threading.Lock()
+
+    @staticmethod
+    def create(video_path: str,
+               output_path: str,
+               height: int = None,
+               gop: int = None,
+               crf: int = None) -> str:
+        """
+        Transcode a video into a proxy.
+
+        The proxy is written to a temporary file next to `output_path` and renamed once
+        complete, so a partial proxy is never used.
+
+        Args:
+            video_path (str): Path of the source video.
+            output_path (str): Where to write the proxy MP4.
+            height (int, optional): Maximum height of the proxy in pixels, the aspect
+                ratio is kept. Defaults to `ProxyVideo.height`.
+            gop (int, optional): Frames between keyframes, 1 for all-intra. Defaults to
+                `ProxyVideo.gop`.
+            crf (int, optional): Constant rate factor of the encoder. Defaults to `ProxyVideo.crf`.
+
+        Returns:
+            str: Path of the proxy.
+
+        Raises:
+            TypeError, ValueError: If input validation fails.
+            RuntimeError: If ffmpeg exited with an error.
+        """
+        height = ProxyVideo.height if height is None else height
+        gop = ProxyVideo.gop if gop is None else gop
+        crf = ProxyVideo.crf if crf is None else crf
+        Val.validate_path_exists(video_path)
+        Val.validate_type(output_path, str, "Output Path")
+        for value, name in ((height, "Height"), (gop, "GOP")):
+            Val.validate_type(value, int, name)
+            Val.validate_positive(value, name, zero_allowed=False)
+        Val.validate_type(crf, int, "CRF")
+        Val.validate_positive(crf, "CRF", zero_allowed=True)
+
+        partial_path = f"{os.path.splitext(output_path)[0]}.partial.mp4"
+        command = [VideoEncoder.ffmpeg_exe(), "-y", "-loglevel", "error", "-nostats",
+                   "-i", video_path, "-map", "0:v:0", "-an",
+                   # Keep every frame as it is, so frame indices match the source
+                   # (-vsync rather than -fps_mode, for ffmpeg older than 5.1)
+                   "-vsync", "passthrough",
+                   # Scale down to `height` keeping the aspect ratio, with even dimensions
+                   "-vf", f"scale=-2:'2*trunc(min(ih,{height})/2)':flags=area",
+                   "-c:v", "libx264", "-preset", ProxyVideo.preset, "-crf", str(crf),
+                   "-g", str(gop), "-keyint_min", str(gop), "-sc_threshold", "0",
+                   "-pix_fmt", "yuv420p", "-movflags", "+faststart", partial_path]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise RuntimeError(f"ffmpeg exited with code {result.returncode}: {result.stderr.strip()}")
+        os.replace(partial_path, output_path)
+        return output_path
+
+    @staticmethod
+    def proxy_path(video_path: str, height: int = None, gop: int = None, crf: int = None) -> str:
+        """
+        Path of the cached proxy of a video, whether it exists yet or not.
+
+        Args:
+            video_path (str): Path of the source video.
+            height (int, optional): See `create`.
+            gop (int, optional): See `create`.
+            crf (int, optional): See `create`.
+
+        Returns:
+            str: Path of the proxy in `ProxyVideo.cache_dir`.
+        """
+        stat = os.stat(video_path)
+        settings = (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size,
+                    ProxyVideo.height if height is None else height,
+                    ProxyVideo.gop if gop is None else gop,
+                    ProxyVideo.crf if crf is None else crf)
+        digest = hashlib.blake2b(repr(settings).encode(), digest_size=10).hexdigest()
+        stem = os.path.splitext(os.path.basename(video_path))[0]
+        return os.path.join(ProxyVideo.cache_dir, f"{stem}_{digest}.mp4")
+
+    @staticmethod
+    def get(video_path: str, height: int = None, gop: int = None, crf: int = None) -> str:
+        """
+        Get the proxy of a video, creating it on first use.
+
+        Args:
+            video_path (str): Path of the source video.
+            height (int, optional): See `create`.
+            gop (int, optional): See `create`.
+            crf (int, optional): See `create`.
+
+        Returns:
+            str: Path of the proxy.
+
+        Raises:
+            TypeError, ValueError: If input validation fails.
+            RuntimeError: If the proxy cannot be created.
+        """
+        Val.validate_path_exists(video_path)
+        proxy_path = ProxyVideo.proxy_path(video_path, height, gop, crf)
+        with ProxyVideo._locks_lock:
+            lock = ProxyVideo._locks.setdefault(proxy_path, threading.Lock())
+        # Concurrent callers wait for the first one instead of transcoding again
+        with lock:
+            if not os.path.exists(proxy_path):
+                os.makedirs(ProxyVideo.cache_dir, exist_ok=True)
+                ProxyVideo.create(video_path, proxy_path, height, gop, crf)
+        return proxy_path
+
+    @staticmethod
+    def frame_size(video_path: str) -> tuple[int, int]:
+        """
+        Args:
+            video_path (str): Path of a video.
+
+        Returns:
+            tuple[int, int]: The (width, height) of the frames of the video.
+        """
+        cap = cv2.VideoCapture(video_path)
+        size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        cap.release()
+        return size
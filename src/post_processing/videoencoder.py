@@ -0,0 +1,297 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from collections.abc import Iterator
+import numpy as np
+from src.components.validation import Validation as Val
+
+
+class VideoEncoder:
+    """
+    Streams raw video frames into an ffmpeg subprocess.
+
+    Frames are written to ffmpeg's stdin as they are produced, so memory stays flat
+    regardless of the video length, and the encoded MP4 is written straight to disk.
+    The subprocess is started on the first frame, which fixes the frame size and the
+    pixel format (RGB or RGBA) for the rest of the video. Odd frame sizes are padded
+    by one pixel, as H.264 with yuv420p requires even dimensions.
+
+    The ffmpeg executable shipped with imageio-ffmpeg is used, so no system install is
+    needed. The IMAGEIO_FFMPEG_EXE environment variable overrides it.
+
+    Use as a context manager, so that a failed render kills ffmpeg and removes the
+    partial output:
+
+        with VideoEncoder(fps=30) as encoder:
+            for frame in frames:
+                encoder.write(frame)
+        video_path = encoder.output_path
+
+    Attributes:
+        output_path (str): Path of the encoded MP4.
+        n_frames (int): Number of frames written so far.
+
+    Args:
+        fps (float): Frames per second of the output video.
+        output_path (str, optional): Where to write the MP4. Defaults to a new temporary file.
+        codec (str, optional): ffmpeg video codec. Defaults to "libx264".
+        preset (str, optional): Encoder speed/compression trade-off. Defaults to "veryfast".
+        crf (int, optional): Constant rate factor, lower is higher quality. Defaults to 23.
+        threads (int, optional): Encoder threads, 0 lets ffmpeg decide. Defaults to 0.
+        pix_fmt (str, optional): Pixel format of the encoded video. Defaults to "yuv420p".
+
+    Raises:
+        TypeError: If an argument has the wrong type.
+        ValueError: If `fps` is not positive or `crf` or `threads` is negative.
+    """
+    outputs = ("bytes", "path", "chunks")
+
+    def __init__(self,
+                 fps: float,
+                 output_path: str = None,
+                 codec: str = "libx264",
+                 preset: str = "veryfast",
+                 crf: int = 23,
+                 threads: int = 0,
+                 pix_fmt: str = "yuv420p") -> None:
+        Val.validate_type(fps, (int, float), "FPS")
+        Val.validate_positive(fps, "FPS", zero_allowed=False)
+        Val.validate_strings(codec=codec, preset=preset, pix_fmt=pix_fmt)
+        Val.validate_type(crf, int, "CRF")
+        Val.validate_positive(crf, "CRF", zero_allowed=True)
+        Val.validate_type(threads, int, "Threads")
+        Val.validate_positive(threads, "Threads", zero_allowed=True)
+        if output_path is None:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmpfile:
+                output_path = tmpfile.name
+        else:
+            Val.validate_type(output_path, str, "Output Path")
+
+        self.fps = fps
+        self.output_path = output_path
+        self.codec = codec
+        self.preset = preset
+        self.crf = crf
+        self.threads = threads
+        self.pix_fmt = pix_fmt
+        self.n_frames = 0
+        self._frame_shape = None
+        self._process = None
+        self._stderr = None
+
+    def __enter__(self) -> "VideoEncoder":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @staticmethod
+    def ffmpeg_exe() -> str:
+        """
+        Locate the ffmpeg executable.
+
+        Returns:
+            str: Path to the ffmpeg binary of imageio-ffmpeg, or the one on PATH
+                if imageio-ffmpeg is not installed.
+
+        Raises:
+            RuntimeError: If no ffmpeg executable can be found.
+        """
+        try:
+            import imageio_ffmpeg
+            return imageio_ffmpeg.get_ffmpeg_exe()
+        except (ImportError, RuntimeError):
+            exe = shutil.which("ffmpeg")
+            if exe is None:
+                raise RuntimeError("ffmpeg was not found, install imageio-ffmpeg or ffmpeg.")
+            return exe
+
+    def _start(self, frame: np.ndarray) -> None:
+        height, width, channels = frame.shape
+        command = [self.ffmpeg_exe(), "-y", "-loglevel", "error", "-nostats",
+                   "-f", "rawvideo", "-vcodec", "rawvideo",
+                   "-s", f"{width}x{height}", "-pix_fmt", "rgb24" if channels == 3 else "rgba",
+                   "-r", f"{self.fps}", "-i", "-", "-an",
+                   "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+                   "-vcodec", self.codec, "-preset", self.preset, "-crf", str(self.crf),
+                   "-threads", str(self.threads), "-pix_fmt", self.pix_fmt,
+                   "-movflags", "+faststart", self.output_path]
+        # stderr goes to a file, a pipe that is never drained could block ffmpeg
+        self._stderr = tempfile.TemporaryFile()
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                         stdout=subprocess.DEVNULL, stderr=self._stderr)
+        self._frame_shape = frame.shape
+
+    def _error_message(self) -> str:
+        self._stderr.seek(0)
+        return self._stderr.read().decode(errors="replace").strip()
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Encode one frame.
+
+        Args:
+            frame (np.ndarray): (height, width, 3) RGB or (height, width, 4) RGBA uint8 frame.
+
+        Raises:
+            TypeError: If the frame is not a uint8 array.
+            ValueError: If the frame shape is invalid or differs from the first frame.
+            RuntimeError: If the encoder was closed or ffmpeg exited with an error.
+        """
+        Val.validate_type(frame, np.ndarray, "Frame")
+        if frame.dtype != np.uint8:
+            raise TypeError("Frame must be a uint8 array.")
+        if self._frame_shape is None:
+            if frame.ndim != 3 or frame.shape[2] not in (3, 4):
+                raise ValueError("Frame must have shape (height, width, 3) or (height, width, 4).")
+            self._start(frame)
+        elif frame.shape != self._frame_shape:
+            raise ValueError(f"Frame shape {frame.shape} differs from the first frame "
+                             f"shape {self._frame_shape}.")
+        if self._process is None or self._process.stdin.closed:
+            raise RuntimeError("The encoder is closed.")
+
+        try:
+            self._process.stdin.write(memoryview(np.ascontiguousarray(frame)).cast("B"))
+        except BrokenPipeError:
+            self._process.wait()
+            raise RuntimeError(f"ffmpeg exited while encoding: {self._error_message()}")
+        self.n_frames += 1
+
+    def close(self) -> str:
+        """
+        Flush the remaining frames and wait for ffmpeg to finish the file.
+
+        Returns:
+            str: Path of the encoded MP4.
+
+        Raises:
+            RuntimeError: If no frame was written or ffmpeg exited with an error.
+        """
+        if self._process is None:
+            self.abort()
+            raise RuntimeError("No frames were written to the video.")
+        if not self._process.stdin.closed:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+        return_code = self._process.wait()
+        if return_code != 0:
+            raise RuntimeError(f"ffmpeg exited with code {return_code}: {self._error_message()}")
+        self._stderr.close()
+        return self.output_path
+
+    def abort(self) -> None:
+        """
+        Stop ffmpeg and remove the partial output.
+        """
+        if self._process is not None:
+            self._process.kill()
+            self._process.wait()
+            if not self._process.stdin.closed:
+                try:
+                    self._process.stdin.close()
+                except BrokenPipeError:
+                    pass
+            self._stderr.close()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    @staticmethod
+    def concat(segment_paths: list[str], output_path: str) -> str:
+        """
+        Join encoded videos end to end without re-encoding them.
+
+        The segments must share the codec and encoding parameters, as those written by
+        `VideoEncoder` with the same options do. Each segment starts with a keyframe,
+        so the packets are copied as they are.
+
+        Args:
+            segment_paths (list[str]): Paths of the segments, in playback order.
+            output_path (str): Where to write the joined MP4.
+
+        Returns:
+            str: Path of the joined MP4.
+
+        Raises:
+            ValueError: If `segment_paths` is empty.
+            RuntimeError: If ffmpeg exited with an error.
+        """
+        Val.validate_type_in_list(segment_paths, str, "Segment Paths")
+        if not segment_paths:
+            raise ValueError("At least one segment is required.")
+        Val.validate_type(output_path, str, "Output Path")
+
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as list_file:
+            for path in segment_paths:
+                escaped = os.path.abspath(path).replace("'", r"'\''")
+                list_file.write(f"file '{escaped}'\n")
+        try:
+            result = subprocess.run([VideoEncoder.ffmpeg_exe(), "-y", "-loglevel", "error",
+                                     "-f", "concat", "-safe", "0", "-i", list_file.name,
+                                     "-c", "copy", "-movflags", "+faststart", output_path],
+                                    capture_output=True, text=True)
+        finally:
+            os.remove(list_file.name)
+        if result.returncode != 0:
+            if os.path.exists(output_path):
+                os.remove(output_path)
+            raise RuntimeError(f"ffmpeg exited with code {result.returncode}: {result.stderr.strip()}")
+        return output_path
+
+    @staticmethod
+    def iter_chunks(path: str,
+                    chunk_size: int = 1 << 20,
+                    delete: bool = False) -> Iterator[bytes]:
+        """
+        Read a file as a stream of byte chunks.
+
+        Args:
+            path (str): Path of the file.
+            chunk_size (int, optional): Size of each chunk in bytes. Defaults to 1 MiB.
+            delete (bool, optional): Remove the file once it has been read. Defaults to False.
+
+        Yields:
+            bytes: The next chunk of the file.
+        """
+        try:
+            with open(path, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+        finally:
+            if delete and os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def collect(path: str, output: str, delete: bool = True) -> bytes | str | Iterator[bytes]:
+        """
+        Return an encoded video in the requested form.
+
+        Args:
+            path (str): Path of the encoded video.
+            output (str): "bytes" to read the whole video into memory, "path" to return
+                the file path, or "chunks" to return an iterator of byte chunks.
+            delete (bool, optional): Remove the file once it has been read for the
+                "bytes" and "chunks" outputs. Defaults to True.
+
+        Returns:
+            bytes | str | Iterator[bytes]: The video in the requested form.
+
+        Raises:
+            ValueError: If `output` is not one of "bytes", "path" or "chunks".
+        """
+        Val.validate_in_list(output, VideoEncoder.outputs, "Output")
+        if output == "path":
+            return path
+        if output == "chunks":
+            return VideoEncoder.iter_chunks(path, delete=delete)
+        with open(path, "rb") as f:
+            video_bytes = f.read()
+        if delete:
+            os.remove(path)
+        return video_bytes
@@ -0,0 +1,259 @@
+import warnings
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+import cv2
+import numpy as np
+from src.components.validation import Validation as Val
+from src.post_processing.videoencoder import VideoEncoder
+
+
+class FrameSink(ABC):
+    """
+    Receives the decoded frames of a `VideoRenderer`.
+
+    Subclasses implement `write` and usually `close`. The frames are BGR uint8 arrays
+    shared by all the sinks of a renderer, so they are read-only: a sink that draws
+    on a frame must copy it first.
+    """
+    def start(self, fps: float, frame_width: int, frame_height: int) -> None:
+        """
+        Called once before the first frame.
+
+        Args:
+            fps (float): Frames per second of the video.
+            frame_width (int): Width of the frames in pixels.
+            frame_height (int): Height of the frames in pixels.
+        """
+
+    @abstractmethod
+    def write(self, index: int, frame: np.ndarray) -> None:
+        """
+        Called with every frame, in order.
+
+        Args:
+            index (int): Index of the frame in the video.
+            frame (np.ndarray): The read-only (height, width, 3) BGR frame.
+        """
+
+    def close(self, n_frames: int):
+        """
+        Called once after the last frame.
+
+        Args:
+            n_frames (int): Number of frames of the video.
+
+        Returns:
+            The result of the sink, returned by `VideoRenderer.run`.
+        """
+        return None
+
+    def abort(self) -> None:
+        """
+        Called instead of `close` when rendering fails, to release resources.
+        """
+
+
+class EncoderSink(FrameSink):
+    """
+    Renders every frame with a function and encodes the result with its own `VideoEncoder`.
+
+    Args:
+        render (Callable[[int, np.ndarray], np.ndarray]): Maps the frame index and the
+            read-only BGR frame to the RGB or RGBA uint8 frame to encode.
+        output (str, optional): "bytes", "path" or "chunks", see `VideoEncoder.collect`.
+            Defaults to "bytes".
+        output_path (str, optional): Where to write the MP4. Defaults to a temporary file,
+            which is removed once read for the "bytes" and "chunks" outputs.
+        encoder_options (dict, optional): Keyword arguments for VideoEncoder, such as
+            `preset`, `crf` and `threads`.
+        fps (float, optional): Frames per second of the output. Defaults to that of the video.
+        expected_frames (int, optional): Number of frames the render data covers. A warning
+            is issued if the video has a different number of frames. Defaults to None.
+
+    Raises:
+        TypeError, ValueError: If input validation fails.
+    """
+    def __init__(self,
+                 render: Callable[[int, np.ndarray], np.ndarray],
+                 output: str = "bytes",
+                 output_path: str = None,
+                 encoder_options: dict = None,
+                 fps: float = None,
+                 expected_frames: int = None) -> None:
+        if not callable(render):
+            raise TypeError("Render must be callable.")
+        Val.validate_in_list(output, VideoEncoder.outputs, "Output")
+        self.render = render
+        self.output = output
+        self.output_path = output_path
+        self.encoder_options = encoder_options or {}
+        self.fps = fps
+        self.expected_frames = expected_frames
+        self.encoder = None
+
+    def start(self, fps: float, frame_width: int, frame_height: int) -> None:
+        self.encoder = VideoEncoder(self.fps or fps, output_path=self.output_path,
+                                    **self.encoder_options)
+
+    def write(self, index: int, frame: np.ndarray) -> None:
+        self.encoder.write(self.render(index, frame))
+
+    def close(self, n_frames: int) -> bytes | str | Iterator[bytes]:
+        path = self.encoder.close()
+        if self.expected_frames is not None and n_frames != self.expected_frames:
+            warnings.warn(f"The video has {n_frames} frames but the data has "
+                          f"{self.expected_frames}, only the first "
+                          f"{min(n_frames, self.expected_frames)} frames have an overlay.")
+        return VideoEncoder.collect(path, self.output, delete=self.output_path is None)
+
+    def abort(self) -> None:
+        if self.encoder is not None:
+            self.encoder.abort()
+
+
+class FrameGrabSink(FrameSink):
+    """
+    Keeps copies of the frames at the given indices.
+
+    Args:
+        indices (list[int]): Indices of the frames to keep.
+
+    Returns (from `VideoRenderer.run`):
+        dict[int, np.ndarray]: The BGR frames by index, for the indices within the video.
+    """
+    def __init__(self, indices: list[int]) -> None:
+        Val.validate_type_in_list(indices, int, "Indices")
+        self.indices = set(indices)
+        self.frames = {}
+
+    def write(self, index: int, frame: np.ndarray) -> None:
+        if index in self.indices:
+            self.frames[index] = frame.copy()
+
+    def close(self, n_frames: int) -> dict[int, np.ndarray]:
+        return self.frames
+
+
+class ThumbnailSink(FrameSink):
+    """
+    Keeps a downscaled copy of every `step`-th frame.
+
+    Args:
+        step (int, optional): Keep one frame in `step`. Defaults to 30.
+        width (int, optional): Width of the thumbnails in pixels, the aspect ratio is
+            kept. Defaults to 160.
+
+    Returns (from `VideoRenderer.run`):
+        tuple[np.ndarray, np.ndarray]: The indices of the kept frames and the
+            (n_thumbnails, height, width, 3) RGB thumbnails.
+
+    Raises:
+        TypeError, ValueError: If input validation fails.
+    """
+    def __init__(self, step: int = 30, width: int = 160) -> None:
+        Val.validate_type(step, int, "Step")
+        Val.validate_positive(step, "Step", zero_allowed=False)
+        Val.validate_type(width, int, "Width")
+        Val.validate_positive(width, "Width", zero_allowed=False)
+        self.step = step
+        self.width = width
+        self.size = None
+        self.indices = []
+        self.thumbnails = []
+
+    def start(self, fps: float, frame_width: int, frame_height: int) -> None:
+        self.size = (self.width, max(1, round(frame_height * self.width / max(frame_width, 1))))
+
+    def write(self, index: int, frame: np.ndarray) -> None:
+        if index % self.step == 0:
+            thumbnail = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+            self.thumbnails.append(cv2.cvtColor(thumbnail, cv2.COLOR_BGR2RGB))
+            self.indices.append(index)
+
+    def close(self, n_frames: int) -> tuple[np.ndarray, np.ndarray]:
+        width, height = self.size or (self.width, 0)
+        thumbnails = np.stack(self.thumbnails) if self.thumbnails else \
+            np.empty((0, height, width, 3), dtype=np.uint8)
+        return np.array(self.indices, dtype=np.int64), thumbnails
+
+
+class VideoRenderer:
+    """
+    Decodes a video once and fans every frame out to a set of sinks.
+
+    Producing several outputs from one recording, e.g. a labeled video, a scrolling
+    signal video and a few background frames, then costs a single decode instead of
+    one per output. Each sink keeps its own state and, for video outputs, its own
+    encoder (see `EncoderSink`).
+
+    Usage:
+
+        renderer = VideoRenderer(video_path, {
+            "labeled": PlottingPlotly.labeled_sink(dlc_data),
+            "scroll": PlottingPlotly.scroll_over_sink(merged_data, ["Bending_ZScore"]),
+            "thumbnails": ThumbnailSink(step=100),
+        })
+        results = renderer.run()
+        st.video(results["labeled"])
+
+    Attributes:
+        video_path (str): Path of the video.
+        sinks (dict[str, FrameSink]): The sinks, by name.
+        n_frames (int): Number of frames decoded by the last run.
+
+    Args:
+        video_path (str): Path of the video.
+        sinks (dict[str, FrameSink]): The sinks, by name.
+
+    Raises:
+        TypeError: If `sinks` is not a dict of FrameSink.
+        ValueError: If the video does not exist or `sinks` is empty.
+    """
+    def __init__(self, video_path: str, sinks: dict[str, FrameSink]) -> None:
+        Val.validate_path_exists(video_path)
+        Val.validate_type(sinks, dict, "Sinks")
+        if not sinks:
+            raise ValueError("At least one sink is required.")
+        for name, sink in sinks.items():
+            Val.validate_type(sink, FrameSink, f"Sink {name!r}")
+        self.video_path = video_path
+        self.sinks = sinks
+        self.n_frames = 0
+
+    def run(self) -> dict:
+        """
+        Decode the video and pass every frame to every sink.
+
+        If a sink fails, all the sinks are aborted and the error is re-raised.
+
+        Returns:
+            dict: The result of every sink, by name.
+        """
+        cap = cv2.VideoCapture(self.video_path)
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        self.n_frames = 0
+        started = []
+        try:
+            for sink in self.sinks.values():
+                sink.start(fps, frame_width, frame_height)
+                started.append(sink)
+            while cap.isOpened():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                # Shared by all the sinks, so none of them can change it for the others
+                frame.setflags(write=False)
+                for sink in self.sinks.values():
+                    sink.write(self.n_frames, frame)
+                self.n_frames += 1
+            results = {name: sink.close(self.n_frames) for name, sink in self.sinks.items()}
+        except BaseException:
+            for sink in started:
+                sink.abort()
+            raise
+        finally:
+            cap.release()
+        return results
@@ -9,15 +9,23 @@ import pathlib
 import deeplabcut
 import sys
 import shutil
+import queue
+import threading
 import matplotlib.pyplot as plt
 
 from pathlib import Path
 from ruamel.yaml import YAML
 from ruamel.yaml.scalarstring import DoubleQuotedScalarString
-from glob import glob
+from glob import glob, escape as glob_escape
 
 from src.post_processing.datadlc import DataDLC
 from src.post_processing.plotting_plotly import PlottingPlotly
+from src.post_processing.proxyvideo import ProxyVideo
+from src.train_predict.predictioncache import PredictionCache
+
+# Size and frame rate of the videos given to the model
+PREPROCESS_SIZE = (1274, 720)
+PREPROCESS_FPS = 30.0
 
 # Project Setup and Utilities
 
@@ -300,7 +308,35 @@ def is_labeling_done(project_path: str) -> bool:
                 return True
     return False
 
-def preprocess_video(input_video_path: str, output_video_path: str) -> str:
+def _letterbox_frame(frame: np.ndarray, canvas: np.ndarray) -> tuple[int, int]:
+    """
+    Resizes a frame to fit within the canvas while keeping its aspect ratio and
+    writes it centered onto the canvas in place.
+
+    The area outside the resized frame is left untouched, so a canvas that is
+    reused for frames of the same size keeps its black borders.
+
+    Args:
+        frame (np.ndarray): The (height, width, 3) frame to resize.
+        canvas (np.ndarray): The (target_height, target_width, 3) canvas to write into.
+
+    Returns:
+        tuple[int, int]: The (width, height) of the resized frame on the canvas.
+    """
+    target_height, target_width = canvas.shape[:2]
+    h, w = frame.shape[:2]
+    scale = min(target_width / w, target_height / h)
+    new_w, new_h = int(w * scale), int(h * scale)
+    y_offset = (target_height - new_h) // 2
+    x_offset = (target_width - new_w) // 2
+    cv2.resize(frame, (new_w, new_h),
+               dst=canvas[y_offset:y_offset+new_h, x_offset:x_offset+new_w])
+    return new_w, new_h
+
+def preprocess_video(input_video_path: str,
+                     output_video_path: str,
+                     n_threads: int = None,
+                     queue_size: int = 8) -> str:
     """
     Preprocesses a video by removing audio, scaling it to a target resolution, 
     centering it, and setting the frame rate to 30 FPS.
@@ -310,46 +346,206 @@ def preprocess_video(input_video_path: str, output_video_path: str) -> str:
     it is centered on a black canvas. The output video is saved as an MP4 file 
     with 30 FPS.
 
+    Decoding, resizing and encoding run as a staged pipeline: a reader thread
+    decodes frames into a bounded queue, a pool of worker threads letterboxes
+    them, each into its own preallocated canvas, and a writer thread encodes the
+    canvases in frame order and hands them back to their workers. OpenCV releases
+    the GIL while decoding, resizing and encoding, so the stages overlap.
+
     Args:
         input_video_path (str): The file path to the input video to be processed.
         output_video_path (str): The file path where the processed video will be saved.
+        n_threads (int, optional): Number of resize worker threads. Defaults to
+            min(4, number of CPUs).
+        queue_size (int, optional): Maximum number of decoded frames waiting to be
+            resized, which bounds the memory held by decoded frames. Defaults to 8.
 
     Returns:
         str: The file path to the processed video.
 
     Raises:
-        None: Assumes OpenCV functions handle any internal exceptions related to file reading/writing.
+        ValueError: If `n_threads` or `queue_size` is not a positive integer.
+        Exception: Any error raised while decoding, resizing or encoding a frame
+            is re-raised once the pipeline has shut down.
     """
-    target_width, target_height = 1274, 720
+    if n_threads is None:
+        n_threads = min(4, os.cpu_count() or 1)
+    for name, value in (("n_threads", n_threads), ("queue_size", queue_size)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            raise ValueError(f"{name} must be a positive integer.")
+
+    target_width, target_height = PREPROCESS_SIZE
     cap = cv2.VideoCapture(input_video_path)
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(output_video_path,
                           fourcc,
-                          30.0,
+                          PREPROCESS_FPS,
                           (target_width, target_height))
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        h, w = frame.shape[:2]
-        scale = min(target_width / w, target_height / h)
-        new_w, new_h = int(w * scale), int(h * scale)
-        resized_frame = cv2.resize(frame, (new_w, new_h))
-
-        # Create a black canvas and center the resized frame
+    frame_queue = queue.Queue(maxsize=queue_size)
+    canvas_queue = queue.Queue()
+    errors = []
+    stop = threading.Event()
+
+    def fail(error: Exception) -> None:
+        errors.append(error)
+        stop.set()
+
+    def read_frames() -> None:
+        try:
+            index = 0
+            while cap.isOpened() and not stop.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frame_queue.put((index, frame))
+                index += 1
+        except Exception as error:
+            fail(error)
+        finally:
+            for _ in range(n_threads):
+                frame_queue.put(None)
+
+    def resize_frames() -> None:
         canvas = np.zeros((target_height, target_width, 3), dtype=np.uint8)
-        y_offset = (target_height - new_h) // 2
-        x_offset = (target_width - new_w) // 2
-        canvas[y_offset:y_offset+new_h, x_offset:x_offset+new_w] = resized_frame
-
-        out.write(canvas)
+        released = queue.Queue(maxsize=1)
+        frame_size = None
+        while (item := frame_queue.get()) is not None:
+            # Keep draining after a failure so the reader is never blocked
+            if stop.is_set():
+                continue
+            index, frame = item
+            try:
+                # Clear the borders when the letterbox changes between frames
+                if frame_size is not None and frame.shape[:2] != frame_size:
+                    canvas[:] = 0
+                frame_size = frame.shape[:2]
+                _letterbox_frame(frame, canvas)
+            except Exception as error:
+                fail(error)
+                continue
+            canvas_queue.put((index, canvas, released))
+            # Wait until the writer has encoded the canvas before reusing it
+            released.get()
+        canvas_queue.put(None)
+
+    def write_frames() -> None:
+        pending = {}
+        next_index = 0
+        n_running = n_threads
+        while n_running:
+            item = canvas_queue.get()
+            if item is None:
+                n_running -= 1
+                continue
+            index, canvas, released = item
+            pending[index] = (canvas, released)
+            while next_index in pending and not stop.is_set():
+                canvas, released = pending.pop(next_index)
+                try:
+                    out.write(canvas)
+                except Exception as error:
+                    fail(error)
+                released.put(None)
+                next_index += 1
+            if stop.is_set():
+                # Frames are skipped after a failure, release everything that is waiting
+                for _, released in pending.values():
+                    released.put(None)
+                pending.clear()
+
+    threads = [threading.Thread(target=read_frames, daemon=True),
+               threading.Thread(target=write_frames, daemon=True)]
+    threads += [threading.Thread(target=resize_frames, daemon=True) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
 
     cap.release()
     out.release()
+    if errors:
+        raise errors[0]
     return output_video_path
 
+def preprocess_video_cached(input_video_path: str,
+                            output_video_path: str,
+                            cache: PredictionCache) -> str:
+    """
+    Preprocesses a video with `preprocess_video`, reusing the result of an earlier
+    run on a video with the same content.
+
+    The cache key combines a hash of the input video bytes with the preprocessing
+    parameters, so the file name of the upload does not matter.
+
+    Args:
+        input_video_path (str): The file path to the input video to be processed.
+        output_video_path (str): The file path where the processed video will be saved.
+        cache (PredictionCache): The cache of processed videos.
+
+    Returns:
+        str: The file path to the processed video.
+    """
+    key = cache.key("preprocess_video", cache.hash_file(input_video_path),
+                    list(PREPROCESS_SIZE), PREPROCESS_FPS)
+    entry = cache.get(key)
+    if entry:
+        shutil.copyfile(next(iter(entry.values())), output_video_path)
+        return output_video_path
+
+    preprocess_video(input_video_path, output_video_path)
+    cache.put(key, [output_video_path])
+    return output_video_path
+
+def analyze_video_cached(config_path: str,
+                         video_path: str,
+                         cache: PredictionCache = None) -> bool:
+    """
+    Runs DeepLabCut's `analyze_videos` on a video, reusing the predictions of an
+    earlier run on the same video content with the same model.
+
+    The cache key combines a hash of the video bytes with the identity of the
+    model (see `PredictionCache.model_identity`), so retraining the model gives
+    new predictions. The .h5 and .pickle outputs are stored without the video
+    name and restored next to the video under its current name. Only the outputs
+    written or rewritten by this run are cached, so the predictions of other models
+    for the same video are never stored under this model's key.
+
+    Args:
+        config_path (str): The path to the config.yaml file for DeepLabCut.
+        video_path (str): The path to the video to be analyzed.
+        cache (PredictionCache, optional): The cache of predictions. Defaults to None,
+            which always runs the analysis.
+
+    Returns:
+        bool: True if the predictions came from the cache.
+    """
+    if cache is None:
+        deeplabcut.analyze_videos(config_path, [video_path], shuffle=1)
+        return False
+
+    videos_dir = os.path.dirname(video_path)
+    stem = Path(video_path).stem
+    key = cache.key("analyze_videos", cache.hash_file(video_path),
+                    cache.model_identity(os.path.dirname(config_path)))
+    entry = cache.get(key)
+    if entry:
+        for suffix, cached_path in entry.items():
+            shutil.copyfile(cached_path, os.path.join(videos_dir, stem + suffix))
+        return True
+
+    def list_outputs():
+        return {path: os.stat(path).st_mtime_ns for ext in ("h5", "pickle")
+                for path in glob(os.path.join(videos_dir, f"{glob_escape(stem)}DLC*.{ext}"))}
+
+    # Only the files written by this run are cached, not the outputs of other models
+    before = list_outputs()
+    deeplabcut.analyze_videos(config_path, [video_path], shuffle=1)
+    outputs = [path for path, mtime in list_outputs().items() if before.get(path) != mtime]
+    if outputs:
+        cache.put(key, outputs, names=[os.path.basename(path)[len(stem):] for path in outputs])
+    return False
+
 # Visualization
 def show_detector_training_loss(train_folder):
     """
@@ -620,20 +816,24 @@ def run_retraining(config_path, train_folder,
     
 def predict_and_show_labeled_video(config_path: str,
                                    video_path: str,
-                                   videos_dir: str):
+                                   videos_dir: str,
+                                   cache: PredictionCache = None):
     """
     Analyzes a video using DeepLabCut, generates predictions, and displays the labeled video.
 
     This function performs the following steps:
     1. Analyzes the provided video using DeepLabCut's `analyze_videos` function.
     2. Saves the generated `.h5` file to the session state.
-    3. Loads the `.h5` file and generates a labeled video.
-    4. Displays the labeled video in the Streamlit interface.
+    3. Loads the `.h5` file and generates a labeled video, saved as
+       '<video name>_labeled.mp4' in `videos_dir`.
+    4. Displays a low-resolution proxy of the labeled video in the Streamlit interface.
 
     Args:
         config_path (str): The path to the config.yaml file for DeepLabCut.
         video_path (str): The path to the video to be analyzed and labeled.
         videos_dir (str): The directory where the videos are stored.
+        cache (PredictionCache, optional): Reuses the predictions of an earlier run
+            on the same video with the same model. Defaults to None.
 
     Returns:
         None: The function directly displays the labeled video in Streamlit.
@@ -643,13 +843,19 @@ def predict_and_show_labeled_video(config_path: str,
     """
     try:
         st.info("📈 Running predictions and generating the labeled video with imputed outliers. Please wait...")
-        deeplabcut.analyze_videos(config_path, [video_path], shuffle=1)
-        st.success("🎉 New predictions generated!")
+        if analyze_video_cached(config_path, video_path, cache):
+            st.success("🎉 Predictions loaded from the cache!")
+        else:
+            st.success("🎉 New predictions generated!")
 
         h5_path = save_h5_to_session(videos_dir=videos_dir)
         dlc_data = DataDLC(h5_file=h5_path)
-        vid_bit = PlottingPlotly.generate_labeled_video(dlc_data, video_path)
-        st.video(vid_bit)
+        # The full-resolution video stays on disk, the browser gets the light proxy
+        labeled_path = os.path.join(videos_dir, f"{Path(video_path).stem}_labeled.mp4")
+        PlottingPlotly.generate_labeled_video(dlc_data, video_path,
+                                              output="path", output_path=labeled_path)
+        st.video(ProxyVideo.get(labeled_path))
+        st.caption(f"Low-resolution preview, the full-resolution video is saved to {labeled_path}")
 
     except Exception as e:
         st.error(f"❌ Could not complete prediction or labeling: {e}")
\ No newline at end of file
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from glob import glob
+
+
+class PredictionCache:
+    """
+    Content-addressed cache of preprocessed videos and DeepLabCut predictions.
+
+    Entries are keyed by a hash of everything the cached files depend on, such as
+    the bytes of the uploaded video, the preprocessing parameters or the snapshot
+    files of the model (see `key`, `hash_file` and `model_identity`). Since the key
+    changes with any of its inputs, entries never need to be invalidated: a new
+    video, new parameters or a retrained model simply give a new key.
+
+    Each entry is a directory named after its key, holding the cached files. Entries
+    are written to a temporary directory and renamed into place, so a concurrent or
+    interrupted write never exposes a partial entry. The modification time of an
+    entry directory records its last use, and the least recently used entries are
+    evicted once the cache grows beyond `max_bytes`.
+
+    Args:
+        cache_dir (str): Directory holding the cache, created if missing.
+        max_bytes (int, optional): Size limit of the cache. Defaults to 10 GiB.
+
+    Raises:
+        TypeError: If `cache_dir` is not a string or `max_bytes` is not an integer.
+        ValueError: If `max_bytes` is negative.
+    """
+    chunk_size = 1 << 20
+
+    def __init__(self, cache_dir: str, max_bytes: int = 10 * 2**30) -> None:
+        if not isinstance(cache_dir, str):
+            raise TypeError(f"Cache directory must be a string. Got {type(cache_dir)} instead.")
+        if not isinstance(max_bytes, int) or isinstance(max_bytes, bool):
+            raise TypeError(f"Max bytes must be an integer. Got {type(max_bytes)} instead.")
+        if max_bytes < 0:
+            raise ValueError(f"Max bytes must be non-negative. Got {max_bytes} instead.")
+
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        """
+        Hash the content of a file.
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            str: The hexadecimal BLAKE2b digest of the file.
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        with open(path, "rb") as f:
+            while chunk := f.read(PredictionCache.chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def model_identity(project_path: str) -> list:
+        """
+        Identify the model of a DeepLabCut project without reading its weights.
+
+        The snapshots are identified by their path, size and modification time, which
+        change whenever the model is retrained. The config.yaml content is included
+        too, as it defines the predicted body parts.
+
+        Args:
+            project_path (str): Path to the root of the DeepLabCut project.
+
+        Returns:
+            list: JSON-serializable identity of the model, for use in `key`.
+        """
+        snapshots = sorted(glob(os.path.join(project_path, "dlc-models*", "**", "*.pt"),
+                                recursive=True))
+        identity = []
+        for path in snapshots:
+            stat = os.stat(path)
+            identity.append([os.path.relpath(path, project_path).replace(os.sep, "/"),
+                             stat.st_size, stat.st_mtime_ns])
+        config_path = os.path.join(project_path, "config.yaml")
+        config_hash = PredictionCache.hash_file(config_path) if os.path.exists(config_path) else None
+        return [config_hash, identity]
+
+    @staticmethod
+    def key(*parts) -> str:
+        """
+        Build a cache key from JSON-serializable parts.
+
+        Args:
+            *parts: The values the cached files depend on.
+
+        Returns:
+            str: The hexadecimal key.
+        """
+        encoded = json.dumps(parts, sort_keys=True, separators=(",", ":")).encode()
+        return hashlib.blake2b(encoded, digest_size=20).hexdigest()
+
+    def _entry_dir(self, key: str) -> str:
+        if not isinstance(key, str) or not key.isalnum():
+            raise ValueError(f"Invalid cache key: {key!r}")
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str) -> dict[str, str] | None:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key (str): The key of the entry.
+
+        Returns:
+            dict[str, str] | None: The paths of the cached files by file name,
+                or None if the entry is not cached.
+        """
+        entry_dir = self._entry_dir(key)
+        try:
+            names = sorted(os.listdir(entry_dir))
+            os.utime(entry_dir)
+        except FileNotFoundError:
+            return None
+        return {name: os.path.join(entry_dir, name) for name in names}
+
+    def put(self, key: str, paths: list[str], names: list[str] = None) -> dict[str, str]:
+        """
+        Copy files into a new entry, then evict the least recently used entries.
+
+        An existing entry with the same key is kept as it is, since it holds the
+        same content.
+
+        Args:
+            key (str): The key of the entry.
+            paths (list[str]): The files to cache.
+            names (list[str], optional): The names to store the files under.
+                Defaults to their file names.
+
+        Returns:
+            dict[str, str]: The paths of the cached files by file name.
+
+        Raises:
+            ValueError: If `names` and `paths` differ in length or a name is not a plain file name.
+        """
+        if names is None:
+            names = [os.path.basename(path) for path in paths]
+        if len(names) != len(paths):
+            raise ValueError("Names and paths must have the same length.")
+        for name in names:
+            if not name or os.path.basename(name) != name or name.startswith("."):
+                raise ValueError(f"Invalid file name: {name!r}")
+
+        entry_dir = self._entry_dir(key)
+        if not os.path.isdir(entry_dir):
+            temp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir)
+            try:
+                for path, name in zip(paths, names):
+                    shutil.copyfile(path, os.path.join(temp_dir, name))
+                os.rename(temp_dir, entry_dir)
+            except OSError:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                # Another writer stored the same entry first
+                if not os.path.isdir(entry_dir):
+                    raise
+        entry = self.get(key)
+        self.evict(keep=key)
+        return entry
+
+    def size(self) -> int:
+        """
+        Returns:
+            int: Total size of the cached files in bytes.
+        """
+        return sum(size for _, _, size in self._entries())
+
+    def _entries(self) -> list[tuple[int, str, int]]:
+        """(last use, key, size) of every entry, least recently used first."""
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, key)
+            if key.startswith(".") or not os.path.isdir(entry_dir):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+                entries.append((os.stat(entry_dir).st_mtime_ns, key, size))
+            except FileNotFoundError:
+                continue  # Evicted concurrently
+        return sorted(entries)
+
+    def evict(self, keep: str = None) -> list[str]:
+        """
+        Remove the least recently used entries until the cache fits in `max_bytes`.
+
+        Args:
+            keep (str, optional): Key of an entry that is never evicted, e.g. the one
+                just added. Defaults to None.
+
+        Returns:
+            list[str]: The keys of the evicted entries.
+        """
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, _, size in entries)
+            evicted = []
+            for _, key, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if key == keep:
+                    continue
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+                total -= size
+                evicted.append(key)
+        return evicted
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            for key in os.listdir(self.cache_dir):
+                shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
@@ -0,0 +1,120 @@
+import unittest
+import json
+import os
+import tempfile
+from unittest.mock import patch
+import cv2
+import numpy as np
+from src.components import convert_roi
+from parameterized import parameterized
+
+N_FRAMES = 12
+
+
+def make_video(path: str, n_frames: int = N_FRAMES) -> None:
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), 30.0, (64, 48))
+    for i in range(n_frames):
+        out.write(np.full((48, 64, 3), 10 * i, dtype=np.uint8))
+    out.release()
+
+
+class TestConvertRoi(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmpdir.name, "input")
+        self.output_dir = os.path.join(self.tmpdir.name, "output")
+        self.roi_file = os.path.join(self.tmpdir.name, "rois.json")
+        os.makedirs(self.input_dir)
+        for name in ("a.mp4", "b.MOV"):
+            make_video(os.path.join(self.input_dir, name))
+        # Not a video, ignored
+        with open(os.path.join(self.input_dir, "notes.txt"), "w") as f:
+            f.write("notes")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_crop_video(self):
+        output_path = os.path.join(self.tmpdir.name, "cropped.mp4")
+        n_frames = convert_roi.crop_video(os.path.join(self.input_dir, "a.mp4"), output_path, (8, 4, 32, 20))
+
+        self.assertEqual(n_frames, N_FRAMES)
+        cap = cv2.VideoCapture(output_path)
+        self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), N_FRAMES)
+        ret, frame = cap.read()
+        cap.release()
+        self.assertTrue(ret)
+        self.assertEqual(frame.shape, (20, 32, 3))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "cropped.partial.mp4")))
+
+    @parameterized.expand([
+        ("missing_file", "missing.mp4", (0, 0, 10, 10), FileNotFoundError),
+        ("empty_roi", "a.mp4", (0, 0, 0, 10), ValueError),
+        ("roi_outside_frame", "a.mp4", (40, 0, 32, 10), ValueError),
+    ])
+    def test_crop_video_invalid(self, name, filename, roi, expected_exc):
+        with self.assertRaises(expected_exc):
+            convert_roi.crop_video(os.path.join(self.input_dir, filename),
+                                   os.path.join(self.tmpdir.name, "cropped.mp4"), roi)
+
+    def test_collect_rois_fixed(self):
+        rois = convert_roi.collect_rois(self.input_dir, self.roi_file, fixed_roi=(1, 2, 30, 20))
+
+        expected = {"a.mp4": [1, 2, 30, 20], "b.MOV": [1, 2, 30, 20]}
+        self.assertEqual(rois, expected)
+        with open(self.roi_file) as f:
+            self.assertEqual(json.load(f), expected)
+
+    def test_collect_rois_keeps_known_rois(self):
+        with open(self.roi_file, "w") as f:
+            json.dump({"a.mp4": [0, 0, 10, 10]}, f)
+
+        with patch.object(convert_roi, "select_roi", return_value=(5, 5, 20, 20)) as mock_select:
+            rois = convert_roi.collect_rois(self.input_dir, self.roi_file)
+
+        mock_select.assert_called_once_with(os.path.join(self.input_dir, "b.MOV"))
+        self.assertEqual(rois, {"a.mp4": [0, 0, 10, 10], "b.MOV": [5, 5, 20, 20]})
+
+    def test_convert_all_videos_resumes(self):
+        results = convert_roi.convert_all_videos_in_directory(
+            self.input_dir, self.output_dir, fixed_roi=(0, 0, 32, 24), n_workers=2)
+
+        self.assertEqual(results, {"a.mp4": "converted", "b.MOV": "converted"})
+        for name in ("a_converted.mp4", "b_converted.mp4"):
+            self.assertTrue(os.path.exists(os.path.join(self.output_dir, name)))
+
+        # A second run only converts the video whose ROI changed
+        with open(os.path.join(self.output_dir, "rois.json")) as f:
+            rois = json.load(f)
+        rois["b.MOV"] = [0, 0, 16, 16]
+        with open(os.path.join(self.output_dir, "rois.json"), "w") as f:
+            json.dump(rois, f)
+        results = convert_roi.convert_all_videos_in_directory(self.input_dir, self.output_dir, n_workers=2)
+        self.assertEqual(results, {"a.mp4": "skipped", "b.MOV": "converted"})
+
+    def test_failed_video_does_not_stop_others(self):
+        with open(os.path.join(self.input_dir, "broken.mp4"), "wb") as f:
+            f.write(b"not a video")
+        convert_roi.collect_rois(self.input_dir, self.roi_file, fixed_roi=(0, 0, 32, 24))
+
+        results = convert_roi.convert_videos_with_rois(self.input_dir, self.output_dir, self.roi_file, n_workers=2)
+
+        self.assertTrue(results["broken.mp4"].startswith("failed"))
+        self.assertEqual(results["a.mp4"], "converted")
+        self.assertEqual(results["b.MOV"], "converted")
+        with open(os.path.join(self.output_dir, "conversion_status.json")) as f:
+            status = json.load(f)
+        self.assertTrue(status["broken.mp4"]["status"].startswith("failed"))
+        self.assertEqual(status["a.mp4"]["roi"], [0, 0, 32, 24])
+
+    def test_video_without_roi(self):
+        with open(self.roi_file, "w") as f:
+            json.dump({"a.mp4": [0, 0, 32, 24]}, f)
+
+        results = convert_roi.convert_videos_with_rois(self.input_dir, self.output_dir, self.roi_file, n_workers=1)
+
+        self.assertEqual(results, {"a.mp4": "converted", "b.MOV": "no roi"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,31 @@
 import os
+import tempfile
 import unittest
 import numpy as np
 import pandas as pd
+import cv2
 from src.post_processing.datadlc import DataDLC
 from unittest.mock import patch
 from parameterized import parameterized
 
+SQUARE_PARTS = ("Top_left", "Top_right", "Bottom_right", "Bottom_left")
+MONOFIL_PARTS = ("FR1", "FR2", "FG1", "FG2", "FB1", "FB2")
+
+
+def make_data_dlc(square: np.ndarray, monofil: np.ndarray) -> DataDLC:
+    """Write (n_frames, 4, 2) square and (n_frames, 6, 2) monofilament points to a
+    DLC-style h5 file and load it."""
+    points = np.concatenate([square, monofil], axis=1)
+    values = np.concatenate([points, np.ones(points.shape[:2] + (1,))], axis=2)
+    columns = pd.MultiIndex.from_product(
+        [["scorer"], SQUARE_PARTS + MONOFIL_PARTS, ["x", "y", "likelihood"]],
+        names=["scorer", "bodyparts", "coords"])
+    df = pd.DataFrame(values.reshape(len(points), -1), columns=columns)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        h5_file = os.path.join(tmpdir, "data.h5")
+        df.to_hdf(h5_file, key="df")
+        return DataDLC(h5_file)
+
 
 class TestDataDLC(unittest.TestCase):
     def setUp(self):
@@ -17,6 +37,9 @@ class TestDataDLC(unittest.TestCase):
         self.assertEqual(self.data_dlc.df_square.shape, (3, 8))
         self.assertEqual(self.data_dlc.df_monofil.shape, (3, 12))
         self.assertEqual(self.data_dlc.df_likelihoods.shape, (3, 10))
+        self.assertEqual(self.data_dlc.pose.xy.shape, (3, 10, 2))
+        self.assertEqual(self.data_dlc.square_parts, list(SQUARE_PARTS))
+        self.assertEqual(self.data_dlc.monofil_parts, list(MONOFIL_PARTS))
         self.assertIsNone(self.data_dlc.df_merged)
         self.assertIsNone(self.data_dlc.df_bending_coefficients)
         self.assertIsNone(self.data_dlc.df_transformed_monofil)
@@ -89,23 +112,24 @@ class TestDataDLC(unittest.TestCase):
     # separate methods, one for square and one for filament.
     @parameterized.expand([
         # square
-        ("valid_std_threshold_int_square", 2, None, True, False, None),
-        ("valid_std_threshold_float_square", 2.5, None, True, False, None),
-        ("valid_model_name_square", 2, "RFR", True, False, None),
+        ("valid_std_threshold_int_square", 2, None, True, False),
+        ("valid_std_threshold_float_square", 2.5, None, True, False),
+        ("valid_model_name_square", 2, "RFR", True, False),
         # filament
-        ("valid_std_threshold_int_filament", 2, None, False, True, None),
-        ("valid_std_threshold_float_filament", 2.5, None, False, True, None),
-        ("valid_model_name_filament", 2, "RFR", False, True, None),
+        ("valid_std_threshold_int_filament", 2, None, False, True),
+        ("valid_std_threshold_float_filament", 2.5, None, False, True),
+        ("valid_model_name_filament", 2, "RFR", False, True),
     ])
     def test_impute_outliers_valid_inputs(self,
                                           name,
                                           std_threshold,
                                           model_name,
                                           square,
-                                          filament,
-                                          mock_return):
+                                          filament):
+        # The imputed values are written back into the pose array, so the mock
+        # returns an unchanged copy of its input
         with patch('src.post_processing.outlierimputer.OutlierImputer.impute_outliers',
-                   return_value=mock_return) as mock_imputer:
+                   side_effect=lambda df, *args: df.copy()) as mock_imputer:
             # Fetch df's before the imputation (since it removes outliers)
             # and we want to compare the original df's
             df_square = self.data_dlc.df_square.copy()
@@ -156,6 +180,36 @@ class TestDataDLC(unittest.TestCase):
                                               filament=filament,
                                               model_name=model_name)
 
+    def test_impute_outliers_writes_to_pose(self):
+        df_imputed = self.data_dlc.df_square.copy() + 1
+        with patch('src.post_processing.outlierimputer.OutlierImputer.impute_outliers',
+                   return_value=df_imputed):
+            result = self.data_dlc.impute_outliers(square=True)
+
+        pd.testing.assert_frame_equal(self.data_dlc.df_square, df_imputed)
+        self.assertIs(result, self.data_dlc.df_square)
+        np.testing.assert_array_equal(
+            self.data_dlc.pose.xy[:, :4].reshape(3, 8), df_imputed.values)
+
+    def test_impute_outliers_marks_imputed(self):
+        self.assertFalse(self.data_dlc.imputed.any())
+        # Only the first point of the second frame is replaced
+        df_imputed = self.data_dlc.df_square.copy()
+        df_imputed.iloc[1, 0] += 5
+        with patch('src.post_processing.outlierimputer.OutlierImputer.impute_outliers',
+                   return_value=df_imputed):
+            self.data_dlc.impute_outliers(square=True)
+
+        expected = np.zeros((3, 10), dtype=bool)
+        expected[1, self.data_dlc.pose.index[self.data_dlc.square_parts[0]]] = True
+        np.testing.assert_array_equal(self.data_dlc.imputed, expected)
+
+    def test_impute_outliers_invalid_return(self):
+        with patch('src.post_processing.outlierimputer.OutlierImputer.impute_outliers',
+                   return_value=self.data_dlc.df_square.iloc[:2]):
+            with self.assertRaises(ValueError):
+                self.data_dlc.impute_outliers(square=True)
+
     def test_get_bending_coefficients(self):
         bending_coefficients = self.data_dlc.get_bending_coefficients()
         self.assertIsInstance(bending_coefficients, pd.Series)
@@ -163,6 +217,34 @@ class TestDataDLC(unittest.TestCase):
         self.assertTrue(all(isinstance(coeff, float) for coeff in bending_coefficients))
         self.assertEqual(self.data_dlc.df_bending_coefficients.shape, (3,))
 
+    def test_get_bending_coefficients_matches_polyfit(self):
+        # Replace the (straight) mock filament with bent, noisy points
+        rng = np.random.default_rng(0)
+        x = rng.uniform(0, 1274, (50, 6))
+        y = 0.002 * (x - 600) ** 2 + rng.normal(0, 3, (50, 6))
+        self.data_dlc = make_data_dlc(np.zeros((50, 4, 2)), np.stack([x, y], axis=-1))
+
+        # Reference: the previous frame-by-frame np.polyfit implementation
+        expected = []
+        for _, row in self.data_dlc.df_monofil.iterrows():
+            x_coords = row.filter(like="_x").values.astype(np.float64)
+            y_coords = row.filter(like="_y").values.astype(np.float64)
+            expected.append(abs(np.polyfit(x_coords - np.mean(x_coords),
+                                           y_coords - np.mean(y_coords), 2)[0]))
+
+        bending_coefficients = self.data_dlc.get_bending_coefficients()
+        self.assertEqual(bending_coefficients.name, "Bending_Coefficient")
+        np.testing.assert_allclose(bending_coefficients.values, expected, rtol=1e-9)
+
+    @parameterized.expand([
+        ("wrong_ndim", np.zeros((3, 12))),
+        ("wrong_last_dim", np.zeros((3, 6, 3))),
+        ("not_an_array", [[[0, 0]] * 6]),
+    ])
+    def test_fit_bending_coefficients_invalid_inputs(self, name, points):
+        with self.assertRaises(ValueError):
+            DataDLC._fit_bending_coefficients(points)
+
     @parameterized.expand([
         ("default_dst_points", 0, None, np.eye(3)),  # Default case with no dst_points
         ("custom_dst_points", 0, np.array([[0, 0], [10, 0], [10, 10], [0, 10]], dtype=np.float32), np.eye(3)),  # Custom dst_points
@@ -189,12 +271,53 @@ class TestDataDLC(unittest.TestCase):
             self.data_dlc._get_homography_matrix(index=index, dst_points=dst_points)
 
     def test_apply_homography(self):
-        with patch.object(self.data_dlc, '_get_homography_matrix', return_value=np.eye(3)) as mock_homography:
-            transformed_points = self.data_dlc.apply_homography()
-            self.assertEqual(transformed_points.shape, (3, 12))  # 3 rows, 12 columns (6 points * 2 coordinates)
-            mock_homography.assert_called()
-            self.assertEqual(mock_homography.call_count, 3)
-            self.assertEqual(self.data_dlc.df_transformed_monofil.shape, (3, 12))
+        transformed_points = self.data_dlc.apply_homography()
+        self.assertEqual(transformed_points.shape, (3, 12))  # 3 rows, 12 columns (6 points * 2 coordinates)
+        self.assertEqual(transformed_points.columns[0], "tf_FR1_x")
+        self.assertEqual(transformed_points.columns[-1], "tf_FB2_y")
+        self.assertEqual(self.data_dlc.df_transformed_monofil.shape, (3, 12))
+
+    def test_apply_homography_matches_opencv(self):
+        # Perspective-distorted squares and random filament points
+        rng = np.random.default_rng(1)
+        n_frames = 200
+        corners = np.array([[300, 200], [900, 220], [880, 650], [320, 630]], dtype=float)
+        square = corners + rng.normal(0, 20, (n_frames, 4, 2))
+        monofil = rng.uniform(200, 900, (n_frames, 6, 2))
+        self.data_dlc = make_data_dlc(square, monofil)
+
+        transformed_points = self.data_dlc.apply_homography()
+
+        # Reference: cv2.findHomography + cv2.perspectiveTransform per frame
+        expected = np.array([
+            cv2.perspectiveTransform(monofil[i].astype(np.float32).reshape(-1, 1, 2),
+                                     self.data_dlc._get_homography_matrix(i)).flatten()
+            for i in range(n_frames)
+        ])
+        np.testing.assert_allclose(transformed_points.values, expected, atol=1e-3)
+
+    def test_apply_homography_degenerate_square(self):
+        # A frame with all corners on the same point cannot be solved
+        self.data_dlc.pose.xy[1, self.data_dlc.pose.slots(SQUARE_PARTS)] = 0
+        transformed_points = self.data_dlc.apply_homography()
+        self.assertTrue(transformed_points.iloc[1].isna().all())
+        self.assertFalse(transformed_points.iloc[[0, 2]].isna().any().any())
+
+    def test_get_homography_matrices(self):
+        h_matrices = self.data_dlc._get_homography_matrices()
+        self.assertEqual(h_matrices.shape, (3, 3, 3))
+        for i in range(3):
+            np.testing.assert_allclose(h_matrices[i],
+                                       self.data_dlc._get_homography_matrix(i),
+                                       rtol=1e-5, atol=1e-8)
+
+    @parameterized.expand([
+        ("too_few_points", np.array([[0, 0], [10, 0], [10, 10]], dtype=np.float32)),
+        ("not_an_array", [[0, 0], [10, 0], [10, 10], [0, 10]]),
+    ])
+    def test_get_homography_matrices_invalid_inputs(self, name, dst_points):
+        with self.assertRaises(ValueError):
+            self.data_dlc._get_homography_matrices(dst_points=dst_points)
 
     def test_merge_data(self):
         # Create mock DataFrames
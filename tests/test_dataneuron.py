@@ -49,6 +49,29 @@ class TestDataNeuron(unittest.TestCase):
         expected_iff = [0, 0, 0, 5, 5, 5]
         np.testing.assert_array_almost_equal(self.data_neuron.df["IFF"].values, expected_iff)
 
+    @parameterized.expand([
+        ("sparse_spikes", 1000, 0.01),
+        ("dense_spikes", 1000, 0.5),
+        ("no_spikes", 100, 0.0),
+    ])
+    def test_calculate_iff_matches_loop(self, name, n_samples, spike_prob):
+        rng = np.random.default_rng(0)
+        self.data_neuron.df = pd.DataFrame({
+            "Time": np.arange(n_samples) / 10,
+            "Spikes": (rng.random(n_samples) < spike_prob).astype(int)})
+
+        # Reference: the previous per-spike loop
+        expected = np.full(n_samples, np.nan)
+        spikes_loc = np.flatnonzero(self.data_neuron.df["Spikes"] == 1)
+        for i in range(1, len(spikes_loc)):
+            diff = self.data_neuron.df.loc[spikes_loc[i], "Time"] - \
+                   self.data_neuron.df.loc[spikes_loc[i-1], "Time"]
+            expected[spikes_loc[i]] = 1 / diff
+        expected = pd.Series(expected).ffill().fillna(0).values
+
+        self.data_neuron.calculate_iff()
+        np.testing.assert_allclose(self.data_neuron.df["IFF"].values, expected)
+
     def test_get_frequency(self):
         # Test the frequency calculation
         freq = self.data_neuron._get_frequency()
@@ -90,20 +113,53 @@ class TestDataNeuron(unittest.TestCase):
         with self.assertRaises(expected_exception):
             self.data_neuron.downsample(target_freq=target_freq)
 
-    def test_fill_downsample_length(self):
-        # Downsample the data first
-        self.data_neuron.downsample(target_freq=5)
-        last_iff = self.data_neuron.df["IFF"].iloc[-1]
-        len_df = len(self.data_neuron.downsampled_df)
+    def test_downsample_block_values(self):
+        # Bins [0, 2), [2, 4), [4, 6) of the mock data
+        downsampled_df = self.data_neuron.downsample(target_freq=5)
+        spikes = self.data_neuron.df["Spikes"].values
+        iff = self.data_neuron.df["IFF"].values
+        np.testing.assert_array_equal(downsampled_df["Spikes"].values,
+                                      spikes.reshape(3, 2).sum(axis=1))
+        np.testing.assert_array_equal(downsampled_df["IFF"].values,
+                                      iff.reshape(3, 2).max(axis=1))
+
+    def test_downsample_non_integer_ratio(self):
+        # 1 s at 20 kHz to 30 fps: bins of 666 or 667 samples, no truncation to 666
+        self.data_neuron.original_freq = 20000
+        self.data_neuron.df = pd.DataFrame({"Time": np.arange(20000) / 20000,
+                                            "Spikes": np.ones(20000, dtype=int),
+                                            "IFF": np.arange(20000, dtype=float)})
+        downsampled_df = self.data_neuron.downsample(target_freq=30)
+
+        self.assertEqual(len(downsampled_df), 30)
+        self.assertEqual(downsampled_df["Spikes"].sum(), 20000)
+        self.assertTrue(set(downsampled_df["Spikes"].unique()) <= {666, 667})
+        self.assertEqual(downsampled_df["IFF"].iloc[-1], 19999)
 
-        # Fill the downsampled data to a target length
-        filled_df = self.data_neuron._fill_downsample_length(target_length=10)
+    @parameterized.expand([
+        ("pad_to_frames", 5, 10),
+        ("cut_to_frames", 5, 2),
+        ("same_freq_pad", 10, 8),
+    ])
+    def test_downsample_n_frames(self, name, target_freq, n_frames):
+        full_df = self.data_neuron.downsample(target_freq=target_freq).copy()
+        downsampled_df = self.data_neuron.downsample(target_freq=target_freq,
+                                                     n_frames=n_frames)
+
+        self.assertEqual(len(downsampled_df), n_frames)
+        n_full = min(n_frames, len(full_df))
+        pd.testing.assert_frame_equal(downsampled_df.iloc[:n_full], full_df.iloc[:n_full])
+        # Frames past the end of the recording hold the last IFF and no spikes
+        self.assertTrue(np.all(downsampled_df["IFF"].iloc[n_full:] == full_df["IFF"].iloc[-1]))
+        self.assertTrue(np.all(downsampled_df["Spikes"].iloc[n_full:] == 0))
 
-        # Check the filled DataFrame
-        self.assertEqual(len(filled_df), 10)
-        # Check that the new rows are filled with the last IFF and Spikes as 0
-        self.assertTrue(np.all(filled_df["IFF"].iloc[len_df:] == last_iff))
-        self.assertTrue(np.all(filled_df["Spikes"].iloc[len_df:] == 0))
+    @parameterized.expand([
+        ("zero_n_frames", 0, ValueError),
+        ("float_n_frames", 2.5, TypeError),
+    ])
+    def test_downsample_invalid_n_frames(self, name, n_frames, expected_exception):
+        with self.assertRaises(expected_exception):
+            self.data_neuron.downsample(target_freq=5, n_frames=n_frames)
 
 
 if __name__ == "__main__":
@@ -10,6 +10,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock, ANY
 from ruamel.yaml import YAML,YAMLError
 from src.train_predict import dlc_utils
+from src.train_predict.predictioncache import PredictionCache
 
 class TestDLCUtils(unittest.TestCase):
 ########################################################################
@@ -453,6 +454,59 @@ class TestDLCUtils(unittest.TestCase):
         # Clean up the temporary files after the test
         os.remove(input_video_path)
         os.remove(output_video_path)
+#-----------------------------------------------------------------------
+    @patch("src.train_predict.dlc_utils.cv2.VideoCapture")
+    @patch("src.train_predict.dlc_utils.cv2.VideoWriter")
+    def test_preprocess_video_keeps_frame_order(self,
+                                                MockVideoWriter,
+                                                MockVideoCapture):
+        # Frames with different sizes, each filled with its own index
+        n_frames = 50
+        frames = [np.full((300 + 20 * (i % 3), 200, 3), i, dtype=np.uint8)
+                  for i in range(n_frames)]
+        mock_capture = MagicMock()
+        mock_capture.isOpened.return_value = True
+        mock_capture.read.side_effect = [(True, frame) for frame in frames] + [(False, None)]
+        MockVideoCapture.return_value = mock_capture
+
+        # The canvases are reused, so keep a copy of every written frame
+        written = []
+        MockVideoWriter.return_value.write.side_effect = lambda canvas: written.append(canvas.copy())
+
+        dlc_utils.preprocess_video("input.mp4", "output.mp4", n_threads=4, queue_size=2)
+
+        self.assertEqual(len(written), n_frames)
+        for i, (frame, canvas) in enumerate(zip(frames, written)):
+            expected = np.zeros((720, 1274, 3), dtype=np.uint8)
+            dlc_utils._letterbox_frame(frame, expected)
+            self.assertEqual(canvas.shape, (720, 1274, 3))
+            np.testing.assert_array_equal(canvas, expected)
+            # The frame is centered and the side borders stay black
+            self.assertTrue((canvas[:, 637] == i).all())
+            self.assertTrue((canvas[:, 0] == 0).all())
+        MockVideoWriter.return_value.release.assert_called_once()
+#-----------------------------------------------------------------------
+    @patch("src.train_predict.dlc_utils.cv2.VideoCapture")
+    @patch("src.train_predict.dlc_utils.cv2.VideoWriter")
+    def test_preprocess_video_write_error(self,
+                                          MockVideoWriter,
+                                          MockVideoCapture):
+        mock_capture = MagicMock()
+        mock_capture.isOpened.return_value = True
+        mock_capture.read.side_effect = [(True, np.zeros((100, 100, 3), dtype=np.uint8))] * 20 + \
+                                        [(False, None)]
+        MockVideoCapture.return_value = mock_capture
+        MockVideoWriter.return_value.write.side_effect = IOError("disk full")
+
+        with self.assertRaises(IOError):
+            dlc_utils.preprocess_video("input.mp4", "output.mp4", n_threads=2, queue_size=2)
+        mock_capture.release.assert_called_once()
+        MockVideoWriter.return_value.release.assert_called_once()
+#-----------------------------------------------------------------------
+    def test_preprocess_video_invalid_threads(self):
+        for n_threads in (0, -1, 2.5):
+            with self.assertRaises(ValueError):
+                dlc_utils.preprocess_video("input.mp4", "output.mp4", n_threads=n_threads)
 ########################################################################
     @patch("src.train_predict.dlc_utils.pd.read_csv")
     @patch("src.train_predict.dlc_utils.plt.subplots")
@@ -772,6 +826,7 @@ class TestDLCUtils(unittest.TestCase):
     @patch("src.train_predict.dlc_utils.st.error")
     @patch("src.train_predict.dlc_utils.st.success")
     @patch("src.train_predict.dlc_utils.st.info")
+    @patch("src.train_predict.dlc_utils.ProxyVideo.get")
     @patch("src.train_predict.dlc_utils.PlottingPlotly.generate_labeled_video")
     @patch("src.train_predict.dlc_utils.DataDLC")
     @patch("src.train_predict.dlc_utils.save_h5_to_session")
@@ -782,6 +837,7 @@ class TestDLCUtils(unittest.TestCase):
         MockSaveH5,
         MockDataDLC,
         MockGenerateVideo,
+        MockProxy,
         MockInfo,
         MockSuccess,
         MockError,
@@ -792,6 +848,7 @@ class TestDLCUtils(unittest.TestCase):
         MockSaveH5.return_value = "mock_h5_path"
         MockDataDLC.return_value = MagicMock()
         MockGenerateVideo.return_value = "mock_video"
+        MockProxy.return_value = "mock_proxy"
         MockVideo.return_value = None
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -816,11 +873,15 @@ class TestDLCUtils(unittest.TestCase):
             MockDataDLC.assert_called_once_with(h5_file="mock_h5_path")
 
             # Verify generate_labeled_video was called with correct arguments
+            labeled_path = os.path.join(videos_dir, "video_labeled.mp4")
             MockGenerateVideo.assert_called_once_with(MockDataDLC.return_value,
-                                                      video_path)
+                                                      video_path,
+                                                      output="path",
+                                                      output_path=labeled_path)
 
-            # Verify Streamlit's video function was called
-            MockVideo.assert_called_once_with("mock_video")
+            # Verify Streamlit's video function was called with the proxy
+            MockProxy.assert_called_once_with(labeled_path)
+            MockVideo.assert_called_once_with("mock_proxy")
 
             # Verify the appropriate Streamlit success messages were shown
             MockSuccess.assert_any_call("🎉 New predictions generated!")
@@ -866,6 +927,69 @@ class TestDLCUtils(unittest.TestCase):
 
             # Verify that the error message is displayed for saving H5 failure
             MockError.assert_any_call("❌ Could not complete prediction or labeling: Saving H5 failed")
+#-----------------------------------------------------------------------
+    @patch("src.train_predict.dlc_utils.preprocess_video")
+    def test_preprocess_video_cached(self, MockPreprocess):
+        def fake_preprocess(input_path, output_path):
+            with open(output_path, "wb") as f:
+                f.write(b"processed")
+            return output_path
+        MockPreprocess.side_effect = fake_preprocess
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = PredictionCache(os.path.join(temp_dir, "cache"))
+            input_path = os.path.join(temp_dir, "upload.mov")
+            with open(input_path, "wb") as f:
+                f.write(b"video bytes")
+
+            first = os.path.join(temp_dir, "processed_a.mp4")
+            second = os.path.join(temp_dir, "processed_b.mp4")
+            dlc_utils.preprocess_video_cached(input_path, first, cache)
+            # The same content under another name is not processed again
+            dlc_utils.preprocess_video_cached(input_path, second, cache)
+
+            MockPreprocess.assert_called_once_with(input_path, first)
+            with open(second, "rb") as f:
+                self.assertEqual(f.read(), b"processed")
+#-----------------------------------------------------------------------
+    @patch("src.train_predict.dlc_utils.deeplabcut.analyze_videos")
+    def test_analyze_video_cached(self, MockAnalyze):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.yaml")
+            with open(config_path, "w") as f:
+                f.write("bodyparts: [a]\n")
+            videos_dir = os.path.join(temp_dir, "videos")
+            os.makedirs(videos_dir)
+            video_path = os.path.join(videos_dir, "processed_a.mp4")
+            with open(video_path, "wb") as f:
+                f.write(b"video bytes")
+            h5_name = "processed_aDLC_Resnet50_shuffle1_snapshot_075.h5"
+
+            def fake_analyze(config, videos, shuffle):
+                with open(os.path.join(videos_dir, h5_name), "wb") as f:
+                    f.write(b"predictions")
+            MockAnalyze.side_effect = fake_analyze
+            cache = PredictionCache(os.path.join(temp_dir, "prediction-cache"))
+            # Predictions of another model, not written by the analysis
+            other_name = "processed_aDLC_Resnet50_shuffle2_snapshot_050.h5"
+            with open(os.path.join(videos_dir, other_name), "wb") as f:
+                f.write(b"other predictions")
+
+            self.assertFalse(dlc_utils.analyze_video_cached(config_path, video_path, cache))
+            # delete_prev_pred removes the outputs, the cache restores them
+            os.remove(os.path.join(videos_dir, h5_name))
+            os.remove(os.path.join(videos_dir, other_name))
+            self.assertTrue(dlc_utils.analyze_video_cached(config_path, video_path, cache))
+            MockAnalyze.assert_called_once()
+            with open(os.path.join(videos_dir, h5_name), "rb") as f:
+                self.assertEqual(f.read(), b"predictions")
+            self.assertFalse(os.path.exists(os.path.join(videos_dir, other_name)))
+
+            # A changed config gives new predictions
+            with open(config_path, "w") as f:
+                f.write("bodyparts: [a, b]\n")
+            self.assertFalse(dlc_utils.analyze_video_cached(config_path, video_path, cache))
+            self.assertEqual(MockAnalyze.call_count, 2)
 ########################################################################
 if __name__ == '__main__':
     unittest.main()
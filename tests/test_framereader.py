@@ -0,0 +1,125 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from src.post_processing.framereader import FrameReader
+from src.post_processing.videoencoder import VideoEncoder
+from parameterized import parameterized
+
+N_FRAMES = 60
+
+
+class TestFrameReader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Every frame is a flat gray level that encodes its index
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.video_path = os.path.join(cls.tmpdir.name, "video.mp4")
+        with VideoEncoder(fps=30, output_path=cls.video_path, crf=10) as encoder:
+            for i in range(N_FRAMES):
+                encoder.write(np.full((48, 64, 3), 4 * i, dtype=np.uint8))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def setUp(self):
+        self.reader = FrameReader(self.video_path)
+
+    def tearDown(self):
+        self.reader.close()
+
+    def assertFrame(self, frame, index):
+        self.assertEqual(frame.shape, (48, 64, 3))
+        self.assertAlmostEqual(frame.mean(), 4 * index, delta=2)
+
+    def test_index(self):
+        self.assertEqual(len(self.reader), N_FRAMES)
+        self.assertEqual(self.reader.keyframes[0], 0)
+        np.testing.assert_allclose(self.reader.timestamps, np.arange(N_FRAMES) / 30, atol=1e-3)
+
+    def test_single_read_is_not_indexed(self):
+        with patch.object(FrameReader, "_list_packets", wraps=FrameReader._list_packets) as mock_list:
+            self.assertEqual(self.reader.header_frame_count(), N_FRAMES)
+            self.assertFrame(self.reader.read(N_FRAMES // 2), N_FRAMES // 2)
+            mock_list.assert_not_called()
+            # Random access from the second frame on uses the index
+            self.assertFrame(self.reader.read(5), 5)
+            mock_list.assert_called_once()
+        self.assertEqual(self.reader.frame_count, N_FRAMES)
+
+    @parameterized.expand([
+        ("forward", list(range(10, 20))),
+        ("backward", list(range(50, 30, -1))),
+        ("random", [42, 3, 59, 0, 17, 17, 58, 1]),
+    ])
+    def test_read(self, name, indices):
+        for index in indices:
+            frame = self.reader.read(index)
+            self.assertFrame(frame, index)
+            self.assertFalse(frame.flags.writeable)
+
+    def test_read_uses_cache(self):
+        first = self.reader.read(25)
+        with patch.object(FrameReader, "_decode", autospec=True) as mock_decode:
+            self.assertIs(self.reader.read(25), first)
+            mock_decode.assert_not_called()
+
+    def test_backward_steps_are_cached(self):
+        self.reader.read(40)
+        self.reader.read(39)
+        # The frames before 39 were decoded on the way
+        with patch.object(FrameReader, "_decode", autospec=True) as mock_decode:
+            for index in range(38, 30, -1):
+                self.assertFrame(self.reader.read(index), index)
+            mock_decode.assert_not_called()
+
+    def test_cache_is_bounded(self):
+        frame_bytes = 48 * 64 * 3
+        reader = FrameReader(self.video_path, cache_bytes=5 * frame_bytes)
+        for index in range(20):
+            reader.read(index)
+        self.assertLessEqual(reader._cached_bytes, 5 * frame_bytes)
+        self.assertEqual(list(reader._cache), list(range(15, 20)))
+        reader.close()
+
+    @parameterized.expand([
+        ("negative", -1, ValueError),
+        ("past_end", N_FRAMES, ValueError),
+        ("float", 1.0, TypeError),
+        ("bool", True, TypeError),
+    ])
+    def test_read_invalid(self, name, index, expected_exc):
+        with self.assertRaises(expected_exc):
+            self.reader.read(index)
+
+    def test_unindexed_video_falls_back_to_seeking(self):
+        with patch.object(FrameReader, "_list_packets", side_effect=RuntimeError("no ffmpeg")):
+            reader = FrameReader(self.video_path)
+            for index in (30, 5, 6):
+                self.assertFrame(reader.read(index), index)
+        self.assertIsNone(reader.keyframes)
+        reader.close()
+
+    def test_shared(self):
+        reader = FrameReader.shared(self.video_path)
+        self.assertIs(FrameReader.shared(self.video_path), reader)
+        # A missing file gets a new, unshared reader
+        missing = os.path.join(self.tmpdir.name, "missing.mp4")
+        self.assertIsNot(FrameReader.shared(missing), FrameReader.shared(missing))
+        with self.assertRaises(ValueError):
+            FrameReader.shared(missing).read(0)
+
+    @parameterized.expand([
+        ("path", 1, 10, TypeError),
+        ("cache_type", "video.mp4", 1.5, TypeError),
+        ("cache_negative", "video.mp4", -1, ValueError),
+    ])
+    def test_init_invalid(self, name, video_path, cache_bytes, expected_exc):
+        with self.assertRaises(expected_exc):
+            FrameReader(video_path, cache_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import unittest
+from scipy.signal import correlate
 import pandas as pd
 import numpy as np
 from unittest.mock import MagicMock, patch
@@ -169,5 +170,126 @@ class TestMergedData(unittest.TestCase):
             self.merged_data._save_data(df, path, file_format)
 
 
+class TestMergedDataAlignment(unittest.TestCase):
+    def test_recording_longer_than_video(self):
+        # The recording started 3 frames before the video and ended after it
+        dlc = MagicMock(spec=DataDLC)
+        dlc._merge_data.return_value = pd.DataFrame({
+            'Bending_Coefficient': [0.0, 1.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0]})
+        neuron = DataNeuron("tests/mock_neuron_data.csv", original_freq=10)
+        neuron.downsampled_df = pd.DataFrame({
+            'Spikes': [0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0],
+            'IFF': np.arange(12, dtype=float)})
+
+        merged = MergedData(dlc=dlc, neuron=neuron, max_gap_fill=1, threshold=0.1)
+        self.assertEqual(merged.best_shift, -3)
+        # One row per frame, the last frames hold the recorded data
+        self.assertEqual(len(merged.df_merged), 8)
+        np.testing.assert_array_equal(merged.df_merged['IFF'], np.arange(3, 11))
+        np.testing.assert_array_equal(merged.df_merged['Spikes'], [0, 1, 0, 0, 1, 0, 0, 0])
+
+
+class TestFillGaps(unittest.TestCase):
+    @parameterized.expand([
+        ("short_gaps", [1, 0, 0, 1, 0, 1], 2, [1, 1, 1, 1, 1, 1]),
+        ("long_gap", [1, 0, 0, 0, 1], 2, [1, 0, 0, 0, 1]),
+        ("leading_and_trailing_zeros", [0, 1, 0, 1, 0], 2, [1, 1, 1, 1, 0]),
+        ("short_leading_gap", [0, 0, 1, 0, 0, 0, 1], 2, [1, 1, 1, 0, 0, 0, 1]),
+        ("long_leading_gap", [0, 0, 0, 1, 0, 1], 2, [0, 0, 0, 1, 1, 1]),
+        ("spike_counts_in_gap", [1, 0, 2, 0, 1], 3, [1, 1, 1, 1, 1]),
+        ("spike_counts_not_events", [2, 0, 3, 0, 0, 0, 1], 1, [2, 0, 3, 0, 0, 0, 1]),
+        ("only_spike_counts", [0, 2, 0], 2, [0, 2, 0]),
+        ("adjacent_spikes", [1, 1, 0, 1], 0, [1, 1, 0, 1]),
+        ("no_spikes", [0, 0, 0], 2, [0, 0, 0]),
+        ("empty", [], 2, []),
+    ])
+    def test_fill_gaps(self, name, events, max_gap, expected):
+        filled = MergedData.fill_gaps(np.array(events, dtype=int), max_gap)
+        np.testing.assert_array_equal(filled, expected)
+
+    def test_fill_gaps_matches_loop(self):
+        rng = np.random.default_rng(0)
+        events = rng.choice([0, 1, 2], size=10000, p=[0.75, 0.2, 0.05])
+        events[:3] = 0  # a short leading gap
+
+        # Reference: the previous element-by-element loop
+        expected = events.copy()
+        gap_start = None
+        for i in range(len(events)):
+            if events[i] == 1:
+                if gap_start is not None and (i - gap_start) <= 5:
+                    expected[gap_start:i] = 1
+                gap_start = i + 1
+            elif events[i] == 0 and gap_start is None:
+                gap_start = i
+
+        np.testing.assert_array_equal(MergedData.fill_gaps(events, 5), expected)
+
+    @parameterized.expand([
+        ("negative_max_gap", [1, 0, 1], -1, ValueError),
+        ("float_max_gap", [1, 0, 1], 1.5, TypeError),
+        ("2d_events", [[1, 0, 1]], 1, ValueError),
+    ])
+    def test_fill_gaps_invalid_inputs(self, name, events, max_gap, expected_exception):
+        with self.assertRaises(expected_exception):
+            MergedData.fill_gaps(np.array(events), max_gap)
+
+
+class TestAlignSequences(unittest.TestCase):
+    @parameterized.expand([
+        ("binary", 0.1, 0.1),
+        ("dense", 0.5, 0.5),
+        ("counts", 0.3, None),
+    ])
+    def test_align_sequences_matches_correlate(self, name, p_reference, p_signal):
+        rng = np.random.default_rng(0)
+        for n_reference, n_signal in ((300, 200), (200, 300), (1, 50)):
+            reference = (rng.random(n_reference) < p_reference).astype(int)
+            signal = (rng.random(n_signal) < p_signal).astype(int) if p_signal \
+                else rng.poisson(1, n_signal).astype(float)
+
+            # Reference: the previous full direct correlation
+            correlation = correlate(reference, signal, mode='full', method='direct')
+            expected_shift = correlation.argmax() - (len(signal) - 1)
+
+            best_shift, peak, runner_up = MergedData.align_sequences(reference, signal)
+            self.assertEqual(best_shift, expected_shift)
+            self.assertEqual(peak, correlation.max())
+            self.assertTrue(np.isnan(runner_up) or runner_up <= peak)
+
+    def test_align_sequences_max_lag(self):
+        rng = np.random.default_rng(1)
+        signal = (rng.random(1000) < 0.05).astype(int)
+        reference = np.roll(signal, 7)
+        reference[:7] = 0
+
+        self.assertEqual(MergedData.align_sequences(reference, signal)[0], 7)
+        self.assertEqual(MergedData.align_sequences(reference, signal, max_lag=10)[0], 7)
+        # The true shift is outside the window
+        self.assertLessEqual(abs(MergedData.align_sequences(reference, signal, max_lag=3)[0]), 3)
+
+    def test_align_sequences_runner_up(self):
+        # Two clear matches, at shifts 2 and 10, the first one stronger
+        signal = np.array([1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+        reference = np.zeros(20, dtype=int)
+        reference[2:5] = 1
+        reference[10:12] = 1
+
+        best_shift, peak, runner_up = MergedData.align_sequences(reference, signal)
+        self.assertEqual(best_shift, 2)
+        self.assertEqual(peak, 3)
+        self.assertEqual(runner_up, 2)
+
+    @parameterized.expand([
+        ("empty_signal", [1, 0], [], None, ValueError),
+        ("2d_reference", [[1, 0]], [1, 0], None, ValueError),
+        ("negative_max_lag", [1, 0], [1, 0], -1, ValueError),
+        ("float_max_lag", [1, 0], [1, 0], 1.5, TypeError),
+    ])
+    def test_align_sequences_invalid_inputs(self, name, reference, signal, max_lag,
+                                            expected_exception):
+        with self.assertRaises(expected_exception):
+            MergedData.align_sequences(np.array(reference), np.array(signal), max_lag)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,10 +1,20 @@
 import unittest
+import itertools
+import os
+import time
+import warnings
+import shutil
+import tempfile
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 import numpy as np
 import json
 from unittest.mock import patch, MagicMock
 from src.post_processing.outlierimputer import OutlierImputer
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import BayesianRidge
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.model_selection import cross_validate
 from parameterized import parameterized
 
 
@@ -24,25 +34,62 @@ class TestOutlierImputer(unittest.TestCase):
     def tearDown(self):
         # Clean up the log file
         try:
-            import os
             os.remove("test_log.json")
         except FileNotFoundError:
             pass
+        shutil.rmtree("test_log_models", ignore_errors=True)
 
     def test_init(self):
         # Test default initialization
         self.assertEqual(self.imputer.log_file, "test_log.json")
         self.assertEqual(self.imputer.best_models, {})
+        self.assertEqual(self.imputer.n_jobs, -1)
 
     @parameterized.expand([
         ("invalid_log_file_type", 123, TypeError),  # Non-string log_file
         ("invalid_log_file_extension", "test_log.txt", ValueError),  # Non-JSON file extension
         ("empty_log_file", "", ValueError),  # Empty string for log_file
         ("none_log_file", None, TypeError),  # None as log_file
+        ("zero_n_jobs", "test_log.json", ValueError, 0),
+        ("negative_n_jobs", "test_log.json", ValueError, -2),
+        ("float_n_jobs", "test_log.json", TypeError, 2.0),
+        ("reuse_type", "test_log.json", TypeError, -1, {"reuse": "yes"}),
+        ("negative_max_age", "test_log.json", ValueError, -1, {"max_age": -1}),
+        ("zero_drift_threshold", "test_log.json", ValueError, -1, {"drift_threshold": 0}),
+        ("invalid_search", "test_log.json", ValueError, -1, {"search": "random"}),
+        ("negative_time_budget", "test_log.json", ValueError, -1, {"time_budget": -1}),
+        ("time_budget_type", "test_log.json", TypeError, -1, {"time_budget": "10s"}),
+        ("zero_max_gap", "test_log.json", ValueError, -1, {"max_gap": 0}),
+        ("invalid_fallback_model", "test_log.json", ValueError, -1, {"fallback_model": "Kalman"}),
+        ("negative_window", "test_log.json", ValueError, -1, {"window": -1}),
+        ("zero_max_train_rows", "test_log.json", ValueError, -1, {"max_train_rows": 0}),
     ])
-    def test_init_invalid(self, name, log_file, expected_exception):
+    def test_init_invalid(self, name, log_file, expected_exception, n_jobs=-1, kwargs=None):
         with self.assertRaises(expected_exception):
-            OutlierImputer(log_file=log_file)
+            OutlierImputer(log_file=log_file, n_jobs=n_jobs, **(kwargs or {}))
+
+    @parameterized.expand([
+        ("more_tasks_than_jobs", 4, 84, (4, 1)),
+        ("fewer_tasks_than_jobs", 8, 3, (3, 2)),
+        ("single_job", 1, 84, (1, 1)),
+        ("no_tasks", 4, 0, (1, 4)),
+    ])
+    def test_worker_counts(self, name, n_jobs, n_tasks, expected):
+        self.assertEqual(OutlierImputer._worker_counts(n_jobs, n_tasks), expected)
+
+    def test__grid_search_models_per_col_parallel_matches_serial(self):
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 10, 60)
+        df = pd.DataFrame({"x1": np.sin(t), "y1": np.cos(t),
+                           "x2": t + rng.normal(0, 0.1, 60), "y2": 2 * t})
+        df.iloc[[5, 20, 41], [0, 3]] = np.nan
+
+        selections = []
+        for n_jobs in (1, 2):
+            imputer = OutlierImputer(log_file="test_log.json", n_jobs=n_jobs)
+            imputer._grid_search_models_per_col(df, model_name="KNR")
+            selections.append({col: model.get_params() for col, model in imputer.best_models.items()})
+        self.assertEqual(selections[0], selections[1])
 
     def test_transform_to_derivative(self):
         # Test the transform_to_derivative method
@@ -92,6 +139,8 @@ class TestOutlierImputer(unittest.TestCase):
         mock_model = MagicMock()
         mock_grid_instance.best_estimator_ = mock_model
         mock_grid_search.return_value = mock_grid_instance
+        # The patched GridSearchCV only exists in this process
+        self.imputer.n_jobs = 1
 
         # Remove outliers (optional if you want to keep the flow consistent)
         df_clean = self.imputer.detect_outliers_velocity(self.mock_df, threshold=2.0)
@@ -111,6 +160,7 @@ class TestOutlierImputer(unittest.TestCase):
         mock_model.fit.return_value = None
         mock_model.best_score_ = -5
         mock_model.best_estimator_ = "MockedBestModel"
+        self.imputer.n_jobs = 1
 
         # Valid model names
         valid_models = [
@@ -151,16 +201,52 @@ class TestOutlierImputer(unittest.TestCase):
         mock_iter_imputer.assert_called_once()
         mock_instance.fit_transform.assert_called_once()
 
+    def test_iterative_imputation_per_column_models(self):
+        t = np.arange(200, dtype=float)
+        df = pd.DataFrame({"x1": np.sin(t / 10), "y1": 2 * np.sin(t / 10) + 1, "x2": t, "y2": t % 7})
+        truth = df.copy()
+        df.iloc[[20, 80, 150], 1] = np.nan
+        df.iloc[[30, 90], 3] = np.nan
+        self.imputer.best_models = {"x1": None, "y1": BayesianRidge(), "x2": None,
+                                    "y2": KNeighborsRegressor(n_neighbors=1)}
+
+        with patch("src.post_processing.outlierimputer.IterativeImputer") as mock_iter_imputer:
+            result = self.imputer.iterative_imputation(df, tol=1e-6)
+        mock_iter_imputer.assert_not_called()
+
+        # The linear column is recovered by its BayesianRidge, the other one copies its nearest neighbour
+        np.testing.assert_allclose(result["y1"], truth["y1"], atol=1e-3)
+        self.assertTrue(result.iloc[[30, 90], 3].isin(range(7)).all())
+        rounds = self.imputer.imputation_rounds
+        self.assertGreaterEqual(len(rounds), 1)
+        self.assertEqual([r["iteration"] for r in rounds], list(range(1, len(rounds) + 1)))
+        self.assertLess(rounds[-1]["change"], 1e-6)
+
+    @parameterized.expand([
+        ("max_iter", {"max_iter": 1}, 1),
+        ("tol", {"tol": 10.0}, 1),
+    ])
+    def test_iterative_imputation_stops_early(self, name, kwargs, expected_rounds):
+        df = self.mock_df.astype(float)
+        df.iloc[2, 0] = np.nan
+        self.imputer.best_models = {"x1": RandomForestRegressor(n_estimators=5, random_state=0)}
+        self.imputer.iterative_imputation(df, **kwargs)
+        self.assertEqual(len(self.imputer.imputation_rounds), expected_rounds)
+
     @parameterized.expand([
         ("non_dataframe_input", [1, 2, 3], TypeError),
         ("empty_dataframe", pd.DataFrame(), ValueError),
         ("non_numeric_dataframe", pd.DataFrame({"x1": ["a", "b", "c"], "y1": ["d", "e", "f"]}), ValueError),
         ("negative_max_iter", pd.DataFrame({"x1": [1, 2], "x2": [3, 4]}), ValueError, -10),
         ("non_integer_max_iter", pd.DataFrame({"x1": [1, 2], "x2": [3, 4]}), TypeError, "ten"),
+        ("zero_tol", pd.DataFrame({"x1": [1, 2], "x2": [3, 4]}), ValueError, 10, {"tol": 0}),
+        ("non_integer_n_iter_no_change", pd.DataFrame({"x1": [1, 2], "x2": [3, 4]}), TypeError, 10,
+         {"n_iter_no_change": 2.5}),
     ])
-    def test_iterative_imputation_invalid_inputs(self, name, df_input, expected_exception, max_iter=10):
+    def test_iterative_imputation_invalid_inputs(self, name, df_input, expected_exception, max_iter=10,
+                                                 kwargs=None):
         with self.assertRaises(expected_exception):
-            self.imputer.iterative_imputation(df_input, max_iter=max_iter)
+            self.imputer.iterative_imputation(df_input, max_iter=max_iter, **(kwargs or {}))
 
     @patch("src.post_processing.outlierimputer.OutlierImputer._grid_search_models_per_col")
     @patch("src.post_processing.outlierimputer.OutlierImputer.iterative_imputation")
@@ -191,6 +277,331 @@ class TestOutlierImputer(unittest.TestCase):
         self.assertIn("x1", log_data)
         self.assertIn("x2", log_data)
 
+
+
+class TestOutlierImputerHalvingSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 20, 400)
+        self.df = pd.DataFrame({"x1": np.sin(t), "y1": np.cos(t),
+                                "x2": np.sin(t) + rng.normal(0, 0.05, 400), "y2": 2 * t})
+        self.df.iloc[[10, 200], 2] = np.nan
+        self.models = [("BR", OutlierImputer.models["BR"], OutlierImputer.param_grids["BR"]),
+                       ("KNR", OutlierImputer.models["KNR"], OutlierImputer.param_grids["KNR"])]
+
+    def test_halving_search_races_candidates(self):
+        X, y = self.df.dropna().drop(columns=["x2"]), self.df.dropna()["x2"]
+        mse, estimator, report = OutlierImputer._halving_search(self.models, X, y, None, 1)
+
+        # 15 candidates: 15 on 50 frames, then 5 on 150 and 2 on all 398
+        self.assertTrue(report["completed"])
+        self.assertEqual((report["rounds"], report["fits"], report["frames"]), (3, 22, 398))
+        # x2 is x1 plus noise, so the linear model wins
+        self.assertEqual(report["model"], "BR")
+        self.assertEqual(estimator.n_features_in_, 3)
+        self.assertLess(mse, 0.01)
+
+    def test_halving_search_stops_at_budget(self):
+        X, y = self.df.dropna().drop(columns=["x2"]), self.df.dropna()["x2"]
+        with patch("src.post_processing.outlierimputer.time.perf_counter",
+                   side_effect=itertools.chain([0.0], itertools.repeat(100.0))):
+            mse, estimator, report = OutlierImputer._halving_search(self.models, X, y, 1.0, 1)
+        # Only the first candidate is evaluated, and refitted on the frames of one fold
+        self.assertFalse(report["completed"])
+        self.assertEqual((report["rounds"], report["fits"]), (1, 1))
+        self.assertEqual(report["model"], "BR")
+        self.assertEqual(report["refit_frames"], 33)
+        self.assertTrue(hasattr(estimator, "coef_"))
+
+    def test_halving_search_budget_covers_refit(self):
+        X, y = self.df.dropna().drop(columns=["x2"]), self.df.dropna()["x2"]
+
+        def slow_fits(*args, **kwargs):
+            cv_results = cross_validate(*args, **kwargs)
+            cv_results["fit_time"] = np.full(3, 1.0)
+            return cv_results
+
+        with patch("src.post_processing.outlierimputer.time.perf_counter", return_value=0.0), \
+                patch("src.post_processing.outlierimputer.cross_validate", side_effect=slow_fits):
+            _, _, report = OutlierImputer._halving_search(self.models, X, y, 2.0, 1)
+        # The first candidate of each model is evaluated, another cross-validation would take
+        # 3 s. A fit on 33 frames takes 1 s, so the refit is cut to the 66 frames that fit in
+        # the 2 s left
+        self.assertFalse(report["completed"])
+        self.assertEqual(report["fits"], 2)
+        self.assertEqual(report["refit_frames"], 66)
+
+    def test_halving_search_realistic_budget(self):
+        rng = np.random.default_rng(0)
+        t = np.linspace(0, 600, 20000)
+        X = pd.DataFrame({"x1": np.sin(t), "y1": np.cos(1.3 * t), "x2": t / 50 + rng.normal(0, 0.1, 20000)})
+        y = pd.Series(np.sin(t) + 0.3 * np.cos(1.3 * t) + rng.normal(0, 0.05, 20000))
+        # The most expensive model first, the search still starts with the cheap ones
+        models = [(name, OutlierImputer.models[name], OutlierImputer.param_grids[name])
+                  for name in ["RFR", "SVR", "HGBR", "KNR", "BR"]]
+        start = time.perf_counter()
+        _, estimator, report = OutlierImputer._halving_search(models, X, y, 3.0, 1)
+        self.assertLess(time.perf_counter() - start, 4.5)
+        self.assertEqual(report["models_tried"][:2], ["BR", "KNR"])
+        self.assertGreater(len(report["models_tried"]), 1)
+        self.assertGreater(report["refit_frames"], 0)
+
+    def test_grid_search_models_per_col_halving(self):
+        imputer = OutlierImputer(log_file="test_log.json", n_jobs=1, search="halving", time_budget=60)
+        with patch("src.post_processing.outlierimputer.GridSearchCV") as mock_grid_search:
+            imputer._grid_search_models_per_col(self.df, model_name="KNR")
+        mock_grid_search.assert_not_called()
+        self.assertEqual(set(imputer.search_reports), {"x1", "y1", "x2", "y2"})
+        self.assertTrue(all(report["model"] == "KNR" for report in imputer.search_reports.values()))
+        self.assertEqual(set(imputer.best_scores), {"x1", "y1", "x2", "y2"})
+
+    def test_selection_summary(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_file = os.path.join(tmpdir, "latest_filament.json")
+            imputer = OutlierImputer(log_file=log_file, n_jobs=1, search="halving")
+            imputer._grid_search_models_per_col(self.df, model_name="BR")
+            imputer.save_selection(self.df)
+            summary = OutlierImputer.selection_summary(log_file)
+            self.assertEqual(list(summary.index), ["x1", "y1", "x2", "y2"])
+            self.assertTrue((summary["search"] == "halving").all())
+            self.assertTrue((summary["model"] == "BR").all())
+            self.assertTrue(OutlierImputer.selection_summary(os.path.join(tmpdir, "missing.json")).empty)
+
+
+class TestOutlierImputerTemporal(unittest.TestCase):
+    def setUp(self):
+        t = np.arange(300, dtype=float)
+        self.truth = pd.DataFrame({"x1": 100 * np.sin(t / 20), "y1": 50 * np.cos(t / 30) + 0.5 * t,
+                                   "x2": 3 * t, "y2": np.full(300, 7.0)})
+        self.df = self.truth.copy()
+        self.df.iloc[40:43, 0] = np.nan     # Short gap
+        self.df.iloc[100:104, 1] = np.nan   # Short gap
+        self.df.iloc[150:170, 2] = np.nan   # Long gap
+        self.df.iloc[0:2, 3] = np.nan       # Leading gap
+        self.imputer = OutlierImputer(log_file="test_log.json", n_jobs=1, max_gap=5)
+
+    def tearDown(self):
+        if os.path.exists("test_log.json"):
+            os.remove("test_log.json")
+        shutil.rmtree("test_log_models", ignore_errors=True)
+
+    def test_short_gaps(self):
+        starts, ends, columns = OutlierImputer._short_gaps(self.df.isna().to_numpy(), 5)
+        np.testing.assert_array_equal(starts, [40, 100])
+        np.testing.assert_array_equal(ends, [43, 104])
+        np.testing.assert_array_equal(columns, [0, 1])
+
+    @parameterized.expand([
+        ("kalman", "Kalman"),
+        ("cubic", "Cubic"),
+    ])
+    def test_temporal_imputation_fills_short_gaps(self, name, method):
+        result = self.imputer.temporal_imputation(self.df, method=method)
+
+        np.testing.assert_allclose(result.iloc[40:43, 0], self.truth.iloc[40:43, 0], atol=0.5)
+        np.testing.assert_allclose(result.iloc[100:104, 1], self.truth.iloc[100:104, 1], atol=0.5)
+        # Long and leading gaps are left to the models, known values are unchanged
+        self.assertTrue(result.iloc[150:170, 2].isna().all())
+        self.assertTrue(result.iloc[0:2, 3].isna().all())
+        pd.testing.assert_frame_equal(result[self.df.notna()], self.df)
+        self.assertEqual({column: fill["filled"] for column, fill in self.imputer.temporal_fills.items()},
+                         {"x1": 3, "y1": 4, "x2": 0, "y2": 0})
+
+    def test_kalman_follows_noisy_trajectory(self):
+        rng = np.random.default_rng(0)
+        noisy = self.truth + rng.normal(0, 1.0, self.truth.shape)
+        noisy.iloc[40:43, 0] = np.nan
+        q, r = OutlierImputer._kalman_noise(noisy.to_numpy())
+        # The measurement noise of the straight lines is found from their second differences
+        np.testing.assert_allclose(r[2:], 1.0, rtol=0.3)
+
+        result = self.imputer.temporal_imputation(noisy, method="Kalman")
+        self.assertLess(np.abs(result.iloc[40:43, 0] - self.truth.iloc[40:43, 0]).max(), 3.0)
+
+    @parameterized.expand([
+        ("constant", np.full(60, 5.0)),
+        ("linear", np.arange(60) * 2.0 + 1.0),
+        ("zero", np.zeros(60)),
+    ])
+    def test_kalman_noiseless_column(self, name, column):
+        # A gap at frame 1 is smoothed back from the start of the window
+        df = pd.DataFrame({"x1": column})
+        df.iloc[1:3, 0] = np.nan
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", RuntimeWarning)
+            result = self.imputer.temporal_imputation(df, method="Kalman")
+        np.testing.assert_allclose(result["x1"], column, atol=1e-3)
+        self.assertEqual(self.imputer.temporal_fills["x1"]["filled"], 2)
+
+    def test_impute_outliers_temporal_skips_models(self):
+        df = self.df.copy()
+        df.iloc[150:170, 2] = self.truth.iloc[150:170, 2]
+        df.iloc[0:2, 3] = 7.0
+        with patch.object(OutlierImputer, "_grid_search_models_per_col") as mock_grid_search:
+            result = self.imputer.impute_outliers(df, std_threshold=100.0, model_name="Kalman")
+        mock_grid_search.assert_not_called()
+        self.assertFalse(result.isna().any().any())
+        with open("test_log.json", "r") as f:
+            log = json.load(f)
+        self.assertEqual(log["x1"]["temporal"]["method"], "Kalman")
+
+    def test_impute_outliers_temporal_falls_back_for_long_gaps(self):
+        self.imputer.fallback_model = "BR"
+        with patch.object(OutlierImputer, "temporal_imputation",
+                          wraps=self.imputer.temporal_imputation) as mock_temporal:
+            result = self.imputer.impute_outliers(self.df, std_threshold=100.0, model_name="Cubic")
+        mock_temporal.assert_called_once()
+        self.assertFalse(result.isna().any().any())
+        self.assertEqual(type(self.imputer.best_models["x2"]).__name__, "BayesianRidge")
+
+    def test_temporal_imputation_invalid_method(self):
+        with self.assertRaises(ValueError):
+            self.imputer.temporal_imputation(self.df, method="Linear")
+
+
+class TestOutlierImputerLocal(unittest.TestCase):
+    def tearDown(self):
+        if os.path.exists("test_log.json"):
+            os.remove("test_log.json")
+        shutil.rmtree("test_log_models", ignore_errors=True)
+
+    @parameterized.expand([
+        # Rows 3..7 around the missing row 5, and 2 of the 5 other complete rows
+        ("window_and_sample", 2, 6, [0, 3, 4, 5, 6, 7, 9]),
+        # The window already holds enough complete rows
+        ("window_only", 2, 4, [3, 4, 5, 6, 7]),
+        ("no_window", 0, 3, [0, 4, 5, 9]),
+    ])
+    def test_local_rows(self, name, window, max_train_rows, expected):
+        missing_rows = np.zeros(10, dtype=bool)
+        missing_rows[5] = True
+        np.testing.assert_array_equal(OutlierImputer.local_rows(missing_rows, window, max_train_rows),
+                                      expected)
+
+    def test_impute_outliers_local(self):
+        t = np.arange(2000, dtype=float)
+        truth = pd.DataFrame({"x1": np.sin(t / 15), "y1": 3 * np.sin(t / 15) - 2,
+                              "x2": np.cos(t / 25), "y2": np.cos(t / 25) + np.sin(t / 15)})
+        df = truth.copy()
+        df.iloc[[300, 1200], 1] = np.nan
+        df.iloc[[301, 1700], 3] = np.nan
+        imputer = OutlierImputer(log_file="test_log.json", n_jobs=1, window=10, max_train_rows=200)
+
+        with patch.object(OutlierImputer, "iterative_imputation",
+                          wraps=imputer.iterative_imputation) as mock_iterative:
+            result = imputer.impute_outliers(df, std_threshold=100.0, model_name="BR")
+
+        fitted = mock_iterative.call_args.args[0]
+        self.assertLess(len(fitted), len(df))
+        self.assertEqual(imputer.local_summary, {"frames": 2000, "missing_frames": 4,
+                                                 "fitted_frames": len(fitted)})
+        # The full session comes back, with only the missing values imputed
+        self.assertEqual(result.shape, df.shape)
+        pd.testing.assert_frame_equal(result[df.notna()], df)
+        np.testing.assert_allclose(result.to_numpy(), truth.to_numpy(), atol=0.05)
+
+
+class TestOutlierImputerSelectionReuse(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tmpdir.name, "latest_square.json")
+        t = np.linspace(0, 10, 60)
+        self.df = pd.DataFrame({"x1": np.sin(t), "y1": np.cos(t), "x2": t, "y2": 2 * t + 1})
+        self.df.iloc[[5, 20], [0, 3]] = np.nan
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def select(self, df, **kwargs):
+        imputer = OutlierImputer(self.log_file, n_jobs=1, **kwargs)
+        imputer._grid_search_models_per_col(df, model_name="BR")
+        imputer.save_selection(df)
+        return imputer
+
+    def test_save_and_reuse(self):
+        searched = self.select(self.df)
+        with open(self.log_file, "r") as f:
+            log = json.load(f)
+        self.assertEqual(log["x1"]["model"], "BR")
+        self.assertEqual(set(log["x1"]["params"]), {"alpha_1", "lambda_1"})
+        self.assertTrue(os.path.exists(os.path.join(searched.model_dir, log["x1"]["model_file"])))
+
+        imputer = OutlierImputer(self.log_file, n_jobs=1, reuse=True)
+        self.assertEqual(imputer.load_selection(self.df, model_name="BR"), [])
+        for column, model in imputer.best_models.items():
+            # The fitted estimators are loaded
+            np.testing.assert_allclose(model.coef_, searched.best_models[column].coef_)
+
+    def test_iterative_imputation_uses_loaded_estimators(self):
+        self.select(self.df)
+        imputer = OutlierImputer(self.log_file, n_jobs=1, reuse=True)
+        imputer.load_selection(self.df, model_name="BR")
+        self.assertEqual(set(imputer.fitted_models), set(self.df.columns))
+        with patch("src.post_processing.outlierimputer.clone") as mock_clone:
+            result = imputer.iterative_imputation(self.df)
+        # The loaded estimators are not refitted
+        mock_clone.assert_not_called()
+        self.assertFalse(result.isna().any().any())
+
+    def test_impute_outliers_skips_grid_search(self):
+        self.select(self.df)
+        imputer = OutlierImputer(self.log_file, n_jobs=1, reuse=True)
+        with patch.object(OutlierImputer, "_grid_search_models_per_col") as mock_grid_search:
+            result = imputer.impute_outliers(self.df, std_threshold=100.0, model_name="BR")
+        mock_grid_search.assert_not_called()
+        self.assertFalse(result.isna().any().any())
+
+    def test_temporal_impute_keeps_selection(self):
+        self.select(self.df)
+        temporal = OutlierImputer(self.log_file, n_jobs=1)
+        result = temporal.impute_outliers(self.df, std_threshold=100.0, model_name="Kalman")
+        self.assertFalse(result.isna().any().any())
+
+        with open(self.log_file, "r") as f:
+            log = json.load(f)
+        self.assertEqual(log["x1"]["model"], "BR")
+        self.assertEqual(log["x1"]["temporal"]["method"], "Kalman")
+        imputer = OutlierImputer(self.log_file, n_jobs=1, reuse=True)
+        self.assertEqual(imputer.load_selection(self.df, model_name="BR"), [])
+
+    def test_stale_selections(self):
+        self.select(self.df)
+        with open(self.log_file, "r") as f:
+            log = json.load(f)
+        log["y1"]["selected_at"] = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
+        log["x2"] = "BayesianRidge()"  # Written before selections were reused
+        with open(self.log_file, "w") as f:
+            json.dump(log, f)
+        drifted = self.df.copy()
+        drifted["x1"] += 5
+
+        imputer = OutlierImputer(self.log_file, n_jobs=1, reuse=True, max_age=7)
+        self.assertEqual(imputer.load_selection(drifted), ["x1", "y1", "x2"])
+        self.assertEqual(list(imputer.best_models), ["y2"])
+        # Another model was requested
+        self.assertEqual(OutlierImputer(self.log_file, reuse=True).load_selection(self.df, "KNR"),
+                         ["x1", "y1", "x2", "y2"])
+
+    def test_other_library_versions_rebuild_from_params(self):
+        self.select(self.df)
+        with patch("src.post_processing.outlierimputer.sklearn.__version__", "0.0.0"):
+            imputer = OutlierImputer(self.log_file, n_jobs=1, reuse=True)
+            self.assertEqual(imputer.load_selection(self.df), [])
+        with open(self.log_file, "r") as f:
+            params = json.load(f)["x1"]["params"]
+        model = imputer.best_models["x1"]
+        self.assertFalse(hasattr(model, "coef_"))
+        self.assertEqual({k: model.get_params()[k] for k in params}, params)
+
+    def test_missing_log(self):
+        imputer = OutlierImputer(self.log_file, reuse=True)
+        self.assertEqual(imputer.load_selection(self.df), list(self.df.columns))
+
+
+class TestOutlierImputerInvalidInputs(unittest.TestCase):
+    def setUp(self):
+        self.imputer = OutlierImputer(log_file="test_log.json")
+
     @parameterized.expand([
         ("non_dataframe_input", [1, 2, 3], 2.0, TypeError),
         ("negative_threshold", pd.DataFrame({"x1": [1, 2], "x2": [3, 4]}), -1, ValueError),
@@ -2,15 +2,21 @@ import unittest
 from unittest.mock import patch, MagicMock, mock_open
 import numpy as np
 import pandas as pd
+from scipy.stats import gaussian_kde
 from plotly.graph_objs import Figure
 from src.post_processing.plotting_plotly import PlottingPlotly
 from src.post_processing.datadlc import DataDLC
 from src.post_processing.dataneuron import DataNeuron
 from src.post_processing.mergeddata import MergedData
+from src.post_processing.videoencoder import VideoEncoder
+from src.post_processing.videorenderer import VideoRenderer, FrameGrabSink
+from src.post_processing.framereader import FrameReader
+from src.post_processing.proxyvideo import ProxyVideo
 from parameterized import parameterized
 import cv2
 import tempfile
 import os
+import warnings
 from io import BytesIO
 import matplotlib.pyplot as plt
 import matplotlib
@@ -790,5 +796,312 @@ class TestPlottingPlotly(unittest.TestCase):
                 color_2=color_2
             )
 
+
+class TestGenerateLabeledVideo(unittest.TestCase):
+    def setUp(self):
+        self.dlc_data = DataDLC("tests/mock_dlc_data.h5")
+        # Every point of the 3 tracked frames at the center of the 100x100 video
+        self.dlc_data.pose.xy[:] = 50
+        self.video_path = tempfile.mktemp(suffix=".mp4")
+        out = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (100, 100))
+        for _ in range(5):
+            out.write(np.zeros((100, 100, 3), dtype=np.uint8))
+        out.release()
+
+    def tearDown(self):
+        if os.path.exists(self.video_path):
+            os.remove(self.video_path)
+
+    def render(self) -> list[np.ndarray]:
+        frames = []
+        with patch.object(VideoEncoder, "write", autospec=True,
+                          side_effect=lambda encoder, frame: frames.append(frame.copy())), \
+             patch.object(VideoEncoder, "close", autospec=True,
+                          side_effect=lambda encoder: encoder.output_path):
+            os.remove(PlottingPlotly.generate_labeled_video(
+                self.dlc_data, self.video_path, output="path"))
+        return frames
+
+    def test_frame_count_mismatch(self):
+        with self.assertWarns(UserWarning):
+            frames = self.render()
+        # All video frames are written, only the tracked ones are labeled
+        self.assertEqual(len(frames), 5)
+        self.assertTrue(all(frame[50, 50].max() > 50 for frame in frames[:3]))
+        self.assertTrue(all(frame.max() < 30 for frame in frames[3:]))
+
+    def test_missing_and_imputed_points(self):
+        self.dlc_data.pose.xy[0] = np.nan
+        self.dlc_data.pose.xy[1, :] = [1e12, -1e12]
+        self.dlc_data.imputed[2] = True
+        frames = self.render()
+        # Missing and far away points are not drawn
+        self.assertTrue(frames[0].max() < 30)
+        self.assertTrue(frames[1].max() < 30)
+        # Imputed points are rings around an empty center
+        self.assertTrue(frames[2][50, 50].max() < 30)
+        self.assertTrue(frames[2][50, 45].max() > 50)
+
+    def test_segment_parallel_render(self):
+        # Distinct gray levels, so a misplaced frame is visible
+        out = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (100, 100))
+        for i in range(12):
+            out.write(np.full((100, 100, 3), 20 * i, dtype=np.uint8))
+        out.release()
+
+        videos = {}
+        with patch.object(PlottingPlotly, "segment_min_frames", 2), \
+             warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for n_jobs in (1, 3):
+                videos[n_jobs] = PlottingPlotly.generate_labeled_video(
+                    self.dlc_data, self.video_path, output="path",
+                    encoder_options={"crf": 10}, n_jobs=n_jobs)
+
+        frames = {}
+        for n_jobs, path in videos.items():
+            cap = cv2.VideoCapture(path)
+            frames[n_jobs] = []
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames[n_jobs].append(frame.astype(float))
+            cap.release()
+            os.remove(path)
+        self.assertEqual(len(frames[3]), 12)
+        for serial, segmented in zip(frames[1], frames[3]):
+            self.assertLess(np.abs(serial - segmented).mean(), 2)
+
+    @parameterized.expand([
+        ("zero", 0, ValueError),
+        ("float", 2.0, TypeError),
+    ])
+    def test_invalid_n_jobs(self, name, n_jobs, expected_exc):
+        with self.assertRaises(expected_exc):
+            PlottingPlotly.generate_labeled_video(self.dlc_data, self.video_path, n_jobs=n_jobs)
+
+    def test_overlay_coordinates(self):
+        points = np.array([[[10.7, 20.2], [np.nan, 5], [1e12, -1e12], [-3.5, 99.9]]])
+        coords, visible = PlottingPlotly._overlay_coordinates(points, 100, 100, radius=5)
+        self.assertEqual(coords.dtype, np.int32)
+        np.testing.assert_array_equal(visible, [[True, False, True, True]])
+        np.testing.assert_array_equal(coords[0, [0, 2, 3]], [[10, 20], [106, -6], [-3, 99]])
+
+
+class TestVideoSinks(unittest.TestCase):
+    def setUp(self):
+        self.dlc_data = DataDLC("tests/mock_dlc_data.h5")
+        self.dlc_data.pose.xy[:] = 50
+        self.merged_data = MagicMock(spec=MergedData)
+        self.merged_data.dlc = self.dlc_data
+        self.merged_data.df_merged = pd.DataFrame({"A": np.linspace(0, 1, 3)})
+        self.merged_data.threshold = 0.5
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.tmpdir.name, "video.mp4")
+        out = cv2.VideoWriter(self.video_path, cv2.VideoWriter_fourcc(*'mp4v'), 10, (100, 100))
+        for i in range(3):
+            out.write(np.full((100, 100, 3), 40 * i, dtype=np.uint8))
+        out.release()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_outputs_from_one_decode(self):
+        paths = {name: os.path.join(self.tmpdir.name, f"{name}.mp4")
+                 for name in ("labeled", "scroll", "warped")}
+        results = VideoRenderer(self.video_path, {
+            "labeled": PlottingPlotly.labeled_sink(self.dlc_data, output="path",
+                                                   output_path=paths["labeled"]),
+            "scroll": PlottingPlotly.scroll_over_sink(self.merged_data, ["A"], output="path",
+                                                      output_path=paths["scroll"]),
+            "warped": PlottingPlotly.homography_sink(self.merged_data, output="path",
+                                                     output_path=paths["warped"]),
+            "frames": FrameGrabSink([1]),
+        }).run()
+
+        self.assertEqual({name: results[name] for name in paths}, paths)
+        shapes = {}
+        for name, path in paths.items():
+            cap = cv2.VideoCapture(path)
+            self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), 3)
+            shapes[name] = (int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)), int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
+            cap.release()
+        self.assertEqual(shapes["labeled"], (100, 100))
+        self.assertEqual(shapes["scroll"], (120, 100))
+        self.assertEqual(shapes["warped"], (100, 100))
+
+        # The labels are drawn on a copy, the grabbed frame is unlabeled
+        self.assertLess(results["frames"][1].max(), 60)
+
+    def test_labeled_sink_matches_generate_labeled_video(self):
+        frames = {}
+        for name in ("generator", "sink"):
+            frames[name] = []
+            with patch.object(VideoEncoder, "write", autospec=True,
+                              side_effect=lambda encoder, frame: frames[name].append(frame.copy())), \
+                 patch.object(VideoEncoder, "close", autospec=True,
+                              side_effect=lambda encoder: encoder.output_path):
+                if name == "generator":
+                    path = PlottingPlotly.generate_labeled_video(self.dlc_data, self.video_path,
+                                                                 output="path")
+                else:
+                    sink = PlottingPlotly.labeled_sink(self.dlc_data, output="path")
+                    path = VideoRenderer(self.video_path, {"labeled": sink}).run()["labeled"]
+            os.remove(path)
+        self.assertEqual(len(frames["sink"]), 3)
+        for generated, rendered in zip(frames["generator"], frames["sink"]):
+            np.testing.assert_array_equal(generated, rendered)
+
+    def test_background_framing_with_decoded_frame(self):
+        frame = FrameReader(self.video_path).read(1)
+        with patch.object(self.dlc_data, "_get_homography_matrix", return_value=np.eye(3)):
+            fig, (ax_read, ax_given) = plt.subplots(1, 2)
+            PlottingPlotly.background_framing(self.merged_data, ax_read, np.zeros((4, 2)),
+                                              video_path=self.video_path, index=1)
+            with patch.object(FrameReader, "read", autospec=True) as mock_read:
+                PlottingPlotly.background_framing(self.merged_data, ax_given, np.zeros((4, 2)),
+                                                  index=1, frame=frame)
+                mock_read.assert_not_called()
+        np.testing.assert_array_equal(ax_read.images[0].get_array(), ax_given.images[0].get_array())
+        plt.close(fig)
+
+
+    def test_background_framing_from_proxy(self):
+        # A flat frame shifted by the homography, the proxy must land on the same pixels
+        h_matrix = np.array([[1.0, 0, 20], [0, 1.0, 10], [0, 0, 1]])
+        with patch.object(self.dlc_data, "_get_homography_matrix", return_value=h_matrix), \
+             patch.object(ProxyVideo, "height", 50), \
+             patch.object(ProxyVideo, "cache_dir", os.path.join(self.tmpdir.name, "proxies")):
+            fig, (ax_full, ax_proxy) = plt.subplots(1, 2)
+            PlottingPlotly.background_framing(self.merged_data, ax_full, np.zeros((4, 2)),
+                                              video_path=self.video_path, index=2)
+            PlottingPlotly.background_framing(self.merged_data, ax_proxy, np.zeros((4, 2)),
+                                              video_path=self.video_path, index=2, proxy=True)
+            self.assertEqual(ProxyVideo.frame_size(ProxyVideo.get(self.video_path)), (50, 50))
+        full = ax_full.images[0].get_array().astype(float)
+        from_proxy = ax_proxy.images[0].get_array().astype(float)
+        plt.close(fig)
+
+        self.assertEqual(from_proxy.shape, full.shape)
+        # Same content away from the edges of the shifted frame
+        np.testing.assert_allclose(from_proxy[15:95, 25:95], full[15:95, 25:95], atol=6)
+        self.assertLess(from_proxy[:8].max(), 6)
+
+
+class TestComputeKDE(unittest.TestCase):
+    @parameterized.expand([
+        ("scalar_bw", 0.2, 1.0),
+        ("scott", "scott", 1.0),
+        ("silverman", "silverman", 1.0),
+        ("narrow_bw", 0.05, 1.0),
+        ("wide_data", 0.2, 3.0),  # many points outside the grid
+    ])
+    def test_compute_kde_matches_gaussian_kde(self, name, bw_method, scale):
+        rng = np.random.default_rng(0)
+        x = rng.normal(0, scale, 2000)
+        df = pd.DataFrame({"x": x, "y": 0.5 * x + rng.normal(0, scale, 2000)})
+
+        xx, yy, zz = PlottingPlotly._compute_kde(df, "x", "y", (-3, 3, -2, 4), bw_method)
+        kernel = gaussian_kde(np.vstack([df["x"], df["y"]]), bw_method=bw_method)
+        expected = kernel(np.vstack([xx.ravel(), yy.ravel()])).reshape(xx.shape)
+
+        np.testing.assert_allclose(xx[:, 0], np.linspace(-3, 3, 200))
+        np.testing.assert_allclose(yy[0], np.linspace(-2, 4, 200))
+        self.assertLess(np.abs(zz - expected).max() / expected.max(), 1e-2)
+
+    def test_compute_kde_reversed_grid_limits(self):
+        df = pd.DataFrame({"x": np.random.normal(0, 1, 100),
+                           "y": np.random.normal(0, 1, 100)})
+        with self.assertRaises(ValueError):
+            PlottingPlotly._compute_kde(df, "x", "y", (3, -3, -3, 3))
+
+
+class TestPlotRFMappingAnimated(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({"x": rng.uniform(-5, 25, 20),
+                                "y": rng.uniform(-5, 25, 20),
+                                "Bending_Coefficient": rng.random(20),
+                                "Spikes": rng.integers(0, 2, 20),
+                                "IFF": rng.random(20) * 50})
+        self.merged_data = MagicMock(spec=MergedData)
+        self.merged_data.threshold_data.return_value = self.df
+        self.homography_points = np.array([[0, 20], [20, 20], [20, 0], [0, 0]],
+                                          dtype=np.float32)
+
+    @parameterized.expand([
+        ("spikes_color", "Spikes"),
+        ("colormap_color", "IFF"),
+    ])
+    def test_frames_accumulate_points(self, name, color_col):
+        frames = []
+        with patch.object(VideoEncoder, "write", autospec=True,
+                          side_effect=lambda encoder, frame: frames.append(frame.copy())), \
+             patch.object(VideoEncoder, "close", autospec=True,
+                          side_effect=lambda encoder: encoder.output_path):
+            result = PlottingPlotly.plot_rf_mapping_animated(
+                self.merged_data, "x", "y", self.homography_points,
+                size_col="Bending_Coefficient", color_col=color_col, figsize=(4, 4),
+                output="path")
+        os.remove(result)
+
+        self.assertEqual(len(frames), len(self.df))
+        self.assertTrue(all(frame.shape == frames[0].shape for frame in frames))
+        # Every frame adds a point, so consecutive frames differ
+        self.assertFalse(any(np.array_equal(a, b) for a, b in zip(frames, frames[1:])))
+        # The thresholded data is not modified
+        self.assertNotIn("scaled_size", self.df.columns)
+
+class TestGenerateScrollOverVideo(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.merged_data = MagicMock(spec=MergedData)
+        self.merged_data.df_merged = pd.DataFrame({
+            "A": rng.random(300),
+            "Bending_ZScore": rng.random(300)
+        })
+        self.merged_data.threshold = 0.5
+
+    def test_render_signal_strip_shape(self):
+        signal = pd.Series(np.linspace(0, 1, 50))
+        strip = PlottingPlotly._render_signal_strip(signal, 0, 49, 320, 60, "#1f77b4", threshold=0.5)
+        self.assertEqual(strip.shape, (60, 320, 3))
+        self.assertEqual(strip.dtype, np.uint8)
+        # The signal is drawn on a white background
+        self.assertTrue((strip != 255).any())
+
+    def test_frames_scroll_with_video(self):
+        n_frames = 5
+        mock_cap = MagicMock()
+        mock_cap.isOpened.side_effect = [True] * (n_frames + 1) + [False]
+        mock_cap.read.side_effect = [(True, np.full((100, 120, 3), i, dtype=np.uint8))
+                                     for i in range(n_frames)] + [(False, None)]
+        mock_cap.get.side_effect = lambda x: {5: 30, 3: 120, 4: 100}[x]
+
+        # The frame buffer is reused between frames, so keep a copy of each one
+        frames = []
+        with tempfile.NamedTemporaryFile(suffix=".mp4") as video_file, \
+             patch("src.post_processing.plotting_plotly.cv2.VideoCapture", return_value=mock_cap), \
+             patch.object(VideoEncoder, "write", autospec=True,
+                          side_effect=lambda encoder, frame: frames.append(frame.copy())), \
+             patch.object(VideoEncoder, "close", autospec=True,
+                          side_effect=lambda encoder: encoder.output_path):
+            result = PlottingPlotly.generate_scroll_over_video(
+                merged_data=self.merged_data,
+                columns=["A", "Bending_ZScore"],
+                video_path=video_file.name,
+                output="path")
+        os.remove(result)
+
+        self.assertEqual(len(frames), n_frames)
+        self.assertTrue(all(frame.shape == frames[0].shape for frame in frames))
+        self.assertEqual(frames[0].shape[1], 120)
+        # The video sits below the signal panels and the signals scroll between frames
+        for i, frame in enumerate(frames):
+            self.assertTrue((frame[-100:] == i).all())
+        scroll_height = frames[0].shape[0] - 100
+        self.assertFalse(np.array_equal(frames[0][:scroll_height], frames[-1][:scroll_height]))
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+import pandas as pd
+from src.post_processing.posearray import PoseArray
+from parameterized import parameterized
+
+
+class TestPoseArray(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.read_hdf("tests/mock_dlc_data.h5")
+        self.pose = PoseArray(self.df)
+
+    def test_init(self):
+        self.assertEqual(len(self.pose), 3)
+        self.assertEqual(self.pose.data.shape, (3, 30))
+        self.assertEqual(self.pose.data.dtype, np.float32)
+        self.assertTrue(self.pose.data.flags["C_CONTIGUOUS"])
+        self.assertEqual(self.pose.xy.shape, (3, 10, 2))
+        self.assertEqual(self.pose.likelihood.shape, (3, 10))
+        self.assertEqual(self.pose.bodyparts[0], "Top_left")
+        self.assertEqual(self.pose.index["FB2"], 9)
+
+    def test_values_match_dataframe(self):
+        for bodypart, slot in self.pose.index.items():
+            part = self.df.xs(bodypart, axis=1, level=1)
+            np.testing.assert_array_equal(self.pose.xy[:, slot, 0],
+                                          part.xs("x", axis=1, level=1).values[:, 0])
+            np.testing.assert_array_equal(self.pose.xy[:, slot, 1],
+                                          part.xs("y", axis=1, level=1).values[:, 0])
+            np.testing.assert_allclose(self.pose.likelihood[:, slot],
+                                       part.xs("likelihood", axis=1, level=1).values[:, 0],
+                                       rtol=1e-6)
+
+    def test_views_share_memory(self):
+        for array in (self.pose.xy, self.pose.likelihood):
+            self.assertTrue(np.shares_memory(array, self.pose.data))
+
+        df_square = self.pose.xy_dataframe(["Top_left", "Top_right"])
+        self.assertTrue(np.shares_memory(df_square.values, self.pose.data))
+        self.pose.xy[0, 1, 1] = -1
+        self.assertEqual(df_square.loc[0, "Top_right_y"], -1)
+
+        df_likelihoods = self.pose.likelihood_dataframe()
+        self.assertEqual(df_likelihoods.columns[0], "Top_left_likelihood")
+        self.assertTrue(np.shares_memory(df_likelihoods.values, self.pose.data))
+
+    def test_xy_dataframe_non_consecutive_slots(self):
+        df_xy = self.pose.xy_dataframe(["FB2", "Top_left"])
+        self.assertEqual(list(df_xy.columns), ["FB2_x", "FB2_y", "Top_left_x", "Top_left_y"])
+        np.testing.assert_array_equal(df_xy.values[:, :2], self.pose.xy[:, 9])
+
+    def test_custom_bodypart_order(self):
+        pose = PoseArray(self.df, ["FR1", "Top_left"])
+        self.assertEqual(pose.xy.shape, (3, 2, 2))
+        np.testing.assert_array_equal(pose.xy[:, 1], self.pose.xy[:, 0])
+
+    def test_slots(self):
+        np.testing.assert_array_equal(self.pose.slots(["FR1", "Top_left"]), [4, 0])
+        with self.assertRaises(KeyError):
+            self.pose.slots(["Nose"])
+
+    @parameterized.expand([
+        ("not_a_dataframe", np.zeros((3, 30)), None, TypeError),
+        ("flat_columns", pd.DataFrame(np.zeros((3, 3)), columns=["a_x", "a_y", "a_likelihood"]),
+         None, ValueError),
+        ("missing_bodypart", None, ["Nose"], ValueError),
+        ("invalid_bodyparts", None, [1, 2], TypeError),
+    ])
+    def test_init_invalid_inputs(self, name, df, bodyparts, expected_exception):
+        with self.assertRaises(expected_exception):
+            PoseArray(self.df if df is None else df, bodyparts)
+
+
+if __name__ == '__main__':
+    unittest.main()
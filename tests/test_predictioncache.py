@@ -0,0 +1,108 @@
+import unittest
+import os
+import tempfile
+from src.train_predict.predictioncache import PredictionCache
+from parameterized import parameterized
+
+
+class TestPredictionCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = PredictionCache(os.path.join(self.tmpdir.name, "cache"), max_bytes=100)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_file(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_put_get(self):
+        path = self.make_file("video.mp4", b"0123456789")
+        key = self.cache.key("preprocess", self.cache.hash_file(path), [1274, 720])
+        self.assertIsNone(self.cache.get(key))
+
+        entry = self.cache.put(key, [path], names=["processed.mp4"])
+        self.assertEqual(list(entry), ["processed.mp4"])
+        self.assertEqual(self.cache.get(key), entry)
+        with open(entry["processed.mp4"], "rb") as f:
+            self.assertEqual(f.read(), b"0123456789")
+        self.assertEqual(self.cache.size(), 10)
+
+    def test_key_depends_on_content(self):
+        path_a = self.make_file("a.mp4", b"same")
+        path_b = self.make_file("b.mp4", b"same")
+        path_c = self.make_file("c.mp4", b"different")
+        self.assertEqual(self.cache.hash_file(path_a), self.cache.hash_file(path_b))
+        self.assertNotEqual(self.cache.hash_file(path_a), self.cache.hash_file(path_c))
+        self.assertNotEqual(self.cache.key("a", 1), self.cache.key("a", 2))
+        self.assertEqual(self.cache.key({"x": 1, "y": 2}), self.cache.key({"y": 2, "x": 1}))
+
+    def test_model_identity_changes_with_snapshots(self):
+        project = os.path.join(self.tmpdir.name, "project")
+        train = os.path.join(project, "dlc-models-pytorch", "iteration-0", "shuffle1", "train")
+        os.makedirs(train)
+        with open(os.path.join(project, "config.yaml"), "w") as f:
+            f.write("bodyparts: [a, b]\n")
+        with open(os.path.join(train, "snapshot-075.pt"), "wb") as f:
+            f.write(b"weights")
+        identity = self.cache.model_identity(project)
+
+        self.assertEqual(self.cache.model_identity(project), identity)
+        with open(os.path.join(train, "snapshot-100.pt"), "wb") as f:
+            f.write(b"retrained")
+        self.assertNotEqual(self.cache.model_identity(project), identity)
+
+    def test_evicts_least_recently_used(self):
+        keys = [self.cache.key(i) for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            self.cache.put(key, [self.make_file(f"{i}.h5", b"x" * 40)])
+            os.utime(os.path.join(self.cache.cache_dir, key), ns=(i * 10**9, i * 10**9))
+        # Using the first entry makes the second one the least recently used
+        self.cache.get(keys[0])
+
+        self.cache.put(keys[2], [self.make_file("2.h5", b"x" * 40)])
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+        self.assertLessEqual(self.cache.size(), 100)
+
+    def test_new_entry_is_never_evicted(self):
+        key = self.cache.key("large")
+        self.cache.put(key, [self.make_file("large.h5", b"x" * 200)])
+        self.assertIsNotNone(self.cache.get(key))
+
+    def test_clear(self):
+        key = self.cache.key("entry")
+        self.cache.put(key, [self.make_file("a.h5", b"a")])
+        self.cache.clear()
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.size(), 0)
+
+    @parameterized.expand([
+        ("path_in_name", ["../a.h5"]),
+        ("hidden_name", [".a.h5"]),
+        ("length_mismatch", ["a.h5", "b.h5"]),
+    ])
+    def test_put_invalid_names(self, name, names):
+        with self.assertRaises(ValueError):
+            self.cache.put(self.cache.key(name), [self.make_file("a.h5", b"a")], names=names)
+
+    def test_invalid_key(self):
+        with self.assertRaises(ValueError):
+            self.cache.get("../outside")
+
+    @parameterized.expand([
+        ("dir_type", 1, 10, TypeError),
+        ("max_bytes_type", "cache", 1.5, TypeError),
+        ("max_bytes_negative", "cache", -1, ValueError),
+    ])
+    def test_init_invalid(self, name, cache_dir, max_bytes, expected_exc):
+        with self.assertRaises(expected_exc):
+            PredictionCache(cache_dir, max_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
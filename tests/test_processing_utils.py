@@ -1,6 +1,8 @@
 import unittest
+import os
 import streamlit as st
 
+from tempfile import NamedTemporaryFile
 from unittest.mock import patch, MagicMock, Mock
 from src.post_processing import processing_utils
 
@@ -57,6 +59,23 @@ class TestProcessingUtils(unittest.TestCase):
                              "temp/new_video.mp4")
             mock_success.assert_called_with("Labeled video path assigned successfully!")
 
+    @patch("streamlit.download_button")
+    @patch("streamlit.video")
+    def test_show_video_replaces_previous(self, mock_video, mock_download):
+        paths = []
+        for content in (b"first", b"second"):
+            with NamedTemporaryFile(delete=False, suffix=".mp4") as temp_file:
+                temp_file.write(content)
+                paths.append(temp_file.name)
+            processing_utils.show_video(paths[-1], "Download", "video.mp4", "test_video_path")
+
+        mock_video.assert_called_with(paths[1])
+        self.assertEqual(mock_download.call_args.kwargs["file_name"], "video.mp4")
+        self.assertEqual(st.session_state["test_video_path"], paths[1])
+        # The previous video was removed
+        self.assertFalse(os.path.exists(paths[0]))
+        os.remove(paths[1])
+
     def test_get_all_matplotlib_cmaps(self):
         cmaps = processing_utils.get_all_matplotlib_cmaps()
         self.assertIsInstance(cmaps, dict)
@@ -0,0 +1,83 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+from src.post_processing.framereader import FrameReader
+from src.post_processing.proxyvideo import ProxyVideo
+from src.post_processing.videoencoder import VideoEncoder
+from parameterized import parameterized
+
+N_FRAMES = 30
+
+
+class TestProxyVideo(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.video_path = os.path.join(self.tmpdir.name, "video.mp4")
+        # Every frame is a flat gray level that encodes its index
+        with VideoEncoder(fps=30, output_path=self.video_path, crf=10) as encoder:
+            for i in range(N_FRAMES):
+                encoder.write(np.full((720, 1280, 3), 8 * i, dtype=np.uint8))
+        patcher = patch.object(ProxyVideo, "cache_dir", os.path.join(self.tmpdir.name, "proxies"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_proxy_is_small_and_keyframe_dense(self):
+        proxy_path = ProxyVideo.get(self.video_path)
+
+        self.assertTrue(proxy_path.startswith(ProxyVideo.cache_dir))
+        self.assertEqual(ProxyVideo.frame_size(proxy_path), (854, 480))
+        reader = FrameReader(proxy_path)
+        self.assertEqual(len(reader), N_FRAMES)
+        np.testing.assert_array_equal(reader.keyframes, np.arange(0, N_FRAMES, ProxyVideo.gop))
+        # Frames keep their index
+        for index in (0, 17, 29):
+            self.assertAlmostEqual(reader.read(index).mean(), 8 * index, delta=3)
+        reader.close()
+
+    def test_proxy_is_cached(self):
+        proxy_path = ProxyVideo.get(self.video_path)
+        with patch.object(ProxyVideo, "create") as mock_create:
+            self.assertEqual(ProxyVideo.get(self.video_path), proxy_path)
+            mock_create.assert_not_called()
+
+        # A changed source gets a new proxy
+        os.utime(self.video_path, ns=(0, 0))
+        self.assertNotEqual(ProxyVideo.get(self.video_path), proxy_path)
+
+    def test_small_video_is_not_upscaled(self):
+        output_path = os.path.join(self.tmpdir.name, "proxy.mp4")
+        ProxyVideo.create(self.video_path, output_path, height=1080, gop=1)
+        self.assertEqual(ProxyVideo.frame_size(output_path), (1280, 720))
+        reader = FrameReader(output_path)
+        self.assertEqual(len(reader), N_FRAMES)
+        # All-intra
+        self.assertEqual(len(reader.keyframes), N_FRAMES)
+        reader.close()
+
+    def test_ffmpeg_error(self):
+        broken_path = os.path.join(self.tmpdir.name, "broken.mp4")
+        with open(broken_path, "wb") as f:
+            f.write(b"not a video")
+        output_path = os.path.join(self.tmpdir.name, "proxy.mp4")
+        with self.assertRaises(RuntimeError):
+            ProxyVideo.create(broken_path, output_path)
+        self.assertFalse(os.path.exists(output_path))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir.name, "proxy.partial.mp4")))
+
+    @parameterized.expand([
+        ("zero_height", {"height": 0}, ValueError),
+        ("float_gop", {"gop": 2.5}, TypeError),
+        ("negative_crf", {"crf": -1}, ValueError),
+    ])
+    def test_create_invalid(self, name, kwargs, expected_exc):
+        with self.assertRaises(expected_exc):
+            ProxyVideo.create(self.video_path, os.path.join(self.tmpdir.name, "proxy.mp4"), **kwargs)
+
+
+if __name__ == "__main__":
+    unittest.main()
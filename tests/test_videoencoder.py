@@ -0,0 +1,133 @@
+import unittest
+import os
+import tempfile
+import cv2
+import numpy as np
+from src.post_processing.videoencoder import VideoEncoder
+from parameterized import parameterized
+
+
+class TestVideoEncoder(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output_path = os.path.join(self.tmpdir.name, "video.mp4")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def read_frames(path: str) -> list[np.ndarray]:
+        cap = cv2.VideoCapture(path)
+        frames = []
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+        return frames
+
+    @parameterized.expand([
+        ("rgb", 3),
+        ("rgba", 4),
+    ])
+    def test_encode_frames(self, name, channels):
+        with VideoEncoder(fps=30, output_path=self.output_path, crf=18) as encoder:
+            for i in range(10):
+                encoder.write(np.full((21, 33, channels), 25 * i, dtype=np.uint8))
+
+        self.assertEqual(encoder.n_frames, 10)
+        frames = self.read_frames(self.output_path)
+        self.assertEqual(len(frames), 10)
+        # Odd sizes are padded to even ones
+        self.assertEqual(frames[0].shape, (22, 34, 3))
+        for i, frame in enumerate(frames):
+            self.assertAlmostEqual(frame[:21, :33].mean(), 25 * i, delta=3)
+
+    def test_temporary_output_path(self):
+        encoder = VideoEncoder(fps=25)
+        self.assertTrue(encoder.output_path.endswith(".mp4"))
+        encoder.write(np.zeros((16, 16, 3), dtype=np.uint8))
+        path = encoder.close()
+        self.assertEqual(path, encoder.output_path)
+        self.assertGreater(os.path.getsize(path), 0)
+        os.remove(path)
+
+    def test_abort_on_error_removes_output(self):
+        with self.assertRaises(ValueError):
+            with VideoEncoder(fps=30, output_path=self.output_path) as encoder:
+                encoder.write(np.zeros((16, 16, 3), dtype=np.uint8))
+                # A frame with a different size
+                encoder.write(np.zeros((8, 8, 3), dtype=np.uint8))
+        self.assertFalse(os.path.exists(self.output_path))
+
+    def test_close_without_frames(self):
+        encoder = VideoEncoder(fps=30, output_path=self.output_path)
+        with self.assertRaises(RuntimeError):
+            encoder.close()
+
+    def test_ffmpeg_error(self):
+        encoder = VideoEncoder(fps=30, output_path=self.output_path, preset="not_a_preset")
+        with self.assertRaises(RuntimeError):
+            for _ in range(100):
+                encoder.write(np.zeros((16, 16, 3), dtype=np.uint8))
+            encoder.close()
+        encoder.abort()
+
+    @parameterized.expand([
+        ("float_frame", np.zeros((16, 16, 3), dtype=np.float32), TypeError),
+        ("not_array", [[0, 0, 0]], TypeError),
+        ("grayscale_frame", np.zeros((16, 16), dtype=np.uint8), ValueError),
+        ("two_channels", np.zeros((16, 16, 2), dtype=np.uint8), ValueError),
+    ])
+    def test_write_invalid_frame(self, name, frame, expected_exc):
+        encoder = VideoEncoder(fps=30, output_path=self.output_path)
+        with self.assertRaises(expected_exc):
+            encoder.write(frame)
+
+    @parameterized.expand([
+        ("zero_fps", {"fps": 0}, ValueError),
+        ("string_fps", {"fps": "30"}, TypeError),
+        ("negative_crf", {"fps": 30, "crf": -1}, ValueError),
+        ("float_crf", {"fps": 30, "crf": 23.0}, TypeError),
+        ("negative_threads", {"fps": 30, "threads": -2}, ValueError),
+        ("invalid_preset", {"fps": 30, "preset": 1}, TypeError),
+        ("invalid_output_path", {"fps": 30, "output_path": 1}, TypeError),
+    ])
+    def test_init_invalid(self, name, kwargs, expected_exc):
+        with self.assertRaises(expected_exc):
+            VideoEncoder(**kwargs)
+
+    def test_concat(self):
+        paths = []
+        for i in range(3):
+            path = os.path.join(self.tmpdir.name, f"segment_{i}.mp4")
+            with VideoEncoder(fps=30, output_path=path, crf=18) as encoder:
+                for j in range(4):
+                    encoder.write(np.full((16, 16, 3), 20 * (4 * i + j), dtype=np.uint8))
+            paths.append(path)
+
+        VideoEncoder.concat(paths, self.output_path)
+        frames = self.read_frames(self.output_path)
+        self.assertEqual(len(frames), 12)
+        for i, frame in enumerate(frames):
+            self.assertAlmostEqual(frame.mean(), 20 * i, delta=3)
+        with self.assertRaises(ValueError):
+            VideoEncoder.concat([], self.output_path)
+
+    def test_collect(self):
+        with open(self.output_path, "wb") as f:
+            f.write(b"0123456789")
+
+        self.assertEqual(VideoEncoder.collect(self.output_path, "path"), self.output_path)
+        self.assertEqual(VideoEncoder.collect(self.output_path, "bytes", delete=False), b"0123456789")
+        chunks = VideoEncoder.iter_chunks(self.output_path, chunk_size=4)
+        self.assertEqual(list(chunks), [b"0123", b"4567", b"89"])
+        self.assertEqual(b"".join(VideoEncoder.collect(self.output_path, "chunks")), b"0123456789")
+        self.assertFalse(os.path.exists(self.output_path))
+        with self.assertRaises(ValueError):
+            VideoEncoder.collect(self.output_path, "array")
+
+
+if __name__ == "__main__":
+    unittest.main()
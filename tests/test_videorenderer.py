@@ -0,0 +1,142 @@
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+import cv2
+import numpy as np
+from src.post_processing.videoencoder import VideoEncoder
+from src.post_processing.videorenderer import (VideoRenderer, FrameSink, EncoderSink,
+                                               FrameGrabSink, ThumbnailSink)
+from parameterized import parameterized
+
+N_FRAMES = 10
+
+
+class RecordingSink(FrameSink):
+    def __init__(self):
+        self.frames = []
+
+    def write(self, index, frame):
+        self.frames.append((index, frame))
+
+    def close(self, n_frames):
+        return n_frames
+
+
+class FailingSink(FrameSink):
+    def write(self, index, frame):
+        if index == 3:
+            raise RuntimeError("sink failed")
+
+
+class CountingCapture:
+    """cv2.VideoCapture counting its reads. Python subclasses of cv2 types crash at exit."""
+    reads = 0
+    VideoCapture = cv2.VideoCapture  # Unpatched
+
+    def __init__(self, *args):
+        self.capture = self.VideoCapture(*args)
+
+    def read(self):
+        CountingCapture.reads += 1
+        return self.capture.read()
+
+    def __getattr__(self, name):
+        return getattr(self.capture, name)
+
+
+class TestVideoRenderer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.video_path = os.path.join(cls.tmpdir.name, "video.mp4")
+        with VideoEncoder(fps=30, output_path=cls.video_path, crf=10) as encoder:
+            for i in range(N_FRAMES):
+                encoder.write(np.full((48, 64, 3), 20 * i, dtype=np.uint8))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_single_decode_fans_out(self):
+        first, second = RecordingSink(), RecordingSink()
+        CountingCapture.reads = 0
+        with patch("src.post_processing.videorenderer.cv2.VideoCapture", CountingCapture):
+            results = VideoRenderer(self.video_path, {"first": first, "second": second}).run()
+
+        # One read per frame plus the one at the end, whatever the number of sinks
+        self.assertEqual(CountingCapture.reads, N_FRAMES + 1)
+        self.assertEqual(results, {"first": N_FRAMES, "second": N_FRAMES})
+        for (index_a, frame_a), (index_b, frame_b) in zip(first.frames, second.frames):
+            self.assertEqual(index_a, index_b)
+            self.assertIs(frame_a, frame_b)
+            self.assertFalse(frame_a.flags.writeable)
+
+    def test_builtin_sinks(self):
+        output_path = os.path.join(self.tmpdir.name, "inverted.mp4")
+        results = VideoRenderer(self.video_path, {
+            "inverted": EncoderSink(lambda index, frame: 255 - frame[:, :, ::-1],
+                                    output="path", output_path=output_path),
+            "grab": FrameGrabSink([2, 7, 100]),
+            "thumbnails": ThumbnailSink(step=4, width=32),
+        }).run()
+
+        self.assertEqual(results["inverted"], output_path)
+        cap = cv2.VideoCapture(output_path)
+        self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), N_FRAMES)
+        ret, frame = cap.read()
+        cap.release()
+        self.assertAlmostEqual(frame.mean(), 255, delta=3)
+
+        self.assertEqual(sorted(results["grab"]), [2, 7])
+        self.assertAlmostEqual(results["grab"][7].mean(), 140, delta=3)
+
+        indices, thumbnails = results["thumbnails"]
+        np.testing.assert_array_equal(indices, [0, 4, 8])
+        self.assertEqual(thumbnails.shape, (3, 24, 32, 3))
+
+    def test_frame_count_warning(self):
+        sink = EncoderSink(lambda index, frame: frame, output="path", expected_frames=N_FRAMES + 2)
+        with self.assertWarns(UserWarning):
+            path = VideoRenderer(self.video_path, {"video": sink}).run()["video"]
+        os.remove(path)
+
+    def test_failure_aborts_all_sinks(self):
+        output_path = os.path.join(self.tmpdir.name, "aborted.mp4")
+        sinks = {"video": EncoderSink(lambda index, frame: frame, output="path",
+                                      output_path=output_path),
+                 "failing": FailingSink()}
+        with self.assertRaises(RuntimeError):
+            VideoRenderer(self.video_path, sinks).run()
+        self.assertFalse(os.path.exists(output_path))
+
+    def test_sinks_cannot_modify_shared_frames(self):
+        def draw(index, frame):
+            frame[0, 0] = 255
+            return frame
+        with self.assertRaises(ValueError):
+            VideoRenderer(self.video_path, {"video": EncoderSink(draw, output="path")}).run()
+
+    @parameterized.expand([
+        ("no_sinks", {}, ValueError),
+        ("not_a_sink", {"video": object()}, TypeError),
+        ("not_a_dict", [RecordingSink()], TypeError),
+    ])
+    def test_init_invalid(self, name, sinks, expected_exc):
+        with self.assertRaises(expected_exc):
+            VideoRenderer(self.video_path, sinks)
+
+    @parameterized.expand([
+        ("encoder_render", lambda: EncoderSink("render"), TypeError),
+        ("encoder_output", lambda: EncoderSink(lambda i, f: f, output="array"), ValueError),
+        ("grab_indices", lambda: FrameGrabSink([1.5]), TypeError),
+        ("thumbnail_step", lambda: ThumbnailSink(step=0), ValueError),
+        ("no_write", lambda: type("IncompleteSink", (FrameSink,), {})(), TypeError),
+    ])
+    def test_sink_invalid(self, name, make_sink, expected_exc):
+        with self.assertRaises(expected_exc):
+            make_sink()
+
+
+if __name__ == "__main__":
+    unittest.main()